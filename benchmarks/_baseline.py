@@ -0,0 +1,51 @@
+"""Helpers for storing benchmark results and comparing them with a baseline."""
+
+import json
+from pathlib import Path
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+def load_baseline(name: str) -> dict[str, float]:
+    """Returns the stored results of a benchmark, or an empty dict."""
+    path = BASELINE_DIR / f"{name}.json"
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(name: str, results: dict[str, float]) -> Path:
+    """Stores the results of a benchmark as its new baseline."""
+    BASELINE_DIR.mkdir(exist_ok=True)
+    path = BASELINE_DIR / f"{name}.json"
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float) -> list[str]:
+    """Prints results next to the baseline and returns the names that regressed.
+
+    A result regresses when it exceeds its baseline value by more than
+    ``tolerance`` (a fraction, e.g. 0.2 for 20 %). Lower values are better.
+    Results without a baseline value are reported as "NO BASELINE" and
+    followed by a warning, but do not fail the check, so a fresh checkout
+    without stored baselines can run the benchmarks.
+    """
+    regressions = []
+    missing = 0
+    width = max(map(len, results), default=0)
+    for name, value in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            missing += 1
+            print(f"{name:<{width}}  {value:12.4g}  NO BASELINE")
+            continue
+        change = value / reference - 1 if reference else 0.0
+        flag = ""
+        if change > tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<{width}}  {value:12.4g}  baseline {reference:12.4g}  {change:+7.1%}{flag}")
+    if missing:
+        print(f"Warning: {missing} case(s) have no baseline and were not checked; --save-baseline records one")
+    return regressions
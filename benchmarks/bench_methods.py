@@ -0,0 +1,110 @@
+"""Benchmarks of the interpolation methods.
+
+Times every method over a matrix of input sizes, channel layouts, scale
+factors, accumulator precisions and Lanczos window sizes, and records the
+peak memory allocated during one call. Results are compared with the stored
+baseline; both slower runs and higher peak memory count as regressions.
+
+Usage:
+    python benchmarks/bench_methods.py [--quick] [-k FILTER] [--repeat N]
+                                       [--save-baseline] [--tolerance 0.2]
+"""
+
+import argparse
+import itertools
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from _baseline import compare, load_baseline, save_baseline
+
+from methods.bilinear import bilinear_interpolation
+from methods.lanczos import lanczos_interpolation
+from methods.spline import spline_interpolation
+
+SIZES = (64, 256, 1024)
+QUICK_SIZES = (64, 256)
+CHANNELS = {"gray": (), "rgb": (3,), "rgba": (4,)}
+SCALES = (0.5, 2.0)
+LANCZOS_A = (2, 3)
+# Accumulator types; float32 inputs are benchmarked in and out as float32
+PRECISIONS = {"u8": (np.uint8, np.float64), "f32": (np.float32, np.float32)}
+
+
+def _methods() -> Iterator[tuple[str, Callable[..., np.ndarray]]]:
+    yield "bilinear", bilinear_interpolation
+    yield "spline", spline_interpolation
+    for a in LANCZOS_A:
+        yield f"lanczos[a={a}]", partial(lanczos_interpolation, a=a)
+
+
+def cases(sizes: tuple[int, ...]) -> Iterator[tuple[str, Callable[[], np.ndarray]]]:
+    """Yields (name, thunk) pairs for every benchmark case."""
+    rng = np.random.default_rng(0)
+    for (method_name, method), size, (layout, extra), scale, (precision, (image_dtype, dtype)) in itertools.product(
+        _methods(),
+        sizes,
+        CHANNELS.items(),
+        SCALES,
+        PRECISIONS.items(),
+    ):
+        image = rng.integers(0, 256, size=(size, size, *extra), dtype=np.uint8).astype(image_dtype)
+        new_size = int(size * scale)
+        name = f"{method_name} {layout} {precision} {size}->{new_size}"
+        yield name, partial(method, image, new_size, new_size, dtype=dtype, preserve_dtype=True)
+
+
+def measure(func: Callable[[], np.ndarray], repeat: int) -> tuple[float, float]:
+    """Returns the median wall time in seconds and the peak allocation in MiB."""
+    func()  # warm-up, also fills the plan cache
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / 2**20
+
+
+def main() -> int:
+    """Runs the benchmark and returns a non-zero exit code on regressions."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="skip the largest input size")
+    parser.add_argument("-k", dest="filter", default="", help="only run cases whose name contains FILTER")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case; the median is reported")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing")
+    args = parser.parse_args()
+
+    results: dict[str, float] = {}
+    for name, func in cases(QUICK_SIZES if args.quick else SIZES):
+        if args.filter in name:
+            seconds, peak_mib = measure(func, args.repeat)
+            results[f"{name} time_s"] = seconds
+            results[f"{name} peak_mib"] = peak_mib
+
+    baseline = load_baseline("methods")
+    regressions = compare(results, baseline, args.tolerance)
+    if args.save_baseline:
+        print(f"Baseline saved to {save_baseline('methods', {**baseline, **results})}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.tolerance:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
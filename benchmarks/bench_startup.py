@@ -0,0 +1,70 @@
+"""Cold-start benchmark of the interpolate CLI.
+
+Each case starts a fresh interpreter, so the timings include Python startup
+and every module imported at load time.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat N] [--save-baseline] [--tolerance 0.2]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from _baseline import compare, load_baseline, save_baseline
+
+ROOT = Path(__file__).resolve().parent.parent
+CLI = ROOT / "iitp-interpolations.py"
+IMAGE = ROOT / "examples" / "noise.jpg"
+
+
+def _cases(out_dir: Path) -> dict[str, list[str]]:
+    return {
+        "python": ["-c", "pass"],
+        "cli --help": [str(CLI), "--help"],
+        "cli resize --no-show --save": [
+            str(CLI),
+            str(IMAGE),
+            "0.5",
+            "0.5",
+            "--no-show",
+            "--save",
+            str(out_dir / "out.png"),
+        ],
+    }
+
+
+def _time_command(args: list[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, capture_output=True, cwd=ROOT)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main() -> int:
+    """Runs the benchmark and returns a non-zero exit code on regressions."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; the median is reported")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before failing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {name: _time_command(cmd, args.repeat) for name, cmd in _cases(Path(tmp)).items()}
+
+    print("Cold-start time, seconds (median):")
+    regressions = compare(results, load_baseline("startup"), args.tolerance)
+    if args.save_baseline:
+        print(f"Baseline saved to {save_baseline('startup', results)}")
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,34 +1,80 @@
 """IITP-interpolations main executable function."""
 
+import contextlib
+import functools
+import os
+import sys
+from collections.abc import Callable
+from pathlib import Path
+
 import click
-import matplotlib.pyplot as plt
 import numpy as np
 from PIL import Image
-from sklearn.metrics import mean_absolute_error
 
-from methods.bilinear import bilinear_interpolation
-from methods.lanczos import lanczos_interpolation
-from methods.spline import spline_interpolation
+# The methods package is imported inside the commands that use it, so --help
+# and the plain resize path do not load the server, asyncio, the batch
+# pipeline or the registry's plugin discovery.
+
+
+class _DefaultGroup(click.Group):
+    """Command group that runs ``resize`` when no subcommand name is given."""
+
+    def parse_args(self, ctx: click.Context, args: list[str]) -> list[str]:
+        if args and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args.insert(0, "resize")
+        return super().parse_args(ctx, args)
+
+
+def _parse_shape(ctx: click.Context, param: click.Parameter, value: str | None) -> tuple[int, ...] | None:  # noqa: ARG001
+    """Parses a raw image shape given as ``H,W`` or ``H,W,C``."""
+    if value is None:
+        return None
+    try:
+        shape = tuple(int(part) for part in value.replace("x", ",").split(","))
+    except ValueError:
+        shape = ()
+    if len(shape) not in (2, 3) or min(shape) <= 0:
+        msg = f"expected H,W or H,W,C, got {value!r}"
+        raise click.BadParameter(msg)
+    return shape
+
+
+def _check_method(ctx: click.Context, param: click.Parameter, value: str) -> str:  # noqa: ARG001
+    """Validates a method name against the registry when the command runs, not when the CLI loads."""
+    from methods.registry import registry  # noqa: PLC0415 - loads the plugins
+
+    try:
+        registry.get(value.lower())
+    except ValueError as error:
+        raise click.BadParameter(str(error)) from error
+    return value.lower()
 
-INTERPOLATION_METHODS: dict[str, callable] = {
-    "bilinear": bilinear_interpolation,
-    "lanczos": lanczos_interpolation,
-    "spline": spline_interpolation,
-}
 
+def _method_option(func: Callable) -> Callable:
+    """Adds the ``--method`` option shared by the commands."""
+    return click.option(
+        "--method",
+        "-m",
+        default="bilinear",
+        show_default=True,
+        callback=_check_method,
+        help="Interpolation method to use: bilinear, lanczos, spline or one added by a plugin.",
+    )(func)
 
-@click.command()
+
+@click.group(cls=_DefaultGroup)
+def main() -> None:
+    """Image interpolation CLI.
+
+    Without a subcommand, the arguments are passed to ``resize``.
+    """
+
+
+@main.command()
 @click.argument("image_path", type=click.Path(exists=True))
 @click.argument("x_scale", type=float)
 @click.argument("y_scale", type=float)
-@click.option(
-    "--method",
-    "-m",
-    type=click.Choice(INTERPOLATION_METHODS.keys(), case_sensitive=False),
-    default="bilinear",
-    show_default=True,
-    help="Interpolation method to use",
-)
+@_method_option
 @click.option(
     "--showcase",
     "showcase",
@@ -36,6 +82,13 @@ INTERPOLATION_METHODS: dict[str, callable] = {
     default=False,
     help="Run all interpolation methods and compare visually.",
 )
+@click.option(
+    "--report",
+    "report_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Write a quality-versus-time report of all methods (.json or .csv).",
+)
 @click.option(
     "--save",
     "save_path",
@@ -43,36 +96,469 @@ INTERPOLATION_METHODS: dict[str, callable] = {
     default=None,
     help="Path to save the interpolated image",
 )
-def main(
+@click.option(
+    "--show/--no-show",
+    "show",
+    default=True,
+    show_default=True,
+    help="Display the images. Use --no-show for headless runs.",
+)
+@click.option("--progress", is_flag=True, default=False, help="Show a progress bar while interpolating.")
+@click.option(
+    "--raw-shape",
+    callback=_parse_shape,
+    default=None,
+    help="Read IMAGE_PATH as a headerless raw file of shape H,W or H,W,C.",
+)
+@click.option("--raw-dtype", default="uint8", show_default=True, help="Pixel type of a raw input file.")
+@click.option(
+    "--max-memory",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Cap on temporary memory in MiB. Defaults to 256 for .npy and raw inputs.",
+)
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Reuse results and plans stored in this directory, keyed by image content and parameters.",
+)
+def resize(  # noqa: PLR0913
     image_path: str,
     x_scale: float,
     y_scale: float,
     method: str,
     *,
     showcase: bool,
+    report_path: Path | None,
     save_path: str | None,
+    show: bool,
+    progress: bool,
+    raw_shape: tuple[int, ...] | None,
+    raw_dtype: str,
+    max_memory: int | None,
+    cache_dir: Path | None,
 ) -> None:
-    """Image interpolation CLI. IMAGE_PATH is the input image."""
-    image = Image.open(image_path)
-    image_arr = np.asarray(image)
+    """Resize and display a single image. IMAGE_PATH is the input image.
+
+    .npy and raw inputs are memory-mapped and resized in row bands. Saving to a
+    .npy, .raw or .bin path writes the result straight into a memory-mapped
+    file in the input dtype.
+    """
+    from methods.raster import open_raster  # noqa: PLC0415
+
+    image_arr = open_raster(image_path, raw_shape=raw_shape, raw_dtype=raw_dtype)
 
     new_height = int(x_scale * image_arr.shape[0])
     new_width = int(y_scale * image_arr.shape[1])
 
+    if report_path is not None:
+        from methods.compare import quality_report, write_report  # noqa: PLC0415 - imports the metrics
+
+        reports = quality_report(image_arr, new_height, new_width, _cached_methods(None))
+        write_report(reports, report_path)
+        for report in reports:
+            click.echo(f"{report.method}: {report.seconds * 1e3:.1f} ms, round-trip PSNR {report.psnr:.2f} dB")
+
     if showcase:
-        _showcase_all_methods(image_arr, new_height, new_width)
+        _showcase_all_methods(image_arr, new_height, new_width, _cached_methods(cache_dir), show=show)
         return
 
-    interpolation_func = INTERPOLATION_METHODS[method.lower()]
-    interpolated = interpolation_func(image_arr, new_height, new_width)
+    interpolation_func = _cached_methods(cache_dir, [method])[method]
+    options = _resize_options(
+        image_arr,
+        (new_height, new_width),
+        method,
+        progress=progress,
+        max_memory=max_memory,
+        save_path=save_path,
+    )
+    interpolated = interpolation_func(image_arr, new_height, new_width, **options)
 
-    _show_images(image_arr, interpolated)
+    if show:
+        _show_images(image_arr, interpolated)
 
-    if save_path:
+    if isinstance(interpolated, np.memmap):
+        interpolated.flush()
+    elif save_path:
         Image.fromarray(interpolated).save(save_path)
 
 
+def _cached_methods(cache_dir: Path | None, names: list[str] | None = None) -> dict[str, callable]:
+    """Returns methods on their fastest backends, with results cached in ``cache_dir`` if given.
+
+    Args:
+        cache_dir (Path | None): Directory of the result and plan cache.
+        names (list[str] | None, optional): Methods to return. Defaults to
+            all registered ones, including plugins.
+    """
+    from methods.registry import registry  # noqa: PLC0415
+
+    methods = {name: _click_errors(registry.dispatcher(name)) for name in names or registry.names()}
+    if cache_dir is None:
+        return methods
+
+    from methods.diskcache import DiskCache  # noqa: PLC0415
+    from methods.plan import plan_cache  # noqa: PLC0415
+
+    cache = DiskCache(cache_dir)
+    plan_cache.configure(store=cache)
+    return {name: cache.wrap(name, func) for name, func in methods.items()}
+
+
+def _click_errors(func: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+    """Reports the ValueErrors of a method, e.g. for an unsupported image, as CLI errors."""
+
+    @functools.wraps(func)
+    def wrapper(*args: object, **kwargs: object) -> np.ndarray:
+        try:
+            return func(*args, **kwargs)
+        except ValueError as error:
+            raise click.ClickException(str(error)) from error
+
+    return wrapper
+
+
+def _resize_options(  # noqa: PLR0913
+    image_arr: np.ndarray,
+    new_shape: tuple[int, int],
+    method: str,
+    *,
+    progress: bool,
+    max_memory: int | None,
+    save_path: str | None,
+) -> dict:
+    """Returns the keyword arguments of the interpolation call of ``resize``."""
+    from methods.hooks import TqdmProgress  # noqa: PLC0415
+    from methods.raster import STREAM_MEMORY, create_raster, is_mapped  # noqa: PLC0415
+
+    options = {}
+    if progress:
+        # Row bands give the bar something to advance on
+        options = {"hooks": TqdmProgress(f"{method.capitalize()} interpolation"), "tile_shape": (64, new_shape[1])}
+    if max_memory is not None:
+        options["max_memory"] = max_memory << 20
+    elif isinstance(image_arr, np.memmap):
+        options["max_memory"] = STREAM_MEMORY
+    if save_path and is_mapped(save_path):
+        options["out"] = create_raster(save_path, (*new_shape, *image_arr.shape[2:]), image_arr.dtype)
+        options["preserve_dtype"] = True
+    return options
+
+
+@main.command()
+@click.argument("inputs", nargs=-1)
+@click.argument("x_scale", type=float)
+@click.argument("y_scale", type=float)
+@click.option(
+    "--out-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory for the resized images.",
+)
+@_method_option
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Images resized at once; they share the CPUs between them.",
+)
+@click.option("--io-workers", type=click.IntRange(min=1), default=2, show_default=True, help="Decode/encode threads.")
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Images buffered between stages.",
+)
+@click.option("--suffix", default=None, help="Output file suffix, e.g. .png. Defaults to the input suffix.")
+@click.option(
+    "--cache-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=None,
+    help="Reuse results and plans stored in this directory, keyed by image content and parameters.",
+)
+def batch(  # noqa: PLR0913
+    inputs: tuple[str, ...],
+    x_scale: float,
+    y_scale: float,
+    *,
+    out_dir: Path,
+    method: str,
+    workers: int,
+    io_workers: int,
+    queue_size: int,
+    suffix: str | None,
+    cache_dir: Path | None,
+) -> None:
+    """Resize many images headlessly.
+
+    INPUTS are directories, glob patterns or files; if none are given (or
+    "-" is given), paths are read from stdin, one per line. Images whose
+    output already exists in OUT_DIR are skipped.
+    """
+    from methods.pipeline import collect_inputs, run_batch  # noqa: PLC0415
+
+    specs = [spec for spec in inputs if spec != "-"]
+    if not inputs or "-" in inputs:
+        specs += [line.strip() for line in sys.stdin if line.strip()]
+
+    interpolation_func = _cached_methods(cache_dir, [method])[method]
+    # Jobs run --workers at a time, so each resize gets its share of the CPUs
+    max_workers = max((os.cpu_count() or 1) // workers, 1)
+
+    def resize_one(image: np.ndarray) -> np.ndarray:
+        new_height = int(x_scale * image.shape[0])
+        new_width = int(y_scale * image.shape[1])
+        return interpolation_func(image, new_height, new_width, max_workers=max_workers)
+
+    stats = run_batch(
+        collect_inputs(specs),
+        out_dir,
+        resize_one,
+        workers=workers,
+        io_workers=io_workers,
+        queue_size=queue_size,
+        suffix=suffix,
+    )
+    for path, error in stats.failed:
+        click.echo(f"[ERROR] {path}: {error}", err=True)
+    click.echo(stats.summary())
+
+
+@main.command()
+@click.argument("source")
+@click.argument("x_scale", type=float)
+@click.argument("y_scale", type=float)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(path_type=Path),
+    required=True,
+    help="Output directory for frame images, or a .npy file for a (T, H, W[, C]) stack.",
+)
+@_method_option
+@click.option("--batch-size", type=click.IntRange(min=1), default=8, show_default=True, help="Frames per batch.")
+@click.option(
+    "--workers",
+    "-j",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Frames resized concurrently.",
+)
+@click.option("--io-workers", type=click.IntRange(min=1), default=2, show_default=True, help="Decode/encode threads.")
+@click.option(
+    "--queue-size",
+    type=click.IntRange(min=1),
+    default=8,
+    show_default=True,
+    help="Frames buffered per I/O stage.",
+)
+@click.option("--suffix", default=".png", show_default=True, help="Suffix of the output frame images.")
+def sequence(  # noqa: PLR0913
+    source: str,
+    x_scale: float,
+    y_scale: float,
+    *,
+    output: Path,
+    method: str,
+    batch_size: int,
+    workers: int,
+    io_workers: int,
+    queue_size: int,
+    suffix: str,
+) -> None:
+    """Resize a sequence of same-size frames.
+
+    SOURCE is a .npy stack of shape (T, H, W) or (T, H, W, C), or a directory
+    or glob pattern of frame images, taken in name order. The geometry is
+    computed once, and decoding, resizing and encoding overlap.
+    """
+    from methods.pipeline import collect_inputs  # noqa: PLC0415
+    from methods.raster import create_raster, open_raster  # noqa: PLC0415
+    from methods.sequence import run_sequence  # noqa: PLC0415
+
+    if source.lower().endswith(".npy"):
+        stack = open_raster(source)
+        sources = list(range(len(stack)))
+        names = [f"frame_{index:06d}" for index in sources]
+
+        def read(index: int) -> np.ndarray:
+            return np.array(stack[index])
+
+        first = read(0) if sources else None
+    else:
+        sources = collect_inputs([source])
+        names = [path.stem for path in sources]
+
+        def read(path: Path) -> np.ndarray:
+            with Image.open(path) as image:
+                return np.asarray(image)
+
+        first = read(sources[0]) if sources else None
+
+    if first is None:
+        msg = f"No frames found in {source}"
+        raise click.ClickException(msg)
+    new_height = int(x_scale * first.shape[0])
+    new_width = int(y_scale * first.shape[1])
+
+    if output.suffix.lower() == ".npy":
+        frames = create_raster(output, (len(sources), new_height, new_width, *first.shape[2:]), first.dtype)
+
+        def write(index: int, frame: np.ndarray) -> None:
+            frames[index] = frame
+
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+
+        def write(index: int, frame: np.ndarray) -> None:
+            Image.fromarray(frame).save(output / f"{names[index]}{suffix}")
+
+    stats = run_sequence(
+        sources,
+        read,
+        write,
+        new_height,
+        new_width,
+        method=method,
+        batch_size=batch_size,
+        workers=workers,
+        io_workers=io_workers,
+        queue_size=queue_size,
+    )
+    if output.suffix.lower() == ".npy":
+        frames.flush()
+    click.echo(stats.summary())
+
+
+@main.command()
+@click.argument("image_path", type=click.Path(exists=True, dir_okay=False, path_type=Path))
+@click.option(
+    "--scale",
+    "-s",
+    "scales",
+    type=click.FloatRange(min=0, min_open=True),
+    multiple=True,
+    help="Scale factor of a level; repeatable.",
+)
+@click.option(
+    "--width",
+    "-w",
+    "widths",
+    type=click.IntRange(min=1),
+    multiple=True,
+    help="Width of a level; repeatable.",
+)
+@click.option(
+    "--out-dir",
+    "-o",
+    type=click.Path(file_okay=False, path_type=Path),
+    required=True,
+    help="Directory for the levels, named <stem>_<width>x<height><suffix>.",
+)
+@_method_option
+@click.option("--workers", "-j", type=click.IntRange(min=1), default=1, show_default=True, help="Resize threads.")
+@click.option("--suffix", default=None, help="Output file suffix, e.g. .png. Defaults to the input suffix.")
+def pyramid(  # noqa: PLR0913
+    image_path: Path,
+    *,
+    scales: tuple[float, ...],
+    widths: tuple[int, ...],
+    out_dir: Path,
+    method: str,
+    workers: int,
+    suffix: str | None,
+) -> None:
+    """Resize one image to several sizes at once.
+
+    The image is decoded once, and each level is resized from a larger level
+    already computed, with antialiasing, instead of from the full image.
+    """
+    from methods.pyramid import build_pyramid, pyramid_sizes  # noqa: PLC0415
+    from methods.raster import open_raster  # noqa: PLC0415
+
+    if not scales and not widths:
+        msg = "Give at least one --scale or --width"
+        raise click.UsageError(msg)
+    image = open_raster(image_path)
+    sizes = pyramid_sizes(image.shape, scales=scales, widths=widths)
+    levels = build_pyramid(image, sizes, method, workers=workers)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    suffix = suffix or image_path.suffix
+    for (height, width), level in zip(sizes, levels, strict=True):
+        path = out_dir / f"{image_path.stem}_{width}x{height}{suffix}"
+        if suffix.lower() == ".npy":
+            np.save(path, level)
+        else:
+            Image.fromarray(level).save(path)
+        click.echo(path)
+
+
+@main.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to listen on.")
+@click.option("--port", "-p", type=click.IntRange(min=0), default=8000, show_default=True, help="Port to listen on.")
+@click.option("--workers", "-j", type=click.IntRange(min=1), default=1, show_default=True, help="Resize threads.")
+@click.option(
+    "--max-queue",
+    type=click.IntRange(min=1),
+    default=64,
+    show_default=True,
+    help="Jobs waiting or running before new ones get 503.",
+)
+@click.option("--max-batch", type=click.IntRange(min=1), default=16, show_default=True, help="Jobs per batch.")
+@click.option(
+    "--batch-window",
+    type=click.FloatRange(min=0),
+    default=5.0,
+    show_default=True,
+    help="Milliseconds a new geometry waits for more jobs to batch.",
+)
+@click.option(
+    "--root",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=None,
+    help="Directory whose files jobs may name with path=. Without it, path= is refused.",
+)
+def serve(  # noqa: PLR0913
+    *,
+    host: str,
+    port: int,
+    workers: int,
+    max_queue: int,
+    max_batch: int,
+    batch_window: float,
+    root: Path | None,
+) -> None:
+    """Serve resize jobs over HTTP until interrupted.
+
+    POST an image to /resize?height=H&width=W&method=M, or pass path= to read
+    a file under --root. GET /metrics returns the queue depth and latency histogram.
+    """
+    import asyncio  # noqa: PLC0415
+
+    from methods.server import ResizeServer  # noqa: PLC0415
+
+    server = ResizeServer(
+        workers=workers,
+        max_queue=max_queue,
+        max_batch=max_batch,
+        batch_window=batch_window / 1000,
+        root=root,
+    )
+    click.echo(f"Serving on http://{host}:{port}")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(server.serve(host, port))
+
+
 def _show_images(original: np.ndarray, interpolated: np.ndarray) -> None:
+    import matplotlib.pyplot as plt  # noqa: PLC0415 - slow import, only needed for display
+
     fig, ax = plt.subplots(1, 2, figsize=(10, 5))
     ax[0].imshow(original)
     ax[0].set_title("Original")
@@ -86,26 +572,39 @@ def _show_images(original: np.ndarray, interpolated: np.ndarray) -> None:
     plt.show()
 
 
-def _showcase_all_methods(image_arr: np.ndarray, new_h: int, new_w: int) -> None:
+def _showcase_all_methods(
+    image_arr: np.ndarray,
+    new_h: int,
+    new_w: int,
+    methods: dict[str, callable],
+    *,
+    show: bool,
+) -> None:
+    from methods.compare import compare_all  # noqa: PLC0415
+
     results: dict[str, np.ndarray] = {"Original": image_arr}
-    for name, func in INTERPOLATION_METHODS.items():
+    for name, func in methods.items():
         print(f"[INFO] Interpolating using {name}...")
         result = func(image_arr, new_h, new_w)
         results[name.capitalize()] = result
 
     # Анализ схожести между методами
-    print("\n[INFO] Comparing interpolated results (MAE between methods):")
-    methods = list(results.keys())[1:]
-    for i in range(len(methods)):
-        for j in range(i + 1, len(methods)):
-            a = results[methods[i]].astype(np.float32).flatten()
-            b = results[methods[j]].astype(np.float32).flatten()
-            mae = mean_absolute_error(a, b)
-            print(f"  {methods[i]} vs {methods[j]}: MAE = {mae:.2f}")
+    print("\n[INFO] Comparing interpolated results between methods:")
+    interpolated = {name: result for name, result in results.items() if name != "Original"}
+    for (first, second), metrics in compare_all(interpolated).items():
+        print(
+            f"  {first} vs {second}: MAE = {metrics.mae:.2f}, RMSE = {metrics.rmse:.2f}, "
+            f"PSNR = {metrics.psnr:.2f} dB, max = {metrics.max_abs:.0f}",
+        )
+
+    if not show:
+        return
+
+    import matplotlib.pyplot as plt  # noqa: PLC0415 - slow import, only needed for display
 
     # Отображение результатов
-    fig, axes = plt.subplots(1, 4, figsize=(16, 5))
-    for ax, (title, img) in zip(axes, results.items(), strict=False):
+    fig, axes = plt.subplots(1, len(results), figsize=(4 * len(results), 5), squeeze=False)
+    for ax, (title, img) in zip(axes[0], results.items(), strict=True):
         ax.imshow(img)
         ax.set_title(title)
         ax.axis("off")
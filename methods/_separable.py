@@ -0,0 +1,521 @@
+"""Separable resampling helpers shared by the interpolation methods."""
+
+import functools
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+import numpy as np
+import numpy.typing as npt
+
+from methods.hooks import ResizeHooks, timed
+from methods.plan import AxisTaps, ResamplingPlan
+from methods.workspace import ScratchBuffers, Workspace
+
+FLOAT_ITEMSIZE = np.dtype(np.float64).itemsize
+
+# Fixed allowance for NumPy's ufunc iteration buffers and the per-tile tap slices
+ITERATOR_BYTES = 2 * np.getbufsize() * FLOAT_ITEMSIZE
+
+# Extra fractional bits kept between the row and column passes of the integer path
+INTER_BITS = 7
+
+# Widest integer input resampled with fixed-point arithmetic; wider ones could overflow int64
+FIXED_POINT_ITEMSIZE = 2
+
+# Input types that keep their dtype; others give uint8 output unless preserve_dtype is set
+KEPT_DTYPES = (np.dtype(np.uint8), np.dtype(np.uint16), np.dtype(np.int16))
+
+
+def antialias_taps(
+    src_len: int,
+    dst_len: int,
+    kernel: Callable[[np.ndarray], np.ndarray],
+    radius: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Builds a tap table whose kernel footprint widens with the downscale factor.
+
+    When shrinking by a factor ``s`` the kernel is stretched to ``radius * s``
+    source pixels, so every source pixel contributes to some output pixel and
+    high frequencies are filtered out instead of aliasing. Taps past the image
+    border are clamped to the edge pixels.
+
+    Args:
+        src_len (int): Length of the source axis.
+        dst_len (int): Length of the output axis.
+        kernel (Callable[[np.ndarray], np.ndarray]): Vectorized kernel of the method.
+        radius (float): Support radius of the kernel at scale 1.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Source indices and normalized weights,
+        both of shape (dst_len, 2 * ceil(radius * s) + 1). Taps outside the
+        stretched support have zero weight.
+    """
+    coords = np.linspace(0, src_len - 1, dst_len)
+    scale = max((src_len - 1) / max(dst_len - 1, 1), 1.0)
+    reach = math.ceil(radius * scale)
+
+    positions = np.floor(coords).astype(np.intp)[:, None] + np.arange(-reach, reach + 1)
+    weights = kernel((coords[:, None] - positions) / scale)
+
+    norm = weights.sum(axis=1, keepdims=True)
+    weights = np.divide(weights, norm, out=np.zeros_like(weights), where=norm != 0)
+    return np.clip(positions, 0, src_len - 1), weights
+
+
+def quantize_weights(weights: np.ndarray, frac_bits: int) -> np.ndarray:
+    """Converts normalized float weights to int16 fixed-point values.
+
+    The rounding residue of each row is put on its largest tap, so every row
+    sums exactly to ``1 << frac_bits`` and flat areas stay flat.
+
+    Args:
+        weights (np.ndarray): Weights of shape (n, taps) whose rows sum to one
+            or are all zero.
+        frac_bits (int): Number of fractional bits.
+
+    Returns:
+        np.ndarray: Fixed-point weights of the same shape.
+    """
+    fixed = np.rint(weights * (1 << frac_bits)).astype(np.int32)
+    residue = np.where(weights.any(axis=1), (1 << frac_bits) - fixed.sum(axis=1), 0)
+    fixed[np.arange(len(fixed)), np.abs(fixed).argmax(axis=1)] += residue
+    return fixed.astype(np.int16)
+
+
+def is_downscale(src_len: int, dst_len: int) -> bool:
+    """Returns True if output samples are spaced wider than source pixels."""
+    return src_len - 1 > max(dst_len - 1, 1)
+
+
+def resample_axis(  # noqa: PLR0913
+    image: np.ndarray,
+    indices: np.ndarray,
+    weights: np.ndarray,
+    axis: int,
+    *,
+    hooks: ResizeHooks | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    scratch: ScratchBuffers | None = None,
+    name: str = "",
+) -> np.ndarray:
+    """Applies a 1D tap table along one axis of an image.
+
+    Every output position ``i`` along ``axis`` is the weighted sum
+    ``sum_k weights[i, k] * image[indices[i, k]]``. The sum is accumulated one
+    tap at a time, so each step is a single batched gather over the whole image.
+
+    Args:
+        image (np.ndarray): Input array.
+        indices (np.ndarray): Source indices of shape (n, taps).
+        weights (np.ndarray): Tap weights of shape (n, taps).
+        axis (int): Axis of ``image`` to resample.
+        hooks (ResizeHooks | None): Receives the gather and weight timings.
+        dtype (npt.DTypeLike): Accumulator type; gathered pixels are
+            converted to it before they are weighted.
+        scratch (ScratchBuffers | None): Buffers to compute in instead of
+            newly allocated arrays. The result is then one of them.
+        name (str): Prefix of the scratch buffer names, so that consecutive
+            passes do not overwrite each other's result.
+
+    Returns:
+        np.ndarray: Array of ``dtype`` with ``image.shape[axis]`` replaced by ``n``.
+    """
+    dtype = np.dtype(dtype)
+    shape = [1] * image.ndim
+    shape[axis] = -1
+    out_shape = (*image.shape[:axis], len(indices), *image.shape[axis + 1 :])
+
+    out = _buffer(scratch, f"{name}out", out_shape, dtype)
+    term = _buffer(scratch, f"{name}term", out_shape, dtype) if indices.shape[1] > 1 else out
+    gathered = term if image.dtype == dtype else _buffer(scratch, f"{name}gather", out_shape, image.dtype)
+
+    gather_time = weight_time = 0.0
+    for k in range(indices.shape[1]):
+        start = time.perf_counter()
+        np.take(image, indices[:, k], axis=axis, out=gathered, mode="clip")
+        taken = time.perf_counter()
+        if k == 0:
+            np.multiply(gathered, weights[:, k].reshape(shape), out=out, dtype=dtype)
+        else:
+            np.multiply(gathered, weights[:, k].reshape(shape), out=term, dtype=dtype)
+            out += term
+        gather_time += taken - start
+        weight_time += time.perf_counter() - taken
+
+    if hooks is not None:
+        hooks.on_stage("gather", gather_time)
+        hooks.on_stage("weight", weight_time)
+    return out
+
+
+def _buffer(scratch: ScratchBuffers | None, name: str, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """Returns a scratch array, or a new one without scratch buffers."""
+    if scratch is None:
+        return np.empty(shape, dtype=dtype)
+    return scratch.get(name, shape, dtype)
+
+
+def resample(  # noqa: PLR0913
+    image: np.ndarray,
+    plan: ResamplingPlan,
+    out: np.ndarray | None = None,
+    *,
+    tile_shape: tuple[int, int] | None = None,
+    max_memory: int | None = None,
+    workers: int = 1,
+    hooks: ResizeHooks | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    workspace: Workspace | None = None,
+    roi: tuple[int, int, int, int] | None = None,
+) -> np.ndarray:
+    """Resamples an image with the separable tap tables of a plan, rows first.
+
+    Any trailing axes (e.g. colour channels) are carried through unchanged, so
+    the tap tables are applied to all channels at once. The output is computed
+    tile by tile; each tile reads only the source rows and columns in its
+    support and is written straight into ``out``. Every output pixel goes
+    through the same arithmetic regardless of the tiling or the number of
+    workers, so all of them produce byte-identical results.
+
+    Args:
+        image (np.ndarray): Input image of shape (H, W) or (H, W, C).
+        plan (ResamplingPlan): Tap tables for both axes.
+        out (np.ndarray | None): Output buffer. If omitted, it is allocated
+            with :func:`output_dtype`. Values are clipped to the range of
+            integer dtypes.
+        tile_shape (tuple[int, int] | None): Output tile (rows, columns).
+            Defaults to the whole output, or to row bands when ``workers > 1``.
+        max_memory (int | None): Upper bound in bytes on the temporary buffers
+            of all tiles in flight; the tile shape is reduced until they fit.
+        workers (int): Number of threads computing tiles concurrently. NumPy
+            releases the GIL in the gathers and arithmetic, so threads scale.
+        hooks (ResizeHooks | None): Receives stage timings, finished rows and
+            processed bytes.
+        dtype (npt.DTypeLike): Floating-point type of the accumulators.
+            float32 halves the temporary memory and its bandwidth. Ignored by
+            the integer path of fixed-point taps.
+        preserve_dtype (bool): Allocate the output with the input dtype also
+            for float images, which are then returned without clipping.
+        workspace (Workspace | None): Scratch memory kept between calls. With
+            it and ``out``, repeated same-size resizes allocate no large arrays.
+        roi (tuple[int, int, int, int] | None): Output window (top, left,
+            height, width) to compute instead of the whole output; see
+            :func:`crop_plan`.
+
+    Returns:
+        np.ndarray: The output of shape (new_h, new_w) or (new_h, new_w, C),
+        or of the ``roi`` height and width.
+
+    Raises:
+        ValueError: If ``workers`` is not positive, ``dtype`` is not a
+            floating-point type, ``out`` has the wrong shape or ``roi`` is
+            outside the output.
+    """
+    if workers < 1:
+        msg = "workers must be positive"
+        raise ValueError(msg)
+    if np.dtype(dtype).kind != "f":
+        msg = f"dtype must be a floating-point type, got {np.dtype(dtype)}"
+        raise ValueError(msg)
+    if roi is not None:
+        plan = crop_plan(plan, roi)
+
+    new_shape = (len(plan.rows.indices), len(plan.cols.indices), *image.shape[2:])
+    out = output_array(image, new_shape, out, preserve_dtype=preserve_dtype)
+    acc = _accumulator(image.dtype, plan, dtype)
+
+    if tile_shape is None and workers > 1:
+        # Several bands per worker keep the threads busy when bands finish unevenly
+        tile_shape = (max(-(-new_shape[0] // (4 * workers)), 1), new_shape[1])
+    if max_memory is not None:
+        max_memory //= workers
+    tile_h, tile_w = _tile_shape(image, plan, tile_shape, max_memory, acc)
+
+    tiles = [(r0, c0) for r0 in range(0, new_shape[0], tile_h) for c0 in range(0, new_shape[1], tile_w)]
+    # Column tiles still missing from each row band, to report finished rows
+    pending = dict.fromkeys(range(0, new_shape[0], tile_h), -(-new_shape[1] // tile_w))
+    lock = threading.Lock()
+
+    def run_tile(r0: int, c0: int) -> None:
+        rows, row_lo, row_hi = slice_taps(plan.rows, r0, r0 + tile_h)
+        cols, col_lo, col_hi = slice_taps(plan.cols, c0, c0 + tile_w)
+        window = image[row_lo:row_hi, col_lo:col_hi]
+        dst = out[r0 : r0 + tile_h, c0 : c0 + tile_w]
+        with workspace.scratch() if workspace is not None else nullcontext() as scratch:
+            tile = _resample_tile(_contiguous(window, scratch), rows, cols, acc, hooks, scratch=scratch)
+            with timed(hooks, "write"):
+                store(dst, tile)
+
+        if hooks is not None:
+            hooks.on_bytes(window.nbytes, dst.nbytes)
+            with lock:
+                pending[r0] -= 1
+                finished = pending[r0] == 0
+            if finished:
+                hooks.on_rows(len(dst), new_shape[0])
+
+    run_tiles(run_tile, tiles, workers)
+    return out
+
+
+def output_array(
+    image: np.ndarray,
+    shape: tuple[int, ...],
+    out: np.ndarray | None,
+    *,
+    preserve_dtype: bool = False,
+) -> np.ndarray:
+    """Checks ``out`` against the output shape, or allocates the output with :func:`output_dtype`.
+
+    Raises:
+        ValueError: If ``out`` has the wrong shape.
+    """
+    if out is None:
+        return np.empty(shape, dtype=output_dtype(image.dtype, preserve_dtype=preserve_dtype))
+    if out.shape != shape:
+        msg = f"out has shape {out.shape}, expected {shape}"
+        raise ValueError(msg)
+    return out
+
+
+def output_dtype(dtype: npt.DTypeLike, *, preserve_dtype: bool = False) -> np.dtype:
+    """Returns the dtype of a new output for an input dtype.
+
+    uint8 and 16-bit integer images keep their dtype. Everything else
+    becomes uint8, unless ``preserve_dtype`` is set.
+    """
+    dtype = np.dtype(dtype)
+    return dtype if preserve_dtype or dtype in KEPT_DTYPES else np.dtype(np.uint8)
+
+
+def _resample_tile(  # noqa: PLR0913
+    window: np.ndarray,
+    rows: AxisTaps,
+    cols: AxisTaps,
+    acc: np.dtype,
+    hooks: ResizeHooks | None,
+    *,
+    scratch: ScratchBuffers | None = None,
+) -> np.ndarray:
+    """Resamples a source window with taps relative to it, rows first.
+
+    With an integer accumulator the fixed-point taps are applied with integer
+    arithmetic only: the row pass keeps ``INTER_BITS`` fractional bits,
+    rounded, and the column pass shifts them out together with the weight
+    scale, truncating toward zero like the float path does.
+    """
+    if acc.kind == "i":
+        tile = resample_axis(window, rows.indices, rows.weights, 0, hooks=hooks, dtype=acc, scratch=scratch, name="row")
+        shift = rows.frac_bits - INTER_BITS
+        tile += 1 << (shift - 1)
+        tile >>= shift
+        tile = resample_axis(tile, cols.indices, cols.weights, 1, hooks=hooks, dtype=acc, scratch=scratch, name="col")
+        shift = cols.frac_bits + INTER_BITS
+        if window.dtype.kind == "i":
+            # An arithmetic shift rounds toward minus infinity; biasing negative values makes it truncate
+            np.add(tile, (1 << shift) - 1, out=tile, where=tile < 0)
+        tile >>= shift
+        return tile
+
+    row_weights, col_weights = _float_weights(rows, acc), _float_weights(cols, acc)
+    tile = resample_axis(window, rows.indices, row_weights, 0, hooks=hooks, dtype=acc, scratch=scratch, name="row")
+    return resample_axis(tile, cols.indices, col_weights, 1, hooks=hooks, dtype=acc, scratch=scratch, name="col")
+
+
+def _contiguous(window: np.ndarray, scratch: ScratchBuffers | None) -> np.ndarray:
+    """Copies a strided source window into a scratch buffer.
+
+    np.take would otherwise make its own contiguous copy of the window.
+    """
+    if scratch is None or window.flags.c_contiguous:
+        return window
+    contiguous = scratch.get("window", window.shape, window.dtype)
+    np.copyto(contiguous, window)
+    return contiguous
+
+
+def _accumulator(dtype: np.dtype, plan: ResamplingPlan, float_dtype: npt.DTypeLike) -> np.dtype:
+    """Returns the accumulator type of both passes.
+
+    Fixed-point taps on integer input of at most 16 bits use int32 if the
+    integer passes cannot overflow it, else int64, which always fits. Wider
+    integers and everything else accumulate in ``float_dtype``.
+    """
+    rows, cols = plan
+    if not (rows.frac_bits and cols.frac_bits and dtype.kind in "ui" and dtype.itemsize <= FIXED_POINT_ITEMSIZE):
+        return np.dtype(float_dtype)
+    gain_rows = int(np.abs(rows.weights).sum(axis=1, dtype=np.int64).max(initial=0))
+    gain_cols = int(np.abs(cols.weights).sum(axis=1, dtype=np.int64).max(initial=0))
+    peak = max(abs(np.iinfo(dtype).min), np.iinfo(dtype).max)
+    inter = (peak * gain_rows >> (rows.frac_bits - INTER_BITS)) + 1
+    fits = max(peak * gain_rows, inter * gain_cols) < np.iinfo(np.int32).max
+    return np.dtype(np.int32 if fits else np.int64)
+
+
+def _float_weights(taps: AxisTaps, dtype: np.dtype) -> np.ndarray:
+    """Returns the weights of ``taps`` as ``dtype``, scaling fixed-point ones."""
+    if taps.frac_bits:
+        return (taps.weights / (1 << taps.frac_bits)).astype(dtype, copy=False)
+    return taps.weights.astype(dtype, copy=False)
+
+
+def run_tiles(run_tile: Callable[[int, int], None], tiles: list[tuple[int, int]], workers: int) -> None:
+    """Runs ``run_tile`` for every tile origin, on a thread pool if ``workers > 1``."""
+    if workers == 1 or len(tiles) == 1:
+        for r0, c0 in tiles:
+            run_tile(r0, c0)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(run_tile, r0, c0) for r0, c0 in tiles]:
+            future.result()
+
+
+def tile_memory(
+    image: np.ndarray,
+    plan: ResamplingPlan,
+    tile_shape: tuple[int, int],
+    dtype: npt.DTypeLike = np.float64,
+) -> int:
+    """Estimates the peak temporary memory used to compute one output tile.
+
+    The estimate is an upper bound over all tiles of the given shape and
+    excludes the input and output arrays themselves. It includes the
+    contiguous copy of the source window made by the row pass and a fixed
+    allowance for NumPy's internal iteration buffers.
+
+    Args:
+        image (np.ndarray): Input image of shape (H, W) or (H, W, C).
+        plan (ResamplingPlan): Tap tables for both axes.
+        tile_shape (tuple[int, int]): Output tile (rows, columns).
+        dtype (npt.DTypeLike): Accumulator type of the passes.
+
+    Returns:
+        int: Number of bytes.
+    """
+    acc_size = np.dtype(dtype).itemsize
+    tile_h, tile_w = tile_shape
+    channels = int(np.prod(image.shape[2:], dtype=np.intp))
+    src_h = _max_support(plan.rows, tile_h)
+    src_w = _max_support(plan.cols, tile_w)
+    row_pass = src_h * src_w * image.itemsize + tile_h * src_w * (image.itemsize + 2 * acc_size)
+    col_pass = tile_h * (src_w + 2 * tile_w) * acc_size
+    return channels * max(row_pass, col_pass) + ITERATOR_BYTES
+
+
+def _tile_shape(
+    image: np.ndarray,
+    plan: ResamplingPlan,
+    tile_shape: tuple[int, int] | None,
+    max_memory: int | None,
+    acc: np.dtype,
+) -> tuple[int, int]:
+    new_h, new_w = len(plan.rows.indices), len(plan.cols.indices)
+    tile_h, tile_w = tile_shape if tile_shape is not None else (new_h, new_w)
+    if tile_h <= 0 or tile_w <= 0:
+        msg = "Invalid tile shape"
+        raise ValueError(msg)
+    tile_h, tile_w = max(min(tile_h, new_h), 1), max(min(tile_w, new_w), 1)
+    if max_memory is None:
+        return tile_h, tile_w
+
+    while tile_memory(image, plan, (1, tile_w), acc) > max_memory:
+        if tile_w == 1:
+            msg = "max_memory is too small for a single output pixel"
+            raise ValueError(msg)
+        tile_w = (tile_w + 1) // 2
+
+    # Largest tile height that fits, by bisection
+    lo, hi = 1, tile_h
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if tile_memory(image, plan, (mid, tile_w), acc) <= max_memory:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo, tile_w
+
+
+def slice_taps(taps: AxisTaps, start: int, stop: int) -> tuple[AxisTaps, int, int]:
+    """Returns taps for output positions [start, stop) relative to their source support.
+
+    Args:
+        taps (AxisTaps): Taps of a whole axis.
+        start (int): First output position.
+        stop (int): End of the output positions.
+
+    Returns:
+        tuple[AxisTaps, int, int]: The sliced taps, with indices relative to
+        ``lo``, and the source range [lo, hi) they read.
+    """
+    indices = taps.indices[start:stop]
+    lo, hi = int(indices.min()), int(indices.max()) + 1
+    return AxisTaps(indices - lo, taps.weights[start:stop], taps.frac_bits), lo, hi
+
+
+def crop_plan(plan: ResamplingPlan, roi: tuple[int, int, int, int]) -> ResamplingPlan:
+    """Restricts a plan to a window of its output.
+
+    Every output pixel keeps its taps, so resampling with the cropped plan
+    gives exactly the same window of the full result, and the tiles read only
+    the source rows and columns the window needs.
+
+    Args:
+        plan (ResamplingPlan): Plan of the whole output.
+        roi (tuple[int, int, int, int]): Window (top, left, height, width) in
+            output coordinates.
+
+    Returns:
+        ResamplingPlan: Plan whose output is the window.
+
+    Raises:
+        ValueError: If the window is empty or not inside the output.
+    """
+    top, left, height, width = roi
+    new_h, new_w = len(plan.rows.indices), len(plan.cols.indices)
+    if height <= 0 or width <= 0 or top < 0 or left < 0 or top + height > new_h or left + width > new_w:
+        msg = f"roi {tuple(roi)} is not a non-empty window of the {new_h}x{new_w} output"
+        raise ValueError(msg)
+    rows, cols = plan
+    return ResamplingPlan(
+        AxisTaps(rows.indices[top : top + height], rows.weights[top : top + height], rows.frac_bits),
+        AxisTaps(cols.indices[left : left + width], cols.weights[left : left + width], cols.frac_bits),
+    )
+
+
+def _max_support(taps: AxisTaps, tile: int) -> int:
+    """Returns the widest source support of any tile of ``tile`` output positions."""
+    starts = np.arange(0, len(taps.indices), tile)
+    lo = np.minimum.reduceat(taps.indices.min(axis=1), starts)
+    hi = np.maximum.reduceat(taps.indices.max(axis=1), starts)
+    return int((hi - lo).max()) + 1
+
+
+def store(dst: np.ndarray, values: np.ndarray) -> None:
+    """Writes float values into ``dst``, clipping them to its integer range first.
+
+    Bounds that the float type cannot represent, such as the int64 maximum,
+    are moved inwards to the nearest float so the cast cannot wrap around.
+    """
+    if np.issubdtype(dst.dtype, np.integer):
+        np.clip(values, *_clip_bounds(dst.dtype, values.dtype), out=values)
+    dst[...] = values
+
+
+@functools.cache
+def _clip_bounds(dst_dtype: np.dtype, dtype: np.dtype) -> tuple[float, float]:
+    """Returns the range of ``dst_dtype`` as values of ``dtype`` that cast back into it."""
+    info = np.iinfo(dst_dtype)
+    if dtype.kind != "f":
+        return info.min, info.max
+    bounds = []
+    for bound in (info.min, info.max):
+        value = dtype.type(bound)
+        if abs(int(value)) > abs(bound):
+            value = np.nextafter(value, dtype.type(0))
+        bounds.append(float(value))
+    return bounds[0], bounds[1]
@@ -1,91 +1,187 @@
 """Bilinear interpolation method."""
 
 import numpy as np
+import numpy.typing as npt
 
+from methods._separable import antialias_taps, is_downscale, quantize_weights, resample
+from methods.hooks import ResizeHooks, timed
+from methods.plan import ResamplingPlan, get_plan
+from methods.workspace import Workspace
 
-def bilinear_interpolation(
+# Supported fractional bits of the fixed-point weights
+FRAC_BITS = (8, 11)
+
+
+def bilinear_interpolation(  # noqa: PLR0913
     image: np.ndarray,
     new_height: int,
     new_width: int,
+    *,
+    antialias: bool = False,
+    frac_bits: int | None = None,
+    tile_shape: tuple[int, int] | None = None,
+    max_memory: int | None = None,
+    workers: int = 1,
+    hooks: ResizeHooks | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    out: np.ndarray | None = None,
+    workspace: Workspace | None = None,
+    roi: tuple[int, int, int, int] | None = None,
 ) -> np.ndarray:
     """Performs bilinear interpolation on a 2D (grayscale) or 3D (RGB) image.
 
     Args:
         image (np.ndarray): Input image as a NumPy array. Must be 2D or 3D.
+            Memory maps and other buffer-protocol objects are read without
+            being loaded, one tile's source window at a time.
         new_height (int): Target height of the output image.
         new_width (int): Target width of the output image.
+        antialias (bool, optional): When shrinking, widen the kernel by the
+            scale factor so that every source pixel is averaged in instead of
+            aliasing. Has no effect on enlarged axes. Defaults to False.
+        frac_bits (int | None, optional): Use fixed-point weights with 8 or 11
+            fractional bits. Integer images are then resampled with integer
+            arithmetic only, which moves about half the memory of the float
+            path. 8-bit images stay within 1 of the float result; the error
+            on 16-bit images is about ``2 ** -frac_bits`` of full scale, so
+            use 11 bits for them. Defaults to None (float weights).
+        tile_shape (tuple[int, int] | None, optional): Compute the output in
+            tiles of (rows, columns). Defaults to the whole output at once.
+        max_memory (int | None, optional): Cap in bytes on temporary buffers;
+            the tile shape is reduced until the tiles in flight fit. Defaults to None.
+        workers (int, optional): Number of threads computing output tiles in
+            parallel. Results do not depend on it. Defaults to 1.
+        hooks (ResizeHooks | None, optional): Callbacks receiving stage
+            timings, finished rows and processed bytes. Defaults to None.
+        dtype (npt.DTypeLike, optional): Floating-point accumulator type.
+            float32 halves the temporary memory. Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float images in their own
+            dtype, without clipping, instead of uint8. uint8 and 16-bit
+            integer images always keep their dtype. Defaults to False.
+        out (np.ndarray | None, optional): Array to write the result into,
+            of the output shape. Defaults to a new array.
+        workspace (Workspace | None, optional): Scratch buffers reused
+            between calls; with ``out`` repeated same-size resizes allocate
+            no large arrays. Defaults to None.
+        roi (tuple[int, int, int, int] | None, optional): Compute only the
+            output window (top, left, height, width), reading only the source
+            pixels in its support. The result equals the same crop of the full
+            output bit for bit. Defaults to None (the whole output).
 
     Returns:
         np.ndarray: Interpolated image with shape (new_height, new_width) or
         (new_height, new_width, channels).
 
     Raises:
-        ValueError: If input image has unsupported dimensions.
+        ValueError: If input image has unsupported dimensions or is empty, or
+            if ``frac_bits`` is not supported.
     """
-    if image.ndim == 2:
-        return _bilinear_gray(image, new_height, new_width, 0)
-    if image.ndim == 3:
-        return np.stack(
-            [_bilinear_gray(image[..., c], new_height, new_width, c) for c in range(image.shape[2])],
-            axis=-1,
-        )
-    msg = "Unsupported image dimensions"
-    raise ValueError(msg)
-
-
-def _bilinear_gray(
-    image: np.ndarray,
-    new_h: int,
-    new_w: int,
-    channel: int,
-) -> np.ndarray:
-    """Performs bilinear interpolation on a single grayscale channel.
+    image = np.asarray(image)
+    with timed(hooks, "plan"):
+        plan = bilinear_plan(image.shape, new_height, new_width, antialias=antialias, frac_bits=frac_bits)
+    return resample(
+        image,
+        plan,
+        out,
+        tile_shape=tile_shape,
+        max_memory=max_memory,
+        workers=workers,
+        hooks=hooks,
+        dtype=dtype,
+        preserve_dtype=preserve_dtype,
+        workspace=workspace,
+        roi=roi,
+    )
+
+
+def bilinear_plan(
+    shape: tuple[int, ...],
+    new_height: int,
+    new_width: int,
+    *,
+    antialias: bool = False,
+    frac_bits: int | None = None,
+) -> ResamplingPlan:
+    """Returns the cached bilinear resampling plan for an image shape.
 
     Args:
-        image (np.ndarray): 2D array representing a single channel of the image.
-        new_h (int): Target height of the output image.
-        new_w (int): Target width of the output image.
-        channel (int): Channel index (for logging/debugging).
+        shape (tuple[int, ...]): Shape of the input image, (H, W) or (H, W, C).
+        new_height (int): Target height of the output image.
+        new_width (int): Target width of the output image.
+        antialias (bool, optional): Widen the kernel when shrinking. Defaults to False.
+        frac_bits (int | None, optional): Fractional bits of fixed-point
+            weights, or None for float weights. Defaults to None.
 
     Returns:
-        np.ndarray: Interpolated 2D image of shape (new_h, new_w).
+        ResamplingPlan: Tap tables for both axes.
 
     Raises:
-        ValueError: If the input image is empty.
+        ValueError: If the shape has unsupported dimensions or is empty, if
+            the output size is not positive or if ``frac_bits`` is not supported.
     """
-    h, w = image.shape
+    if len(shape) not in (2, 3):
+        msg = "Unsupported image dimensions"
+        raise ValueError(msg)
+
+    h, w = shape[:2]
     if h == 0 or w == 0:
         msg = "Empty image."
         raise ValueError(msg)
+    if new_height <= 0 or new_width <= 0:
+        msg = "Invalid image or output dimensions"
+        raise ValueError(msg)
 
-    _ = h / new_h
-    _ = w / new_w
-
-    # Сетка новых координат
-    x = np.linspace(0, h - 1, new_h)
-    y = np.linspace(0, w - 1, new_w)
-    x_grid, y_grid = np.meshgrid(x, y, indexing="ij")
+    if frac_bits is not None and frac_bits not in FRAC_BITS:
+        msg = f"Unsupported frac_bits {frac_bits}, expected one of {FRAC_BITS}"
+        raise ValueError(msg)
 
-    x0 = np.floor(x_grid).astype(int)
-    y0 = np.floor(y_grid).astype(int)
-    x1 = np.clip(x0 + 1, 0, h - 1)
-    y1 = np.clip(y0 + 1, 0, w - 1)
+    return get_plan(
+        "bilinear",
+        (h, w),
+        (new_height, new_width),
+        _bilinear_taps,
+        antialias=antialias,
+        frac_bits=frac_bits,
+    )
 
-    dx = x_grid - x0
-    dy = y_grid - y0
 
-    Ia = image[x0, y0]
-    Ib = image[x0, y1]
-    Ic = image[x1, y0]
-    Id = image[x1, y1]
+def triangle_kernel(x: np.ndarray) -> np.ndarray:
+    """Evaluates the linear interpolation (tent) kernel."""
+    return np.maximum(1 - np.abs(x), 0)
 
-    wa = (1 - dx) * (1 - dy)
-    wb = (1 - dx) * dy
-    wc = dx * (1 - dy)
-    wd = dx * dy
 
-    result = wa * Ia + wb * Ib + wc * Ic + wd * Id
+def _bilinear_taps(
+    src_len: int,
+    dst_len: int,
+    *,
+    antialias: bool = False,
+    frac_bits: int | None = None,
+) -> tuple[np.ndarray, np.ndarray] | tuple[np.ndarray, np.ndarray, int]:
+    """Builds the 2-tap linear interpolation table for one image axis.
 
-    print(f"Bilinear interpolation (channel {channel}) complete!")
+    Args:
+        src_len (int): Length of the source axis.
+        dst_len (int): Length of the output axis.
+        antialias (bool, optional): Widen the tent kernel when shrinking.
+            Defaults to False.
+        frac_bits (int | None, optional): If given, weights are returned as
+            int16 fixed-point values with this many fractional bits.
 
-    return np.clip(result, 0, 255).astype(np.uint8)
+    Returns:
+        tuple: Source indices and weights, both of shape (dst_len, 2) or wider
+        for an antialiased downscale, plus the fractional bits for
+        fixed-point weights.
+    """
+    if antialias and is_downscale(src_len, dst_len):
+        indices, weights = antialias_taps(src_len, dst_len, triangle_kernel, 1)
+    else:
+        coords = np.linspace(0, src_len - 1, dst_len)
+        x0 = np.floor(coords).astype(np.intp)
+        x1 = np.clip(x0 + 1, 0, src_len - 1)
+        dx = coords - x0
+        indices, weights = np.stack([x0, x1], axis=1), np.stack([1 - dx, dx], axis=1)
+
+    if frac_bits is None:
+        return indices, weights
+    return indices, quantize_weights(weights, frac_bits), frac_bits
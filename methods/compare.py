@@ -0,0 +1,188 @@
+"""Image comparison metrics and quality-versus-time reports.
+
+Differences are accumulated over blocks of rows, so comparing large images
+needs only block-sized float temporaries, and all pairs of a set of images are
+compared in a single pass over the rows.
+"""
+
+import csv
+import itertools
+import json
+import math
+import statistics
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+
+# Rows per block; blocks of a few MB keep the temporaries in cache
+BLOCK_ROWS = 256
+
+# Nominal ranges tried, in order, as the PSNR peak of float images
+FLOAT_PEAKS = (1.0, 255.0, 65535.0)
+
+
+class PairMetrics(NamedTuple):
+    """Differences between two images.
+
+    Attributes:
+        mae (float): Mean absolute difference.
+        rmse (float): Root mean squared difference.
+        psnr (float): Peak signal-to-noise ratio in dB; infinite for equal images.
+        max_abs (float): Largest absolute difference.
+    """
+
+    mae: float
+    rmse: float
+    psnr: float
+    max_abs: float
+
+
+@dataclass
+class MethodReport:
+    """Speed and quality of one method on one image.
+
+    The quality is measured on a round trip: the image is resized to the
+    target size and back, and the result is compared with the original.
+
+    Attributes:
+        method (str): Method name.
+        seconds (float): Median time of the resize to the target size.
+        mae (float): Mean absolute round-trip error.
+        rmse (float): Root mean squared round-trip error.
+        psnr (float): Round-trip PSNR in dB.
+        max_abs (float): Largest absolute round-trip error.
+    """
+
+    method: str
+    seconds: float
+    mae: float
+    rmse: float
+    psnr: float
+    max_abs: float
+
+
+def compare_all(
+    images: Mapping[str, np.ndarray],
+    *,
+    peak: float | None = None,
+    block_rows: int = BLOCK_ROWS,
+) -> dict[tuple[str, str], PairMetrics]:
+    """Compares every pair of same-shape images in one blocked pass.
+
+    Args:
+        images (Mapping[str, np.ndarray]): Images by name.
+        peak (float | None, optional): Peak value for the PSNR. Defaults to the
+            maximum of the integer dtype of the first image. For floats, it
+            defaults to the first of ``FLOAT_PEAKS`` that bounds the absolute
+            values of all images, or to their largest absolute value.
+        block_rows (int, optional): Rows compared at a time. Defaults to ``BLOCK_ROWS``.
+
+    Returns:
+        dict[tuple[str, str], PairMetrics]: Metrics for each pair of names, in
+        the order of ``itertools.combinations``.
+
+    Raises:
+        ValueError: If the images differ in shape.
+    """
+    names = list(images)
+    arrays = [np.asarray(images[name]) for name in names]
+    if any(array.shape != arrays[0].shape for array in arrays):
+        msg = "All compared images must have the same shape"
+        raise ValueError(msg)
+    if not arrays:
+        return {}
+    if peak is None and np.issubdtype(arrays[0].dtype, np.integer):
+        peak = float(np.iinfo(arrays[0].dtype).max)
+
+    pairs = list(itertools.combinations(range(len(arrays)), 2))
+    abs_sum = dict.fromkeys(pairs, 0.0)
+    sq_sum = dict.fromkeys(pairs, 0.0)
+    max_abs = dict.fromkeys(pairs, 0.0)
+    largest = 0.0
+    scratch = np.empty((min(block_rows, len(arrays[0])), *arrays[0].shape[1:]))
+    for start in range(0, len(arrays[0]), block_rows):
+        blocks = [array[start : start + block_rows].astype(np.float64) for array in arrays]
+        diff = scratch[: len(blocks[0])]
+        if peak is None:
+            largest = max([largest, *(float(np.abs(block).max(initial=0)) for block in blocks)])
+        for i, j in pairs:
+            np.subtract(blocks[i], blocks[j], out=diff)
+            np.abs(diff, out=diff)
+            abs_sum[i, j] += float(diff.sum())
+            max_abs[i, j] = max(max_abs[i, j], float(diff.max(initial=0)))
+            sq_sum[i, j] += float(np.vdot(diff, diff))
+
+    if peak is None:
+        peak = next((nominal for nominal in FLOAT_PEAKS if largest <= nominal), largest)
+    size = max(arrays[0].size, 1)
+    metrics = {}
+    for i, j in pairs:
+        mse = sq_sum[i, j] / size
+        psnr = math.inf if mse == 0 else 10 * math.log10(peak**2 / mse)
+        metrics[names[i], names[j]] = PairMetrics(abs_sum[i, j] / size, math.sqrt(mse), psnr, max_abs[i, j])
+    return metrics
+
+
+def compare(a: np.ndarray, b: np.ndarray, *, peak: float | None = None, block_rows: int = BLOCK_ROWS) -> PairMetrics:
+    """Compares two same-shape images; see :func:`compare_all`."""
+    return compare_all({"a": a, "b": b}, peak=peak, block_rows=block_rows)["a", "b"]
+
+
+def quality_report(
+    image: np.ndarray,
+    new_height: int,
+    new_width: int,
+    methods: Mapping[str, Callable[..., np.ndarray]],
+    *,
+    repeat: int = 3,
+) -> list[MethodReport]:
+    """Measures the speed and round-trip quality of each method.
+
+    Args:
+        image (np.ndarray): Input image.
+        new_height (int): Target height.
+        new_width (int): Target width.
+        methods (Mapping[str, Callable[..., np.ndarray]]): Methods by name,
+            called as ``method(image, new_height, new_width)``.
+        repeat (int, optional): Timed runs per method; the median is reported.
+            Defaults to 3.
+
+    Returns:
+        list[MethodReport]: One entry per method, in the given order.
+    """
+    image = np.asarray(image)
+    reports = []
+    for name, method in methods.items():
+        timings = []
+        for _ in range(max(repeat, 1)):
+            start = time.perf_counter()
+            resized = method(image, new_height, new_width)
+            timings.append(time.perf_counter() - start)
+        restored = method(resized, *image.shape[:2])
+        metrics = compare(image, restored)
+        reports.append(MethodReport(name, statistics.median(timings), *metrics))
+    return reports
+
+
+def write_report(reports: list[MethodReport], path: str | Path) -> None:
+    """Writes method reports as JSON if the path ends with .json, else as CSV.
+
+    Args:
+        reports (list[MethodReport]): Reports to write.
+        path (str | Path): Output file.
+    """
+    path = Path(path)
+    rows = [asdict(report) for report in reports]
+    if path.suffix.lower() == ".json":
+        # Infinite PSNR is not valid JSON
+        rows = [{key: None if value == math.inf else value for key, value in row.items()} for row in rows]
+        path.write_text(json.dumps(rows, indent=2) + "\n")
+        return
+    with path.open("w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(MethodReport.__dataclass_fields__))
+        writer.writeheader()
+        writer.writerows(rows)
@@ -0,0 +1,229 @@
+"""Content-addressed on-disk cache of resize results and resampling plans.
+
+Entries are keyed by a SHA-256 hash of the input pixels (with their dtype and
+shape) and of every parameter that affects the result, so a repeated resize of
+the same content is answered by reading one file. Execution options such as
+``workers`` or ``tile_shape`` do not change the result and are not part of the
+key.
+
+Files are written to a temporary name and moved into place with
+:func:`os.replace`, so concurrent processes sharing a directory never see
+partial entries. Once the directory grows beyond ``max_bytes``, the least
+recently used entries (by modification time, refreshed on every hit) are
+removed.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+
+from methods.plan import AxisTaps, ResamplingPlan
+
+# Bumped whenever the stored layout or the meaning of a key changes
+FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 1 << 30
+
+# Keyword arguments of the methods that do not affect the result
+EXECUTION_OPTIONS = frozenset(
+    {"tile_shape", "max_memory", "workers", "hooks", "out", "workspace", "backend", "max_workers"},
+)
+
+# Temporary files older than this are left over from crashed writers
+STALE_SECONDS = 3600
+
+_TMP_PREFIX = ".tmp-"
+_HASH_BLOCK = 16 * 2**20
+
+
+class DiskCache:
+    """Size-bounded LRU cache of arrays in a directory.
+
+    Example:
+        >>> cache = DiskCache("~/.cache/iitp-interpolations")
+        >>> resize = cache.wrap("lanczos", lanczos_interpolation)
+        >>> small = resize(image, 240, 320)  # doctest: +SKIP
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """Uses ``directory`` for the entries, creating it if needed.
+
+        Args:
+            directory (str | Path): Cache directory; may be shared by processes.
+            max_bytes (int, optional): Size the entries are trimmed to after
+                every write. Defaults to 1 GiB.
+        """
+        self.directory = Path(directory).expanduser()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    @property
+    def nbytes(self) -> int:
+        """int: Total size of the stored entries."""
+        return sum(size for _, _, size in self._entries())
+
+    def key(self, image: np.ndarray, **params: object) -> str:
+        """Returns the hash of an image's content and the parameters of its resize.
+
+        Args:
+            image (np.ndarray): Input image; memory maps are hashed block by block.
+            **params: Everything else that determines the result, e.g. the
+                method, target size and method parameters.
+
+        Returns:
+            str: Hexadecimal SHA-256 digest.
+        """
+        image = np.asarray(image)
+        header = {"version": FORMAT_VERSION, "dtype": image.dtype.str, "shape": image.shape, "params": params}
+        digest = hashlib.sha256(json.dumps(header, sort_keys=True, default=str).encode())
+        rows = max(_HASH_BLOCK // max(image[:1].nbytes, 1), 1)
+        for start in range(0, len(image), rows):
+            digest.update(np.ascontiguousarray(image[start : start + rows]).data)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> np.ndarray | None:
+        """Returns the array stored under ``key``, or None on a miss."""
+        path = self._path("outputs", key, ".npy")
+        try:
+            array = np.load(path, allow_pickle=False)
+        except (FileNotFoundError, ValueError, EOFError):
+            return None
+        _touch(path)
+        return array
+
+    def store(self, key: str, array: np.ndarray) -> None:
+        """Stores an array under ``key`` and trims the cache to ``max_bytes``."""
+        array = np.asarray(array)
+        if array.nbytes > self.max_bytes:
+            return
+        self._write(self._path("outputs", key, ".npy"), lambda file: np.save(file, array))
+        self.evict()
+
+    def load_plan(self, key: tuple) -> ResamplingPlan | None:
+        """Returns the plan stored for a :class:`~methods.plan.PlanCache` key, or None."""
+        path = self._path("plans", _plan_digest(key), ".npz")
+        try:
+            with np.load(path, allow_pickle=False) as tables:
+                plan = ResamplingPlan(*(_read_taps(tables, axis) for axis in ResamplingPlan._fields))
+        except (FileNotFoundError, ValueError, EOFError, KeyError):
+            return None
+        _touch(path)
+        return plan
+
+    def store_plan(self, key: tuple, plan: ResamplingPlan) -> None:
+        """Stores the tap tables of a plan under a :class:`~methods.plan.PlanCache` key."""
+        tables = {}
+        for axis, taps in zip(ResamplingPlan._fields, plan, strict=True):
+            tables[f"{axis}_indices"] = taps.indices
+            tables[f"{axis}_weights"] = taps.weights
+            tables[f"{axis}_frac_bits"] = np.array(taps.frac_bits)
+        path = self._path("plans", _plan_digest(key), ".npz")
+        self._write(path, lambda file: np.savez(file, allow_pickle=False, **tables))
+        self.evict()
+
+    def wrap(self, method: str, func: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+        """Returns ``func`` with its results cached.
+
+        Args:
+            method (str): Name of the method, part of the key.
+            func (Callable[..., np.ndarray]): Called as ``func(image, new_height,
+                new_width, **options)``, like the ``*_interpolation`` functions.
+
+        Returns:
+            Callable[..., np.ndarray]: Function of the same signature. On a hit
+            it skips ``func`` (and its hooks) and copies the result into
+            ``out`` if one is given.
+        """
+
+        def cached(image: np.ndarray, new_height: int, new_width: int, **options: object) -> np.ndarray:
+            params = {name: value for name, value in options.items() if name not in EXECUTION_OPTIONS}
+            key = self.key(image, method=method, height=new_height, width=new_width, **params)
+            result = self.load(key)
+            if result is None:
+                result = func(image, new_height, new_width, **options)
+                self.store(key, result)
+                return result
+            out = options.get("out")
+            if not isinstance(out, np.ndarray):
+                return result
+            out[...] = result
+            return out
+
+        return cached
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits ``max_bytes``.
+
+        Entries removed concurrently by another process are skipped.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        for path, _, size in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+            total -= size
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        for path, _, _ in self._entries():
+            with contextlib.suppress(FileNotFoundError):
+                path.unlink()
+
+    def _path(self, kind: str, digest: str, suffix: str) -> Path:
+        return self.directory / kind / digest[:2] / f"{digest}{suffix}"
+
+    def _entries(self) -> list[tuple[Path, float, int]]:
+        """Lists the entries with their modification times and sizes.
+
+        Temporary files of crashed writers are deleted on the way.
+        """
+        entries = []
+        now = time.time()
+        for path in self.directory.glob("*/*/*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if not path.name.startswith(_TMP_PREFIX):
+                entries.append((path, stat.st_mtime, stat.st_size))
+            elif now - stat.st_mtime > STALE_SECONDS:
+                with contextlib.suppress(FileNotFoundError):
+                    path.unlink()
+        return entries
+
+    def _write(self, path: Path, write: Callable[[BinaryIO], None]) -> None:
+        """Writes a file atomically: readers see either no file or the whole file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=_TMP_PREFIX, suffix=path.suffix)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                write(file)
+            Path(tmp).replace(path)
+        except BaseException:
+            with contextlib.suppress(FileNotFoundError):
+                Path(tmp).unlink()
+            raise
+
+
+def _plan_digest(key: tuple) -> str:
+    return hashlib.sha256(repr((FORMAT_VERSION, key)).encode()).hexdigest()
+
+
+def _read_taps(tables: np.lib.npyio.NpzFile, axis: str) -> AxisTaps:
+    return AxisTaps(tables[f"{axis}_indices"], tables[f"{axis}_weights"], int(tables[f"{axis}_frac_bits"]))
+
+
+def _touch(path: Path) -> None:
+    """Marks an entry as recently used."""
+    with contextlib.suppress(OSError):
+        os.utime(path)
@@ -0,0 +1,164 @@
+"""Progress and metrics hooks for the interpolation methods.
+
+All methods accept ``hooks=``, an instance of :class:`ResizeHooks`. Nothing is
+reported when it is omitted. Subclasses override the callbacks they need; the
+ready-made ones below drive a tqdm bar, write to a logger or accumulate totals
+that can be exported to a metrics system.
+
+With ``workers > 1`` the callbacks are invoked from several threads at once.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tqdm import tqdm
+
+STAGES = ("plan", "gather", "weight", "write")
+
+
+class ResizeHooks:
+    """Base class of resize callbacks; every callback does nothing by default."""
+
+    def on_stage(self, stage: str, seconds: float) -> None:
+        """Called after a stage of the computation has run.
+
+        Args:
+            stage (str): One of ``"plan"`` (building or fetching the taps),
+                ``"gather"`` (reading source pixels), ``"weight"`` (multiplying
+                and accumulating) and ``"write"`` (storing into the output).
+            seconds (float): Time spent in the stage since the last call.
+        """
+
+    def on_rows(self, completed: int, total: int) -> None:
+        """Called when output rows are finished.
+
+        Args:
+            completed (int): Number of rows finished since the last call.
+            total (int): Number of rows of the whole output.
+        """
+
+    def on_bytes(self, read: int, written: int) -> None:
+        """Called after each output tile with the bytes it touched.
+
+        Args:
+            read (int): Bytes of source pixels read for the tile.
+            written (int): Bytes written to the output.
+        """
+
+
+class MetricsRecorder(ResizeHooks):
+    """Accumulates stage timings, finished rows and processed bytes.
+
+    Attributes:
+        seconds (dict[str, float]): Total time per stage.
+        rows (int): Total finished output rows.
+        bytes_read (int): Total source bytes read.
+        bytes_written (int): Total output bytes written.
+    """
+
+    def __init__(self) -> None:
+        """Creates a recorder with all counters at zero."""
+        self._lock = threading.Lock()
+        self.seconds: dict[str, float] = defaultdict(float)
+        self.rows = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def on_stage(self, stage: str, seconds: float) -> None:
+        """Adds the time to the stage total."""
+        with self._lock:
+            self.seconds[stage] += seconds
+
+    def on_rows(self, completed: int, total: int) -> None:  # noqa: ARG002
+        """Adds the finished rows to the total."""
+        with self._lock:
+            self.rows += completed
+
+    def on_bytes(self, read: int, written: int) -> None:
+        """Adds the bytes to the totals."""
+        with self._lock:
+            self.bytes_read += read
+            self.bytes_written += written
+
+
+class LoggingHooks(MetricsRecorder):
+    """Logs the stage totals once per resize.
+
+    The attributes of :class:`MetricsRecorder` keep adding up over all
+    resizes; each log line reports only the resize that just finished.
+
+    Args:
+        logger (logging.Logger | None): Logger to write to. Defaults to the
+            ``methods`` logger.
+        level (int): Logging level. Defaults to ``logging.DEBUG``.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None, level: int = logging.DEBUG) -> None:
+        """Creates the hooks for the given logger."""
+        super().__init__()
+        self.logger = logger or logging.getLogger("methods")
+        self.level = level
+        # Rows, stage times and bytes read of the resize in progress
+        self._rows = 0
+        self._seconds_logged: dict[str, float] = {}
+        self._bytes_logged = 0
+
+    def on_rows(self, completed: int, total: int) -> None:
+        """Logs the totals of the resize once its last row is finished."""
+        super().on_rows(completed, total)
+        with self._lock:
+            self._rows += completed
+            if self._rows < total:
+                return
+            seconds = {stage: self.seconds[stage] - self._seconds_logged.get(stage, 0.0) for stage in STAGES}
+            bytes_read = self.bytes_read - self._bytes_logged
+            self._rows = 0
+            self._seconds_logged = dict(self.seconds)
+            self._bytes_logged = self.bytes_read
+        timings = ", ".join(f"{stage} {seconds[stage] * 1e3:.2f} ms" for stage in STAGES)
+        self.logger.log(self.level, "Resized %d rows (%s), %d bytes read", total, timings, bytes_read)
+
+
+class TqdmProgress(ResizeHooks):
+    """Shows a tqdm progress bar over the output rows.
+
+    tqdm is imported when the first rows are reported.
+
+    Args:
+        desc (str): Description shown in front of the bar.
+    """
+
+    def __init__(self, desc: str = "Interpolation") -> None:
+        """Creates the hooks; the bar itself is opened lazily."""
+        self.desc = desc
+        self._bar: tqdm | None = None
+        self._lock = threading.Lock()
+
+    def on_rows(self, completed: int, total: int) -> None:
+        """Advances the bar and closes it after the last row."""
+        with self._lock:
+            if self._bar is None:
+                from tqdm import tqdm  # noqa: PLC0415 - optional, only imported when a bar is shown
+
+                self._bar = tqdm(total=total, desc=self.desc, unit="line")
+            self._bar.update(completed)
+            if self._bar.n >= total:
+                self._bar.close()
+                self._bar = None
+
+
+@contextmanager
+def timed(hooks: ResizeHooks | None, stage: str) -> Iterator[None]:
+    """Reports the time spent in the ``with`` block as ``stage``, if hooks are set."""
+    if hooks is None:
+        yield
+        return
+    start = time.perf_counter()
+    yield
+    hooks.on_stage(stage, time.perf_counter() - start)
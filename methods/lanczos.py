@@ -1,7 +1,20 @@
-"""Lancsoz interpolation method."""
+"""Lanczos interpolation method."""
+
+import math
+from functools import lru_cache, partial
 
 import numpy as np
-from tqdm import tqdm
+import numpy.typing as npt
+
+from methods._separable import antialias_taps, is_downscale, quantize_weights, resample
+from methods.hooks import ResizeHooks, timed
+from methods.plan import ResamplingPlan, get_plan
+from methods.workspace import Workspace
+
+KERNELS = ("exact", "lut")
+
+# Fractional bits of the fixed-point weights of the tabulated kernel
+LUT_FRAC_BITS = 14
 
 
 def sinc(x: np.ndarray) -> np.ndarray:
@@ -30,19 +43,126 @@ def lanczos_kernel(x: np.ndarray, a: int) -> np.ndarray:
     return np.where(np.abs(x) < a, sinc(x) * sinc(x / a), 0.0)
 
 
-def lanczos_interpolation(
+@lru_cache(maxsize=16)
+def lanczos_lut(a: int, resolution: int = 1024) -> np.ndarray:
+    """Tabulates the Lanczos kernel at a fixed sub-pixel phase resolution.
+
+    Args:
+        a (int): Size of the Lanczos window.
+        resolution (int, optional): Samples per pixel. Defaults to 1024.
+
+    Returns:
+        np.ndarray: Read-only kernel values at distances ``0, 1/resolution, ..., a``.
+    """
+    table = lanczos_kernel(np.arange(a * resolution + 1) / resolution, a)
+    table.setflags(write=False)
+    return table
+
+
+def lanczos_kernel_lut(x: np.ndarray, a: int, resolution: int = 1024) -> np.ndarray:
+    """Looks up Lanczos weights in the table built by :func:`lanczos_lut`.
+
+    Distances are rounded to the nearest table phase, so no trigonometric
+    functions are evaluated.
+
+    Args:
+        x (np.ndarray): Distance(s) from the interpolation center.
+        a (int): Size of the Lanczos window.
+        resolution (int, optional): Samples per pixel. Defaults to 1024.
+
+    Returns:
+        np.ndarray: Weight values for each element in x.
+    """
+    table = lanczos_lut(a, resolution)
+    phase = np.rint(np.abs(x) * resolution).astype(np.intp)
+    return table[np.minimum(phase, len(table) - 1)]
+
+
+def lanczos_lut_max_error(a: int, resolution: int = 1024) -> float:
+    """Returns the largest deviation of the tabulated kernel from the exact one.
+
+    The error of rounding to the nearest phase is bounded by half a phase step
+    times the steepest slope of the kernel. For ``resolution=1024`` it is about
+    7e-4 for ``a`` from 2 to 4; halving the resolution doubles it.
+    The fixed-point weights add at most ``2 ** -15`` per tap.
+
+    Args:
+        a (int): Size of the Lanczos window.
+        resolution (int, optional): Samples per pixel. Defaults to 1024.
+
+    Returns:
+        float: Maximum absolute difference, sampled 16 times per table step.
+    """
+    x = np.linspace(0, a, 16 * a * resolution + 1)
+    return float(np.abs(lanczos_kernel_lut(x, a, resolution) - lanczos_kernel(x, a)).max())
+
+
+def lanczos_interpolation(  # noqa: PLR0913
     image: np.ndarray,
     new_height: int,
     new_width: int,
     a: int = 3,
+    *,
+    kernel: str = "exact",
+    lut_resolution: int = 1024,
+    antialias: bool = False,
+    tile_shape: tuple[int, int] | None = None,
+    max_memory: int | None = None,
+    workers: int = 1,
+    hooks: ResizeHooks | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    out: np.ndarray | None = None,
+    workspace: Workspace | None = None,
+    roi: tuple[int, int, int, int] | None = None,
 ) -> np.ndarray:
     """Performs Lanczos interpolation on a grayscale or RGB image.
 
+    The 2D kernel is the outer product of two 1D kernels, so the image is
+    resampled in two batched passes: first along rows, then along columns.
+
     Args:
-        image (np.ndarray): Input image (2D grayscale or 3D RGB).
+        image (np.ndarray): Input image (2D grayscale or 3D RGB). Memory
+            maps and other buffer-protocol objects are read without being
+            loaded, one tile's source window at a time.
         new_height (int): Target height of the output image.
         new_width (int): Target width of the output image.
         a (int, optional): Size of the Lanczos window. Defaults to 3.
+        kernel (str, optional): ``"exact"`` evaluates the kernel in floating
+            point. ``"lut"`` samples it from a table with ``lut_resolution``
+            phases per pixel and uses 14-bit fixed-point weights; integer
+            images are then resampled with integer arithmetic only. See
+            :func:`lanczos_lut_max_error` for the kernel error. 8-bit outputs
+            stay within 1 of the exact kernel; on 16-bit images the error is
+            about ``2 ** -10`` of full scale, up to about 70. Defaults to "exact".
+        lut_resolution (int, optional): Table phases per pixel for the "lut"
+            kernel. Defaults to 1024.
+        antialias (bool, optional): When shrinking, stretch the kernel to
+            ``a`` times the scale factor so that every source pixel is
+            averaged in instead of aliasing. Has no effect on enlarged axes.
+            Defaults to False.
+        tile_shape (tuple[int, int] | None, optional): Compute the output in
+            tiles of (rows, columns). Defaults to the whole output at once.
+        max_memory (int | None, optional): Cap in bytes on temporary buffers;
+            the tile shape is reduced until the tiles in flight fit. Defaults to None.
+        workers (int, optional): Number of threads computing output tiles in
+            parallel. Results do not depend on it. Defaults to 1.
+        hooks (ResizeHooks | None, optional): Callbacks receiving stage
+            timings, finished rows and processed bytes. Defaults to None.
+        dtype (npt.DTypeLike, optional): Floating-point accumulator type.
+            float32 halves the temporary memory. Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float images in their own
+            dtype, without clipping, instead of uint8. uint8 and 16-bit
+            integer images always keep their dtype. Defaults to False.
+        out (np.ndarray | None, optional): Array to write the result into,
+            of the output shape. Defaults to a new array.
+        workspace (Workspace | None, optional): Scratch buffers reused
+            between calls; with ``out`` repeated same-size resizes allocate
+            no large arrays. Defaults to None.
+        roi (tuple[int, int, int, int] | None, optional): Compute only the
+            output window (top, left, height, width), reading only the source
+            pixels in its support. The result equals the same crop of the full
+            output bit for bit. Defaults to None (the whole output).
 
     Returns:
         np.ndarray: Interpolated image.
@@ -50,68 +170,122 @@ def lanczos_interpolation(
     Raises:
         ValueError: If the input image has unsupported dimensions or invalid size.
     """
-    if image.size == 0 or new_height <= 0 or new_width <= 0:
-        msg = "Invalid image or output dimensions"
-        raise ValueError(msg)
-
-    if image.ndim == 2:
-        return _lanczos_gray(image, new_height, new_width, a)
-    if image.ndim == 3:
-        return np.stack(
-            [_lanczos_gray(image[..., c], new_height, new_width, a, channel=c) for c in range(image.shape[2])],
-            axis=-1,
+    image = np.asarray(image)
+    with timed(hooks, "plan"):
+        plan = lanczos_plan(
+            image.shape,
+            new_height,
+            new_width,
+            a,
+            kernel=kernel,
+            lut_resolution=lut_resolution,
+            antialias=antialias,
         )
-    msg = "Unsupported image dimensions"
-    raise ValueError(msg)
+    return resample(
+        image,
+        plan,
+        out,
+        tile_shape=tile_shape,
+        max_memory=max_memory,
+        workers=workers,
+        hooks=hooks,
+        dtype=dtype,
+        preserve_dtype=preserve_dtype,
+        workspace=workspace,
+        roi=roi,
+    )
 
 
-def _lanczos_gray(
-    image: np.ndarray,
-    new_h: int,
-    new_w: int,
-    a: int,
-    channel: int | None = None,
-) -> np.ndarray:
-    """Performs Lanczos interpolation on a single grayscale image channel.
+def lanczos_plan(  # noqa: PLR0913
+    shape: tuple[int, ...],
+    new_height: int,
+    new_width: int,
+    a: int = 3,
+    *,
+    kernel: str = "exact",
+    lut_resolution: int = 1024,
+    antialias: bool = False,
+) -> ResamplingPlan:
+    """Returns the cached Lanczos resampling plan for an image shape.
 
     Args:
-        image (np.ndarray): 2D array representing the grayscale image.
-        new_h (int): Desired height of the output image.
-        new_w (int): Desired width of the output image.
-        a (int): Lanczos kernel window size (radius).
-        channel (int | None, optional): Channel index for logging. Defaults to None.
+        shape (tuple[int, ...]): Shape of the input image, (H, W) or (H, W, C).
+        new_height (int): Target height of the output image.
+        new_width (int): Target width of the output image.
+        a (int, optional): Size of the Lanczos window. Defaults to 3.
+        kernel (str, optional): ``"exact"`` or ``"lut"``, see
+            :func:`lanczos_interpolation`. Defaults to "exact".
+        lut_resolution (int, optional): Table phases per pixel for the "lut"
+            kernel. Defaults to 1024.
+        antialias (bool, optional): Stretch the kernel when shrinking. Defaults to False.
 
     Returns:
-        np.ndarray: Interpolated 2D image of shape (new_h, new_w).
+        ResamplingPlan: Tap tables for both axes.
+
+    Raises:
+        ValueError: If the shape has unsupported dimensions or invalid size,
+            or if the kernel is unknown.
     """
-    h, w = image.shape
-    _ = h / new_h
-    _ = w / new_w
+    if math.prod(shape) == 0 or new_height <= 0 or new_width <= 0:
+        msg = "Invalid image or output dimensions"
+        raise ValueError(msg)
+
+    if len(shape) not in (2, 3):
+        msg = "Unsupported image dimensions"
+        raise ValueError(msg)
+
+    if kernel not in KERNELS:
+        msg = f"Unknown Lanczos kernel {kernel!r}, expected one of {KERNELS}"
+        raise ValueError(msg)
 
-    out = np.zeros((new_h, new_w), dtype=np.float32)
+    params = {"a": a, "antialias": antialias}
+    if kernel == "lut":
+        params["lut_resolution"] = lut_resolution
+    return get_plan("lanczos", (shape[0], shape[1]), (new_height, new_width), _lanczos_taps, **params)
 
-    x_coords = np.linspace(0, h - 1, new_h)
-    y_coords = np.linspace(0, w - 1, new_w)
 
-    bar_desc = f"Lanczos Interpolation{' (channel ' + str(channel) + ')' if channel is not None else ''}"
+def _lanczos_taps(
+    src_len: int,
+    dst_len: int,
+    a: int,
+    lut_resolution: int | None = None,
+    *,
+    antialias: bool = False,
+) -> tuple[np.ndarray, np.ndarray] | tuple[np.ndarray, np.ndarray, int]:
+    """Builds the 1D Lanczos tap table for one image axis.
 
-    for i, x in enumerate(tqdm(x_coords, desc=bar_desc, unit="line")):
-        x_int = int(np.floor(x))
-        x_range = np.arange(x_int - a + 1, x_int + a)
-        x_range = np.clip(x_range, 0, h - 1)
-        wx = lanczos_kernel(x - x_range[:, None], a)
+    Args:
+        src_len (int): Length of the source axis.
+        dst_len (int): Length of the output axis.
+        a (int): Lanczos kernel window size (radius).
+        lut_resolution (int | None, optional): If given, weights are looked up
+            in a table with this many phases per pixel and returned as int16
+            fixed-point values with ``LUT_FRAC_BITS`` fractional bits.
+        antialias (bool, optional): Stretch the kernel when shrinking.
+            Defaults to False.
+
+    Returns:
+        tuple: Source indices and normalized weights, both of shape
+        (dst_len, 2 * a - 1) or wider for an antialiased downscale, plus the
+        fractional bits for fixed-point weights.
+    """
+    if lut_resolution is None:
+        kernel = partial(lanczos_kernel, a=a)
+    else:
+        kernel = partial(lanczos_kernel_lut, a=a, resolution=lut_resolution)
 
-        for j, y in enumerate(y_coords):
-            y_int = int(np.floor(y))
-            y_range = np.arange(y_int - a + 1, y_int + a)
-            y_range = np.clip(y_range, 0, w - 1)
-            wy = lanczos_kernel(y - y_range, a)[None, :]
+    if antialias and is_downscale(src_len, dst_len):
+        indices, weights = antialias_taps(src_len, dst_len, kernel, a)
+    else:
+        coords = np.linspace(0, src_len - 1, dst_len)
+        base = np.floor(coords).astype(np.intp)
 
-            patch = image[np.ix_(x_range, y_range)]
-            weights = wx[: len(x_range)] * wy[:, : len(y_range)]
+        indices = np.clip(base[:, None] + np.arange(-a + 1, a), 0, src_len - 1)
+        weights = kernel(coords[:, None] - indices)
+        norm = weights.sum(axis=1, keepdims=True)
+        weights = np.divide(weights, norm, out=np.zeros_like(weights), where=norm != 0)
 
-            norm = np.sum(weights)
-            value = np.sum(patch * weights)
-            out[i, j] = value / norm if norm != 0 else 0.0
+    if lut_resolution is None:
+        return indices, weights
 
-    return np.clip(out, 0, 255).astype(np.uint8)
+    return indices, quantize_weights(weights, LUT_FRAC_BITS), LUT_FRAC_BITS
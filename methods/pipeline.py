@@ -0,0 +1,220 @@
+"""Batch resizing pipeline.
+
+Images are decoded, resized and encoded by three groups of threads connected
+with bounded queues, so reading the next file, resizing the current one and
+writing the previous one overlap while memory stays bounded by the queue sizes.
+"""
+
+import glob
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+IMAGE_SUFFIXES = (".bmp", ".jpeg", ".jpg", ".png", ".tif", ".tiff", ".webp")
+
+_DONE = object()
+
+
+@dataclass
+class BatchStats:
+    """Summary of a batch run.
+
+    Attributes:
+        processed (int): Number of images resized and written.
+        skipped (int): Number of inputs whose output already existed.
+        failed (list[tuple[Path, str]]): Inputs that raised, with the error message.
+        bytes_in (int): Total size of the processed input files.
+        bytes_out (int): Total size of the written output files.
+        seconds (float): Wall time of the run.
+    """
+
+    processed: int = 0
+    skipped: int = 0
+    failed: list[tuple[Path, str]] = field(default_factory=list)
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+
+    @property
+    def images_per_second(self) -> float:
+        """float: Processed images per second of wall time."""
+        return self.processed / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        """float: Processed input megabytes per second of wall time."""
+        return self.bytes_in / 2**20 / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def mb_out_per_second(self) -> float:
+        """float: Written output megabytes per second of wall time."""
+        return self.bytes_out / 2**20 / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        """Returns a one-line human-readable summary of the run."""
+        return (
+            f"Processed {self.processed} images ({self.skipped} skipped, {len(self.failed)} failed) "
+            f"in {self.seconds:.2f} s: {self.images_per_second:.2f} images/s, "
+            f"{self.mb_per_second:.2f} MB/s read, {self.mb_out_per_second:.2f} MB/s written"
+        )
+
+
+def collect_inputs(specs: Iterable[str]) -> list[Path]:
+    """Expands directories, glob patterns and file paths into image paths.
+
+    Args:
+        specs (Iterable[str]): Directories (searched non-recursively for image
+            files), glob patterns or plain file paths.
+
+    Returns:
+        list[Path]: Image paths in input order, without duplicates.
+    """
+    paths: dict[Path, None] = {}
+    for spec in specs:
+        path = Path(spec)
+        if path.is_dir():
+            matches = sorted(p for p in path.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        elif glob.has_magic(spec):
+            matches = [Path(p) for p in sorted(glob.glob(spec))]  # noqa: PTH207 - patterns may be absolute
+        else:
+            matches = [path]
+        paths.update(dict.fromkeys(matches))
+    return list(paths)
+
+
+def run_batch(  # noqa: PLR0913
+    paths: Iterable[Path],
+    out_dir: Path,
+    resize: Callable[[np.ndarray], np.ndarray],
+    *,
+    workers: int = 1,
+    io_workers: int = 2,
+    queue_size: int = 4,
+    suffix: str | None = None,
+) -> BatchStats:
+    """Resizes a set of images into a directory with an overlapped pipeline.
+
+    Inputs whose output file already exists are skipped, so an interrupted run
+    can be resumed. Outputs are written under a temporary name and renamed
+    into place, so a partially written file is never mistaken for a finished one.
+    Outputs are named after the input stem; an input whose output name is
+    already taken by an earlier input of the batch fails instead of
+    overwriting it.
+
+    Args:
+        paths (Iterable[Path]): Input image paths.
+        out_dir (Path): Output directory, created if missing.
+        resize (Callable[[np.ndarray], np.ndarray]): Function resizing one image.
+        workers (int, optional): Number of resize threads. Defaults to 1.
+        io_workers (int, optional): Number of decode and of encode threads. Defaults to 2.
+        queue_size (int, optional): Capacity of each queue between stages. Defaults to 4.
+        suffix (str | None, optional): Output file suffix, e.g. ``".png"``.
+            Defaults to the suffix of each input.
+
+    Returns:
+        BatchStats: Counters and timings of the run.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stats = BatchStats()
+    lock = threading.Lock()
+
+    def fail(path: Path, error: Exception) -> None:
+        with lock:
+            stats.failed.append((path, str(error)))
+
+    def decode(item: tuple[Path, Path]) -> tuple | None:
+        path, target = item
+        if target.exists():
+            with lock:
+                stats.skipped += 1
+            return None
+        with Image.open(path) as image:
+            return path, target, np.asarray(image), path.stat().st_size
+
+    def transform(item: tuple) -> tuple:
+        path, target, image, size = item
+        return path, target, resize(image), size
+
+    def encode(item: tuple) -> None:
+        _, target, image, size = item
+        partial = target.with_name(f".{target.name}.part")
+        try:
+            Image.fromarray(image).save(partial, format=Image.registered_extensions()[target.suffix.lower()])
+            partial.replace(target)
+        except BaseException:
+            partial.unlink(missing_ok=True)
+            raise
+        with lock:
+            stats.processed += 1
+            stats.bytes_in += size
+            stats.bytes_out += target.stat().st_size
+
+    start = time.perf_counter()
+    sources: queue.Queue = queue.Queue()
+    decoded: queue.Queue = queue.Queue(maxsize=queue_size)
+    resized: queue.Queue = queue.Queue(maxsize=queue_size)
+    threads = [
+        *_start_stage(decode, sources, decoded, io_workers, fail),
+        *_start_stage(transform, decoded, resized, workers, fail),
+        *_start_stage(encode, resized, None, io_workers, fail),
+    ]
+    claimed: dict[Path, Path] = {}
+    for path in map(Path, paths):
+        target = out_dir / (path.stem + (suffix or path.suffix))
+        if target in claimed:
+            fail(path, ValueError(f"Output {target.name} is already written for {claimed[target]}"))
+            continue
+        claimed[target] = path
+        sources.put((path, target))
+    sources.put(_DONE)
+    for thread in threads:
+        thread.join()
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def _start_stage(
+    func: Callable[[Any], Any],
+    inbox: queue.Queue,
+    outbox: queue.Queue | None,
+    n_threads: int,
+    fail: Callable[[Path, Exception], None],
+) -> list[threading.Thread]:
+    """Starts ``n_threads`` threads applying ``func`` to items from ``inbox``.
+
+    Results other than None are forwarded to ``outbox``. The end-of-stream
+    marker is passed back to ``inbox`` for sibling threads, and the last
+    thread of the stage forwards it to ``outbox``.
+    """
+    n_threads = max(n_threads, 1)
+    remaining = [n_threads]
+    lock = threading.Lock()
+
+    def work() -> None:
+        while (item := inbox.get()) is not _DONE:
+            try:
+                result = func(item)
+            except Exception as error:  # noqa: BLE001 - one bad input must not stop the batch
+                fail(item if isinstance(item, Path) else item[0], error)
+                continue
+            if result is not None and outbox is not None:
+                outbox.put(result)
+        inbox.put(_DONE)
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last and outbox is not None:
+            outbox.put(_DONE)
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    return threads
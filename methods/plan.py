@@ -0,0 +1,225 @@
+"""Resampling plans and their LRU cache.
+
+A resampling plan holds the precomputed tap indices and weights for both axes
+of one resize geometry. Building it is the setup cost of every method
+(coordinate grids, floor/clip index math and kernel evaluations), so plans are
+kept in a process-wide LRU cache and reused for repeated same-size resizes.
+Optionally, a :class:`PlanStore` such as :class:`methods.diskcache.DiskCache`
+keeps them across processes as well.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import NamedTuple, Protocol
+
+import numpy as np
+
+TapsBuilder = Callable[..., tuple[np.ndarray, np.ndarray] | tuple[np.ndarray, np.ndarray, int]]
+
+
+class AxisTaps(NamedTuple):
+    """Tap table for one image axis.
+
+    Attributes:
+        indices (np.ndarray): Source indices of shape (n, taps).
+        weights (np.ndarray): Tap weights of shape (n, taps).
+        frac_bits (int): Number of fractional bits of fixed-point integer
+            weights, or 0 for float weights.
+    """
+
+    indices: np.ndarray
+    weights: np.ndarray
+    frac_bits: int = 0
+
+    @property
+    def nbytes(self) -> int:
+        """int: Memory used by the index and weight arrays."""
+        return self.indices.nbytes + self.weights.nbytes
+
+
+class ResamplingPlan(NamedTuple):
+    """Precomputed taps for resizing along both image axes.
+
+    Attributes:
+        rows (AxisTaps): Taps along axis 0.
+        cols (AxisTaps): Taps along axis 1.
+    """
+
+    rows: AxisTaps
+    cols: AxisTaps
+
+    @property
+    def nbytes(self) -> int:
+        """int: Memory used by both tap tables."""
+        return self.rows.nbytes + self.cols.nbytes
+
+
+class PlanStore(Protocol):
+    """Persistent storage of plans behind a :class:`PlanCache`."""
+
+    def load_plan(self, key: tuple) -> ResamplingPlan | None:
+        """Returns the plan stored under ``key``, or None."""
+
+    def store_plan(self, key: tuple, plan: ResamplingPlan) -> None:
+        """Stores a plan under ``key``."""
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a :class:`PlanCache`."""
+
+    hits: int
+    misses: int
+    maxsize: int
+    max_bytes: int
+    currsize: int
+    nbytes: int
+
+
+class PlanCache:
+    """Thread-safe LRU cache of resampling plans.
+
+    Plans are evicted in least-recently-used order once either the number of
+    cached plans exceeds ``maxsize`` or their total size exceeds ``max_bytes``.
+    A plan larger than ``max_bytes`` on its own is returned but not cached.
+    Misses are looked up in the ``store``, if any, before the plan is built,
+    and built plans are saved to it.
+
+    Args:
+        maxsize (int): Maximum number of cached plans. 0 disables caching.
+        max_bytes (int): Maximum total memory of cached plans in bytes.
+        store (PlanStore | None): Persistent second-level storage.
+    """
+
+    def __init__(self, maxsize: int = 64, max_bytes: int = 64 * 2**20, store: PlanStore | None = None) -> None:
+        """Creates an empty cache with the given limits."""
+        self._plans: OrderedDict[tuple, ResamplingPlan] = OrderedDict()
+        self._lock = threading.Lock()
+        self._nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.store = store
+
+    def get(
+        self,
+        method: str,
+        src_shape: tuple[int, int],
+        dst_shape: tuple[int, int],
+        build_taps: TapsBuilder,
+        **params: object,
+    ) -> ResamplingPlan:
+        """Returns the plan for a geometry, building and caching it on a miss.
+
+        Args:
+            method (str): Name of the interpolation method.
+            src_shape (tuple[int, int]): Source (height, width).
+            dst_shape (tuple[int, int]): Output (height, width).
+            build_taps (TapsBuilder): Called as ``build_taps(src_len, dst_len, **params)``
+                for each axis; returns indices, weights and optionally the
+                fixed-point fractional bits of the weights.
+            **params: Method parameters that affect the taps, e.g. ``a`` for Lanczos.
+
+        Returns:
+            ResamplingPlan: Plan with read-only tap tables.
+        """
+        key = (method, tuple(src_shape), tuple(dst_shape), tuple(sorted(params.items())))
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        store = self.store
+        plan = store.load_plan(key) if store is not None else None
+        if plan is not None:
+            plan = ResamplingPlan(_freeze(plan.rows), _freeze(plan.cols))
+        else:
+            plan = ResamplingPlan(
+                _freeze(build_taps(src_shape[0], dst_shape[0], **params)),
+                _freeze(build_taps(src_shape[1], dst_shape[1], **params)),
+            )
+            if store is not None:
+                store.store_plan(key, plan)
+
+        with self._lock:
+            if key not in self._plans and self.maxsize > 0 and plan.nbytes <= self.max_bytes:
+                self._plans[key] = plan
+                self._nbytes += plan.nbytes
+                self._evict()
+        return plan
+
+    def configure(
+        self,
+        maxsize: int | None = None,
+        max_bytes: int | None = None,
+        store: PlanStore | None = None,
+    ) -> None:
+        """Changes the cache limits, evicting plans that no longer fit.
+
+        Args:
+            maxsize (int | None): New maximum number of plans, if given.
+            max_bytes (int | None): New byte budget, if given.
+            store (PlanStore | None): New persistent storage, if given.
+        """
+        with self._lock:
+            if store is not None:
+                self.store = store
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def info(self) -> CacheInfo:
+        """Returns hit/miss counters and current cache usage."""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, self.max_bytes, len(self._plans), self._nbytes)
+
+    def clear(self) -> None:
+        """Removes all plans and resets the counters."""
+        with self._lock:
+            self._plans.clear()
+            self._nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def _evict(self) -> None:
+        while self._plans and (len(self._plans) > self.maxsize or self._nbytes > self.max_bytes):
+            _, plan = self._plans.popitem(last=False)
+            self._nbytes -= plan.nbytes
+
+
+def _freeze(taps: tuple) -> AxisTaps:
+    taps = AxisTaps(*taps)
+    taps.indices.setflags(write=False)
+    taps.weights.setflags(write=False)
+    return taps
+
+
+plan_cache = PlanCache()
+
+
+def get_plan(
+    method: str,
+    src_shape: tuple[int, int],
+    dst_shape: tuple[int, int],
+    build_taps: TapsBuilder,
+    **params: object,
+) -> ResamplingPlan:
+    """Returns a plan from the default :data:`plan_cache`.
+
+    Args:
+        method (str): Name of the interpolation method.
+        src_shape (tuple[int, int]): Source (height, width).
+        dst_shape (tuple[int, int]): Output (height, width).
+        build_taps (TapsBuilder): Per-axis taps builder of the method.
+        **params: Method parameters that affect the taps.
+
+    Returns:
+        ResamplingPlan: Cached or freshly built plan.
+    """
+    return plan_cache.get(method, src_shape, dst_shape, build_taps, **params)
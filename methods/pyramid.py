@@ -0,0 +1,176 @@
+"""Several downscaled sizes of one image from a single decode.
+
+Each level is resized from the smallest already-computed level that is still
+at least ``min_ratio`` times larger than it, with antialiasing, instead of
+from the full-size source. For a ladder of halvings the total work is about
+one pass over the source. Levels whose parents are ready run concurrently.
+Intermediate levels are kept in floating point, so chaining adds no rounding
+bias.
+"""
+
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import numpy.typing as npt
+
+from methods._separable import output_dtype, resample, store
+from methods.registry import get_planner
+
+# Parent index of levels resized from the source image
+SOURCE = -1
+
+
+def pyramid_sizes(
+    shape: tuple[int, ...],
+    *,
+    scales: Sequence[float] = (),
+    widths: Sequence[int] = (),
+) -> list[tuple[int, int]]:
+    """Converts scale factors and fixed widths to (height, width) sizes.
+
+    Args:
+        shape (tuple[int, ...]): Shape of the source image.
+        scales (Sequence[float], optional): Factors applied to both axes. Defaults to ().
+        widths (Sequence[int], optional): Target widths; heights keep the
+            aspect ratio. Defaults to ().
+
+    Returns:
+        list[tuple[int, int]]: Sizes of the scales, then of the widths; each
+        side is at least 1.
+    """
+    height, width = shape[:2]
+    sizes = [(int(height * scale), int(width * scale)) for scale in scales]
+    sizes += [(round(height * new_width / width), new_width) for new_width in widths]
+    return [(max(h, 1), max(w, 1)) for h, w in sizes]
+
+
+def plan_pyramid(
+    shape: tuple[int, ...],
+    sizes: Sequence[tuple[int, int]],
+    *,
+    min_ratio: float = 2.0,
+) -> list[int]:
+    """Chooses the level each size is resized from.
+
+    Args:
+        shape (tuple[int, ...]): Shape of the source image.
+        sizes (Sequence[tuple[int, int]]): Target (height, width) sizes.
+        min_ratio (float, optional): How many times larger than the target,
+            on both axes, a level must be to serve as its parent. Defaults to 2.
+
+    Returns:
+        list[int]: Index into ``sizes`` of the parent of each size, or
+        :data:`SOURCE` for sizes resized from the source image.
+
+    Raises:
+        ValueError: If a size is not positive or ``min_ratio`` is below 1.
+    """
+    if min_ratio < 1:
+        msg = "min_ratio must be at least 1"
+        raise ValueError(msg)
+    if any(h <= 0 or w <= 0 for h, w in sizes):
+        msg = "Pyramid sizes must be positive"
+        raise ValueError(msg)
+
+    # Larger levels first, so every candidate parent is placed before its children.
+    # Upscaled levels hold no more detail than the source and are never parents.
+    order = sorted(range(len(sizes)), key=lambda index: sizes[index][0] * sizes[index][1], reverse=True)
+    parents = [SOURCE] * len(sizes)
+    for position, index in enumerate(order):
+        h, w = sizes[index]
+        candidates = [
+            other
+            for other in order[:position]
+            if min_ratio * h <= sizes[other][0] <= shape[0] and min_ratio * w <= sizes[other][1] <= shape[1]
+        ]
+        if candidates:
+            parents[index] = min(candidates, key=lambda other: sizes[other][0] * sizes[other][1])
+    return parents
+
+
+def build_pyramid(  # noqa: PLR0913
+    image: np.ndarray,
+    sizes: Sequence[tuple[int, int]],
+    method: str = "bilinear",
+    *,
+    min_ratio: float = 2.0,
+    workers: int = 1,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    **params: object,
+) -> list[np.ndarray]:
+    """Resizes an image to several sizes, deriving each from a larger level.
+
+    Args:
+        image (np.ndarray): Input image of shape (H, W) or (H, W, C).
+        sizes (Sequence[tuple[int, int]]): Target (height, width) sizes.
+        method (str, optional): One of :data:`methods.registry.registry`.
+            Defaults to "bilinear".
+        min_ratio (float, optional): Minimum size ratio between a level and
+            the level it is resized from; see :func:`plan_pyramid`. Defaults to 2.
+        workers (int, optional): Threads shared by the levels computed
+            concurrently. Defaults to 1.
+        dtype (npt.DTypeLike, optional): Floating-point type of the
+            accumulators and of the intermediate levels. Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float images in their own
+            dtype. Defaults to False.
+        **params: Method parameters, e.g. ``a``. ``antialias`` defaults to True.
+
+    Returns:
+        list[np.ndarray]: One image per size, in the given order.
+
+    Raises:
+        ValueError: If the method is unknown or any option is invalid.
+    """
+    image = np.asarray(image)
+    planner = get_planner(method)
+    if workers < 1:
+        msg = "workers must be positive"
+        raise ValueError(msg)
+    if np.dtype(dtype).kind != "f":
+        msg = f"dtype must be a floating-point type, got {np.dtype(dtype)}"
+        raise ValueError(msg)
+    params.setdefault("antialias", True)
+    parents = plan_pyramid(image.shape, sizes, min_ratio=min_ratio)
+
+    # Filled generation by generation, so a level's parent is always present
+    levels: dict[int, np.ndarray] = {}
+
+    def build(index: int, threads: int) -> None:
+        source = image if parents[index] == SOURCE else levels[parents[index]]
+        plan = planner(source.shape, *sizes[index], **params)
+        out = np.empty((*sizes[index], *image.shape[2:]), dtype=dtype)
+        levels[index] = resample(source, plan, out, workers=threads, dtype=dtype)
+
+    with ThreadPoolExecutor(workers) as pool:
+        for generation in _generations(parents):
+            threads = max(workers // len(generation), 1)
+            for future in [pool.submit(build, index, threads) for index in generation]:
+                future.result()
+
+    out_dtype = output_dtype(image.dtype, preserve_dtype=preserve_dtype)
+    results = []
+    for level in (levels[index] for index in range(len(sizes))):
+        if level.dtype == out_dtype:
+            results.append(level)
+            continue
+        result = np.empty(level.shape, dtype=out_dtype)
+        store(result, level)
+        results.append(result)
+    return results
+
+
+def _generations(parents: list[int]) -> list[list[int]]:
+    """Groups levels by their distance from the source, parents first."""
+    depths: dict[int, int] = {SOURCE: 0}
+
+    def depth(index: int) -> int:
+        if index not in depths:
+            depths[index] = depth(parents[index]) + 1
+        return depths[index]
+
+    generations: dict[int, list[int]] = {}
+    for index in range(len(parents)):
+        generations.setdefault(depth(index), []).append(index)
+    return [generations[key] for key in sorted(generations)]
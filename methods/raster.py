@@ -0,0 +1,76 @@
+"""Reading and writing rasters without loading them into memory.
+
+``.npy`` files and headerless raw files are memory-mapped, so the methods only
+touch the source rows each output tile needs, and results can be written
+straight into a memory-mapped output file. Other formats are decoded with
+Pillow.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+from numpy.lib.format import open_memmap
+from PIL import Image
+
+RAW_SUFFIXES = (".raw", ".bin")
+
+# Default cap on temporary memory when resizing memory-mapped rasters
+STREAM_MEMORY = 256 * 2**20
+
+
+def is_mapped(path: str | Path) -> bool:
+    """Returns True if ``path`` names a .npy or raw raster."""
+    return Path(path).suffix.lower() in (".npy", *RAW_SUFFIXES)
+
+
+def open_raster(
+    path: str | Path,
+    *,
+    raw_shape: tuple[int, ...] | None = None,
+    raw_dtype: npt.DTypeLike = np.uint8,
+) -> np.ndarray:
+    """Opens an image, memory-mapping .npy and raw files read-only.
+
+    Args:
+        path (str | Path): Image file.
+        raw_shape (tuple[int, ...] | None, optional): Shape of a headerless raw
+            file, (H, W) or (H, W, C). Given a shape, any file is read as raw.
+            Defaults to None.
+        raw_dtype (npt.DTypeLike, optional): Pixel type of a raw file.
+            Defaults to np.uint8.
+
+    Returns:
+        np.ndarray: The image; a memory map for .npy and raw files.
+
+    Raises:
+        ValueError: If a raw file is given without ``raw_shape``.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if raw_shape is not None:
+        return np.memmap(path, dtype=raw_dtype, mode="r", shape=tuple(raw_shape))
+    if suffix in RAW_SUFFIXES:
+        msg = f"The shape of raw file {path} must be given"
+        raise ValueError(msg)
+    if suffix == ".npy":
+        return np.load(path, mmap_mode="r")
+    with Image.open(path) as image:
+        return np.asarray(image)
+
+
+def create_raster(path: str | Path, shape: tuple[int, ...], dtype: npt.DTypeLike) -> np.ndarray:
+    """Creates a memory-mapped .npy or raw output file.
+
+    Args:
+        path (str | Path): Output file; raw unless the suffix is .npy.
+        shape (tuple[int, ...]): Shape of the image.
+        dtype (npt.DTypeLike): Pixel type.
+
+    Returns:
+        np.ndarray: Writable memory map of the file.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".npy":
+        return open_memmap(path, mode="w+", dtype=dtype, shape=tuple(shape))
+    return np.memmap(path, dtype=dtype, mode="w+", shape=tuple(shape))
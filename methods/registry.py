@@ -0,0 +1,451 @@
+"""Registry of interpolation methods and backend dispatch.
+
+Every method is described by a :class:`MethodSpec`: its public function, its
+separable plan builder, kernel support, accepted dtypes and channel counts and
+the execution backends it offers. :func:`resize` validates a request against
+the spec and runs it on the backend expected to be fastest:
+
+- ``"vectorized"``: the whole output in one pass.
+- ``"tiled"``: bands of output rows, whose temporaries stay in cache.
+- ``"parallel"``: row bands on one thread per CPU, or on fewer when the caller
+  passes a ``max_workers`` budget because it runs several resizes at once.
+
+The choice is based on the output size and on a micro-calibration that times
+each backend once per machine. Its result is kept in a JSON file under
+:data:`CACHE_DIR`.
+
+Third-party packages add methods through the ``iitp_interpolations.methods``
+entry point group. Each entry point names a :class:`MethodSpec`, or a callable
+returning one:
+
+.. code-block:: toml
+
+    [project.entry-points."iitp_interpolations.methods"]
+    mitchell = "my_package.mitchell:SPEC"
+"""
+
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+import warnings
+from collections.abc import Callable
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from pathlib import Path
+
+import numpy as np
+
+from methods.bilinear import bilinear_interpolation, bilinear_plan, triangle_kernel
+from methods.lanczos import lanczos_interpolation, lanczos_kernel, lanczos_plan
+from methods.plan import ResamplingPlan
+from methods.spline import catmull_rom_kernel, spline_interpolation, spline_plan
+
+ENTRY_POINT_GROUP = "iitp_interpolations.methods"
+
+BACKENDS = ("vectorized", "tiled", "parallel")
+
+CACHE_DIR = Path(os.environ.get("IITP_INTERPOLATIONS_CACHE", "~/.cache/iitp-interpolations")).expanduser()
+
+# Outputs smaller than this are always resized in one pass; calibrating would cost more than it saves
+SMALL_OUTPUT = 256 * 256
+
+# Output rows per band of the tiled and parallel backends
+TILE_ROWS = 64
+
+# Output sides timed by the calibration; the time per pixel is fitted linearly between them
+CALIBRATION_SIDES = (256, 768)
+
+# Bumped whenever the calibration procedure changes, invalidating stored results
+CALIBRATION_VERSION = 1
+
+
+@dataclass(frozen=True)
+class MethodSpec:
+    """Description of an interpolation method.
+
+    Attributes:
+        name (str): Name used on the command line and in :func:`resize`.
+        func (Callable[..., np.ndarray]): Called as ``func(image, new_height,
+            new_width, **params)``. It must accept ``tile_shape`` for the
+            tiled backend and ``workers`` for the parallel one.
+        planner (Callable[..., ResamplingPlan] | None): Builds the separable
+            plan, as ``planner(shape, new_height, new_width, **params)``;
+            None for non-separable methods, which then work only through
+            ``func``.
+        kernel (Callable[[np.ndarray], np.ndarray] | None): Kernel evaluated
+            on arrays of distances, if the method has one.
+        support (float): Kernel radius in source pixels at the default parameters.
+        dtypes (str): Accepted dtype kinds, e.g. "uif".
+        channels (tuple[int, ...] | None): Accepted channel counts, 1 for 2D
+            images; None accepts any.
+        backends (tuple[str, ...]): Backends of :data:`BACKENDS` the method supports.
+        description (str): One-line summary.
+    """
+
+    name: str
+    func: Callable[..., np.ndarray]
+    planner: Callable[..., ResamplingPlan] | None = None
+    kernel: Callable[[np.ndarray], np.ndarray] | None = None
+    support: float = 1.0
+    dtypes: str = "uif"
+    channels: tuple[int, ...] | None = None
+    backends: tuple[str, ...] = ("vectorized",)
+    description: str = ""
+
+    @property
+    def separable(self) -> bool:
+        """bool: Whether the method resamples rows and columns in separate passes."""
+        return self.planner is not None
+
+    def check(self, image: np.ndarray) -> None:
+        """Raises ValueError if the method does not accept ``image``."""
+        if image.dtype.kind not in self.dtypes:
+            msg = f"Method {self.name!r} does not support {image.dtype} images"
+            raise ValueError(msg)
+        channels = image.shape[2] if image.ndim == 3 else 1
+        if self.channels is not None and channels not in self.channels:
+            msg = f"Method {self.name!r} does not support images with {channels} channels"
+            raise ValueError(msg)
+
+
+class MethodRegistry:
+    """Thread-safe registry of methods and their backend calibrations.
+
+    Args:
+        calibration_path (Path | None): JSON file keeping the calibration per
+            machine; None keeps it in memory only.
+        plugins (bool): Load the methods of the entry point group on first lookup.
+    """
+
+    def __init__(self, calibration_path: Path | None = None, *, plugins: bool = True) -> None:
+        """Creates an empty registry."""
+        self.calibration_path = calibration_path
+        self._specs: dict[str, MethodSpec] = {}
+        self._calibration: dict[str, dict[str, tuple[float, float]]] | None = None
+        self._lock = threading.RLock()
+        self._plugins_loaded = not plugins
+
+    def register(self, spec: MethodSpec, *, replace: bool = False) -> None:
+        """Adds a method.
+
+        Raises:
+            ValueError: If the name is taken and ``replace`` is False, or the
+                spec lists an unknown backend.
+        """
+        unknown = set(spec.backends) - set(BACKENDS)
+        if unknown or not spec.backends:
+            msg = f"Method {spec.name!r} has invalid backends {spec.backends}, expected some of {BACKENDS}"
+            raise ValueError(msg)
+        with self._lock:
+            if spec.name in self._specs and not replace:
+                msg = f"Method {spec.name!r} is already registered"
+                raise ValueError(msg)
+            self._specs[spec.name] = spec
+
+    def get(self, name: str) -> MethodSpec:
+        """Returns the spec of a method.
+
+        Raises:
+            ValueError: If no method has that name.
+        """
+        self._load_plugins()
+        with self._lock:
+            spec = self._specs.get(name)
+            if spec is None:
+                msg = f"Unknown method {name!r}, expected one of {tuple(self._specs)}"
+                raise ValueError(msg)
+            return spec
+
+    def names(self) -> list[str]:
+        """Returns the names of all methods."""
+        self._load_plugins()
+        with self._lock:
+            return list(self._specs)
+
+    def planner(self, name: str) -> Callable[..., ResamplingPlan]:
+        """Returns the plan builder of a separable method.
+
+        Raises:
+            ValueError: If the method is unknown or not separable.
+        """
+        spec = self.get(name)
+        if spec.planner is None:
+            msg = f"Method {name!r} is not separable and has no resampling plan"
+            raise ValueError(msg)
+        return spec.planner
+
+    def choose_backend(self, name: str, new_height: int, new_width: int, *, max_workers: int | None = None) -> str:
+        """Returns the backend expected to resize fastest.
+
+        Small outputs, and methods with a single backend, use the first
+        listed backend. Otherwise each backend's time is predicted from the
+        calibration, running it on first use.
+
+        Args:
+            name (str): Method name.
+            new_height (int): Target height.
+            new_width (int): Target width.
+            max_workers (int | None, optional): Threads one resize may use;
+                with 1, the parallel backend is not considered. Defaults to
+                one per CPU.
+
+        Returns:
+            str: One of the method's backends.
+        """
+        spec = self.get(name)
+        budget = _thread_budget(max_workers)
+        candidates = [backend for backend in _candidates(spec) if backend != "parallel" or budget > 1]
+        pixels = new_height * new_width
+        if len(candidates) == 1 or pixels < SMALL_OUTPUT:
+            return candidates[0]
+        timings = self.calibration(name)
+        predicted = {
+            backend: timings[backend][0] + timings[backend][1] * pixels for backend in candidates if backend in timings
+        }
+        return min(predicted, key=predicted.__getitem__) if predicted else candidates[0]
+
+    def calibration(self, name: str) -> dict[str, tuple[float, float]]:
+        """Returns the fitted time model of each backend of a method.
+
+        The model of a backend is ``(seconds, seconds_per_output_pixel)``.
+        It is read from the calibration file or measured and saved there.
+        The measurement runs without holding the lock, so other methods stay
+        usable meanwhile; concurrent first calls may both measure, and the
+        first result is kept.
+        """
+        with self._lock:
+            if self._calibration is None:
+                self._calibration = self._read_calibration()
+            if name in self._calibration:
+                return self._calibration[name]
+        models = _calibrate(self.get(name))
+        with self._lock:
+            if name not in self._calibration:
+                self._calibration[name] = models
+                self._write_calibration()
+            return self._calibration[name]
+
+    def dispatcher(self, name: str) -> Callable[..., np.ndarray]:
+        """Returns ``resize`` bound to a method, with the signature of the ``*_interpolation`` functions."""
+        self.get(name)
+
+        def resize_with(
+            image: np.ndarray,
+            new_height: int,
+            new_width: int,
+            *,
+            backend: str = "auto",
+            max_workers: int | None = None,
+            **params: object,
+        ) -> np.ndarray:
+            return self.resize(image, new_height, new_width, name, backend=backend, max_workers=max_workers, **params)
+
+        return resize_with
+
+    def resize(  # noqa: PLR0913
+        self,
+        image: np.ndarray,
+        new_height: int,
+        new_width: int,
+        method: str = "bilinear",
+        *,
+        backend: str = "auto",
+        max_workers: int | None = None,
+        **params: object,
+    ) -> np.ndarray:
+        """Resizes an image with a method on the given or fastest backend.
+
+        Args:
+            image (np.ndarray): Input image of shape (H, W) or (H, W, C).
+            new_height (int): Target height.
+            new_width (int): Target width.
+            method (str, optional): Method name. Defaults to "bilinear".
+            backend (str, optional): One of the method's backends, or "auto"
+                to let :meth:`choose_backend` decide. Defaults to "auto".
+            max_workers (int | None, optional): Threads the parallel backend
+                may use, e.g. the CPUs left per job by a caller that runs
+                several resizes at once. Defaults to one per CPU.
+            **params: Passed to the method. Explicit ``tile_shape`` or
+                ``workers`` take precedence over the backend's.
+
+        Returns:
+            np.ndarray: The resized image; all backends give identical results.
+
+        Raises:
+            ValueError: If the method is unknown, does not accept the image,
+                does not offer the backend or ``max_workers`` is not positive.
+        """
+        spec = self.get(method)
+        image = np.asarray(image)
+        spec.check(image)
+        if max_workers is not None and max_workers < 1:
+            msg = "max_workers must be positive"
+            raise ValueError(msg)
+        if backend == "auto":
+            backend = self.choose_backend(method, new_height, new_width, max_workers=max_workers)
+        elif backend not in spec.backends:
+            msg = f"Method {method!r} has no backend {backend!r}, expected one of {spec.backends}"
+            raise ValueError(msg)
+        options = _backend_options(backend, new_width, max_workers)
+        return spec.func(image, new_height, new_width, **{**options, **params})
+
+    def _load_plugins(self) -> None:
+        """Registers the methods of the entry point group once; broken plugins are skipped with a warning."""
+        with self._lock:
+            if self._plugins_loaded:
+                return
+            self._plugins_loaded = True
+            for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+                try:
+                    spec = entry_point.load()
+                    if not isinstance(spec, MethodSpec):
+                        spec = spec()
+                    self.register(spec)
+                except Exception as error:  # noqa: BLE001
+                    warnings.warn(
+                        f"Could not load interpolation method {entry_point.name!r}: {error}",
+                        RuntimeWarning,
+                        stacklevel=2,
+                    )
+
+    def _read_calibration(self) -> dict:
+        if self.calibration_path is None:
+            return {}
+        try:
+            stored = json.loads(self.calibration_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        machine = stored.get(_machine_id(), {}) if isinstance(stored, dict) else {}
+        return {name: {backend: tuple(model) for backend, model in models.items()} for name, models in machine.items()}
+
+    def _write_calibration(self) -> None:
+        """Saves the calibration of this machine next to those of others, atomically."""
+        if self.calibration_path is None:
+            return
+        try:
+            stored = json.loads(self.calibration_path.read_text())
+        except (OSError, ValueError):
+            stored = {}
+        stored[_machine_id()] = self._calibration
+        try:
+            self.calibration_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.calibration_path.parent, prefix=".tmp-", suffix=".json")
+            with os.fdopen(fd, "w") as file:
+                json.dump(stored, file, indent=2)
+            Path(tmp).replace(self.calibration_path)
+        except OSError as error:
+            warnings.warn(f"Could not save the backend calibration: {error}", RuntimeWarning, stacklevel=3)
+
+
+def _backend_options(backend: str, new_width: int, max_workers: int | None = None) -> dict:
+    """Returns the keyword arguments selecting a backend."""
+    if backend == "tiled":
+        return {"tile_shape": (TILE_ROWS, new_width)}
+    if backend == "parallel":
+        return {"workers": _thread_budget(max_workers)}
+    return {}
+
+
+def _thread_budget(max_workers: int | None) -> int:
+    """Returns the threads one resize may use: one per CPU, capped by ``max_workers``."""
+    cpus = os.cpu_count() or 1
+    return cpus if max_workers is None else max(min(cpus, max_workers), 1)
+
+
+def _candidates(spec: MethodSpec) -> list[str]:
+    """Returns the backends worth choosing from on this machine."""
+    return [backend for backend in spec.backends if backend != "parallel" or (os.cpu_count() or 1) > 1]
+
+
+def _calibrate(spec: MethodSpec) -> dict[str, tuple[float, float]]:
+    """Times every backend of a method at two output sizes and fits a line through them."""
+    rng = np.random.default_rng(0)
+    samples: dict[str, list[tuple[int, float]]] = {backend: [] for backend in _candidates(spec)}
+    for side in CALIBRATION_SIDES:
+        image = rng.integers(0, 256, size=(side // 2, side // 2, 3), dtype=np.uint8)
+        for backend, timings in samples.items():
+            options = _backend_options(backend, side)
+            best = float("inf")
+            for _ in range(2):
+                start = time.perf_counter()
+                spec.func(image, side, side, **options)
+                best = min(best, time.perf_counter() - start)
+            timings.append((side * side, best))
+
+    models = {}
+    for backend, ((small, small_time), (large, large_time)) in samples.items():
+        slope = max((large_time - small_time) / (large - small), 0.0)
+        models[backend] = (max(small_time - slope * small, 0.0), slope)
+    return models
+
+
+def _machine_id() -> str:
+    """Identifies the machine and NumPy build a calibration was measured on."""
+    return f"{platform.node()}/{platform.machine()}/{os.cpu_count()} cpus/numpy {np.__version__}/v{CALIBRATION_VERSION}"
+
+
+registry = MethodRegistry(CACHE_DIR / "calibration.json")
+
+registry.register(
+    MethodSpec(
+        "bilinear",
+        bilinear_interpolation,
+        bilinear_plan,
+        triangle_kernel,
+        support=1.0,
+        dtypes="buif",
+        backends=BACKENDS,
+        description="Linear interpolation between the two nearest pixels of each axis.",
+    ),
+)
+registry.register(
+    MethodSpec(
+        "lanczos",
+        lanczos_interpolation,
+        lanczos_plan,
+        lambda x: lanczos_kernel(x, 3),
+        support=3.0,
+        dtypes="buif",
+        backends=BACKENDS,
+        description="Windowed sinc over a radius of ``a`` pixels (3 by default).",
+    ),
+)
+registry.register(
+    MethodSpec(
+        "spline",
+        spline_interpolation,
+        spline_plan,
+        catmull_rom_kernel,
+        support=2.0,
+        dtypes="buif",
+        backends=BACKENDS,
+        description="Catmull-Rom cubic spline through the four nearest pixels of each axis.",
+    ),
+)
+
+
+def get_method(name: str) -> MethodSpec:
+    """Returns the spec of a method of the default :data:`registry`."""
+    return registry.get(name)
+
+
+def get_planner(name: str) -> Callable[..., ResamplingPlan]:
+    """Returns the plan builder of a separable method of the default :data:`registry`."""
+    return registry.planner(name)
+
+
+def resize(  # noqa: PLR0913
+    image: np.ndarray,
+    new_height: int,
+    new_width: int,
+    method: str = "bilinear",
+    *,
+    backend: str = "auto",
+    max_workers: int | None = None,
+    **params: object,
+) -> np.ndarray:
+    """Resizes an image with a method of the default :data:`registry`; see :meth:`MethodRegistry.resize`."""
+    return registry.resize(image, new_height, new_width, method, backend=backend, max_workers=max_workers, **params)
@@ -0,0 +1,386 @@
+"""Resampling at arbitrary per-pixel source coordinates.
+
+:func:`remap` samples the image at a source position given for every output
+pixel, using the same kernels as the resize methods, so rotations, crops with
+scaling and lens-correction maps share their filters. :func:`warp_affine` and
+:func:`warp_perspective` compute the positions of each output tile on the fly
+instead of materializing full coordinate maps.
+
+Unlike resizing, the sampling is not separable into row and column passes:
+each output pixel gathers its own k x k neighborhood, one kernel tap at a time
+for all pixels of a tile. The taps along each axis are those of the resize
+tables: the same offsets from the floor of each position, and for the "clamp"
+border the same clipped indices and weights. Sampling on the grid of a resize
+therefore gives the resize result, up to rounding.
+"""
+
+import operator
+from collections.abc import Callable
+from functools import partial
+from typing import NamedTuple, TypedDict, Unpack
+
+import numpy as np
+import numpy.typing as npt
+
+from methods._separable import output_array, run_tiles, store
+from methods.bilinear import triangle_kernel
+from methods.lanczos import lanczos_kernel
+from methods.spline import catmull_rom_kernel
+
+BORDERS = ("clamp", "reflect", "constant")
+
+# Source coordinates of a tile of output rows [r0, r1) and columns [c0, c1)
+CoordinateFunc = Callable[[int, int, int, int], tuple[np.ndarray, np.ndarray]]
+
+
+class _Filter(NamedTuple):
+    """Per-axis taps of a method, as built by its resize tables."""
+
+    kernel: Callable[[np.ndarray], np.ndarray]
+    # Tap positions relative to the floor of the sampled position
+    offsets: np.ndarray
+    # Whether clamped taps are weighted at their clamped index, as lanczos_plan does
+    clamped_weights: bool
+
+
+class WarpOptions(TypedDict, total=False):
+    """Keyword options of :func:`remap` accepted by the warp functions."""
+
+    a: int
+    border: str
+    cval: float
+    tile_shape: tuple[int, int] | None
+    workers: int
+    dtype: npt.DTypeLike
+    preserve_dtype: bool
+    out: np.ndarray | None
+
+
+def remap(  # noqa: PLR0913
+    image: np.ndarray,
+    map_x: np.ndarray,
+    map_y: np.ndarray,
+    method: str = "bilinear",
+    *,
+    a: int = 3,
+    border: str = "clamp",
+    cval: float = 0.0,
+    tile_shape: tuple[int, int] | None = None,
+    workers: int = 1,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Samples an image at the source coordinates given for each output pixel.
+
+    Output pixel ``(i, j)`` is interpolated at column ``map_x[i, j]`` and row
+    ``map_y[i, j]`` of the source, in pixel units. Pixels with a non-finite
+    coordinate are set to ``cval`` whatever the border.
+
+    Args:
+        image (np.ndarray): Input image of shape (H, W) or (H, W, C).
+        map_x (np.ndarray): Source column of every output pixel, shape (h, w).
+        map_y (np.ndarray): Source row of every output pixel, shape (h, w).
+        method (str, optional): "bilinear", "spline" or "lanczos". Defaults to "bilinear".
+        a (int, optional): Lanczos window size. Defaults to 3.
+        border (str, optional): How taps outside the image are read: "clamp"
+            repeats the edge pixels, "reflect" mirrors the image about them
+            and "constant" reads ``cval``. Defaults to "clamp".
+        cval (float, optional): Value outside the image for the "constant"
+            border, and of pixels with non-finite coordinates. Defaults to 0.
+        tile_shape (tuple[int, int] | None, optional): Output tile (rows,
+            columns) computed at a time; the temporaries scale with it.
+            Defaults to the whole output.
+        workers (int, optional): Threads computing tiles concurrently. Defaults to 1.
+        dtype (npt.DTypeLike, optional): Floating-point accumulator type.
+            Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float images in their own
+            dtype. Defaults to False.
+        out (np.ndarray | None, optional): Array to write the result into.
+            Defaults to None.
+
+    Returns:
+        np.ndarray: The output of shape (h, w) or (h, w, C).
+
+    Raises:
+        ValueError: If the maps differ in shape or are not 2D, or any option
+            is invalid.
+    """
+    map_x, map_y = np.asarray(map_x), np.asarray(map_y)
+    if map_x.ndim != 2 or map_x.shape != map_y.shape:
+        msg = f"map_x and map_y must be 2D arrays of the same shape, got {map_x.shape} and {map_y.shape}"
+        raise ValueError(msg)
+
+    def coords(r0: int, r1: int, c0: int, c1: int) -> tuple[np.ndarray, np.ndarray]:
+        return map_x[r0:r1, c0:c1], map_y[r0:r1, c0:c1]
+
+    return _warp(
+        image,
+        map_x.shape,
+        coords,
+        method,
+        a=a,
+        border=border,
+        cval=cval,
+        tile_shape=tile_shape,
+        workers=workers,
+        dtype=dtype,
+        preserve_dtype=preserve_dtype,
+        out=out,
+    )
+
+
+def warp_affine(
+    image: np.ndarray,
+    matrix: npt.ArrayLike,
+    shape: tuple[int, int],
+    method: str = "bilinear",
+    **options: Unpack[WarpOptions],
+) -> np.ndarray:
+    """Applies an affine transform to an image.
+
+    Args:
+        image (np.ndarray): Input image of shape (H, W) or (H, W, C).
+        matrix (npt.ArrayLike): 2x3 matrix mapping source ``(x, y, 1)`` to
+            output ``(x, y)`` coordinates.
+        shape (tuple[int, int]): Output (height, width).
+        method (str, optional): "bilinear", "spline" or "lanczos". Defaults to "bilinear".
+        **options: Options of :func:`remap`, e.g. ``border`` or ``tile_shape``.
+
+    Returns:
+        np.ndarray: The transformed image.
+
+    Raises:
+        ValueError: If the matrix is not 2x3 or singular.
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.shape != (2, 3):
+        msg = f"An affine matrix must be 2x3, got {matrix.shape}"
+        raise ValueError(msg)
+    return warp_perspective(image, np.vstack([matrix, [0, 0, 1]]), shape, method, **options)
+
+
+def warp_perspective(
+    image: np.ndarray,
+    homography: npt.ArrayLike,
+    shape: tuple[int, int],
+    method: str = "bilinear",
+    **options: Unpack[WarpOptions],
+) -> np.ndarray:
+    """Applies a perspective transform (homography) to an image.
+
+    Output pixels whose source lies behind the projection center, where the
+    homogeneous coordinate is not positive, are treated as outside the image
+    and set to ``cval``.
+
+    Args:
+        image (np.ndarray): Input image of shape (H, W) or (H, W, C).
+        homography (npt.ArrayLike): 3x3 matrix mapping source ``(x, y, 1)`` to
+            homogeneous output coordinates.
+        shape (tuple[int, int]): Output (height, width).
+        method (str, optional): "bilinear", "spline" or "lanczos". Defaults to "bilinear".
+        **options: Options of :func:`remap`, e.g. ``border`` or ``tile_shape``.
+
+    Returns:
+        np.ndarray: The transformed image.
+
+    Raises:
+        ValueError: If the matrix is not 3x3 or singular.
+    """
+    homography = np.asarray(homography, dtype=np.float64)
+    if homography.shape != (3, 3):
+        msg = f"A homography must be 3x3, got {homography.shape}"
+        raise ValueError(msg)
+    try:
+        inverse = np.linalg.inv(homography)
+    except np.linalg.LinAlgError:
+        msg = "The transform matrix is singular"
+        raise ValueError(msg) from None
+
+    def coords(r0: int, r1: int, c0: int, c1: int) -> tuple[np.ndarray, np.ndarray]:
+        y, x = np.mgrid[r0:r1, c0:c1].astype(np.float64)
+        src_x = inverse[0, 0] * x + inverse[0, 1] * y + inverse[0, 2]
+        src_y = inverse[1, 0] * x + inverse[1, 1] * y + inverse[1, 2]
+        if inverse[2].tolist() != [0, 0, 1]:
+            scale = inverse[2, 0] * x + inverse[2, 1] * y + inverse[2, 2]
+            # Points with scale <= 0 have no source; NaN makes them read cval
+            behind = scale <= 0
+            np.divide(src_x, scale, out=src_x, where=~behind)
+            np.divide(src_y, scale, out=src_y, where=~behind)
+            src_x[behind] = np.nan
+            src_y[behind] = np.nan
+        return src_x, src_y
+
+    return _warp(image, (shape[0], shape[1]), coords, method, **options)
+
+
+def _warp(  # noqa: PLR0913
+    image: np.ndarray,
+    shape: tuple[int, int],
+    coords: CoordinateFunc,
+    method: str = "bilinear",
+    *,
+    a: int = 3,
+    border: str = "clamp",
+    cval: float = 0.0,
+    tile_shape: tuple[int, int] | None = None,
+    workers: int = 1,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Fills an output of ``shape`` tile by tile with samples at ``coords``."""
+    # Contiguous, so that the pixels can be gathered from a flat view without copies
+    image = np.ascontiguousarray(image)
+    if image.ndim not in (2, 3) or image.shape[0] == 0 or image.shape[1] == 0:
+        msg = "Unsupported image dimensions"
+        raise ValueError(msg)
+    taps = _filter(method, a)
+    if border not in BORDERS:
+        msg = f"Unknown border {border!r}, expected one of {BORDERS}"
+        raise ValueError(msg)
+    if workers < 1:
+        msg = "workers must be positive"
+        raise ValueError(msg)
+    if np.dtype(dtype).kind != "f":
+        msg = f"dtype must be a floating-point type, got {np.dtype(dtype)}"
+        raise ValueError(msg)
+
+    out = output_array(image, (*shape, *image.shape[2:]), out, preserve_dtype=preserve_dtype)
+
+    tile_h, tile_w = tile_shape if tile_shape is not None else shape
+    if tile_h <= 0 or tile_w <= 0:
+        msg = "Invalid tile shape"
+        raise ValueError(msg)
+    tiles = [(r0, c0) for r0 in range(0, shape[0], tile_h) for c0 in range(0, shape[1], tile_w)]
+
+    def run_tile(r0: int, c0: int) -> None:
+        r1, c1 = min(r0 + tile_h, shape[0]), min(c0 + tile_w, shape[1])
+        x, y = coords(r0, r1, c0, c1)
+        values = _sample(image, x, y, taps, border=border, cval=cval, dtype=np.dtype(dtype))
+        store(out[r0:r1, c0:c1], values)
+
+    if tiles:
+        run_tiles(run_tile, tiles, workers)
+    return out
+
+
+def _filter(method: str, a: int) -> _Filter:
+    """Returns the kernel and tap layout of ``method``, matching its resize tables."""
+    if method == "bilinear":
+        return _Filter(triangle_kernel, np.arange(0, 2), clamped_weights=False)
+    if method == "spline":
+        return _Filter(catmull_rom_kernel, np.arange(-1, 3), clamped_weights=False)
+    if method == "lanczos":
+        try:
+            a = operator.index(a)
+        except TypeError:
+            a = 0
+        if a <= 0:
+            msg = "The 'a' parameter must be a positive integer"
+            raise ValueError(msg)
+        return _Filter(partial(lanczos_kernel, a=a), np.arange(1 - a, a), clamped_weights=True)
+    msg = f"Unknown method {method!r}, expected 'bilinear', 'spline' or 'lanczos'"
+    raise ValueError(msg)
+
+
+def _sample(  # noqa: PLR0913
+    image: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    taps: _Filter,
+    *,
+    border: str,
+    cval: float,
+    dtype: np.dtype,
+) -> np.ndarray:
+    """Interpolates ``image`` at positions (``x``, ``y``), summing one tap pair at a time.
+
+    For the "constant" border, taps outside the image get zero weight, and
+    their weight is collected to add ``cval`` at the end. Positions that are
+    not finite get ``cval``.
+    """
+    cols, col_weights, col_valid = _axis_taps(x, image.shape[1], taps, border)
+    rows, row_weights, row_valid = _axis_taps(y, image.shape[0], taps, border)
+    channels = (np.newaxis,) * (image.ndim - 2)
+    # Gathering from the flattened pixels with one index array is faster than 2D fancy indexing
+    pixels = image.reshape(-1, *image.shape[2:])
+    row_starts = rows * image.shape[1]
+    acc = np.zeros(x.shape + image.shape[2:], dtype=dtype)
+    term = np.empty_like(acc)
+    outside = np.zeros(x.shape, dtype=dtype) if border == "constant" else None
+    for ky in range(len(rows)):
+        for kx in range(len(cols)):
+            weight = np.multiply(row_weights[ky], col_weights[kx], dtype=dtype)
+            if outside is not None:
+                valid = row_valid[ky] & col_valid[kx]
+                outside += np.where(valid, 0, weight)
+                weight[~valid] = 0
+            samples = np.take(pixels, row_starts[ky] + cols[kx], axis=0)
+            np.multiply(samples, weight[(..., *channels)], out=term)
+            acc += term
+    if outside is not None and cval:
+        acc += cval * outside[(..., *channels)]
+    acc[~(np.isfinite(x) & np.isfinite(y))] = cval
+    return acc
+
+
+def _axis_taps(
+    coords: np.ndarray,
+    length: int,
+    taps: _Filter,
+    border: str,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Builds per-pixel taps along one axis.
+
+    Positions are clipped to just beyond the taps, or wrapped by the mirror
+    period for the "reflect" border, so that far or non-finite positions
+    cannot overflow the integer indices. Filters weighted at the clamped
+    indices clamp the positions to the image for the "clamp" border, as
+    their weights are only defined there.
+
+    Args:
+        coords (np.ndarray): Source positions along the axis.
+        length (int): Length of the source axis.
+        taps (_Filter): Kernel and tap layout of the method.
+        border (str): Border mode.
+
+    Returns:
+        tuple: Source indices and normalized weights, both of shape
+        (len(taps.offsets), *coords.shape), and a mask of the taps inside the
+        image.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    reach = float(np.abs(taps.offsets).max() + 1)
+    # Non-finite positions are sampled anywhere; the caller overwrites them
+    coords = np.where(np.isfinite(coords), coords, -reach)
+    if border == "reflect" and length > 1:
+        coords = np.mod(coords, 2 * (length - 1))
+    elif border == "clamp" and taps.clamped_weights:
+        coords = np.clip(coords, 0, length - 1)
+    else:
+        coords = np.clip(coords, -reach, length - 1 + reach)
+    positions = np.floor(coords) + taps.offsets.reshape(-1, *(1,) * coords.ndim)
+    valid = (positions >= 0) & (positions < length)
+    if border == "clamp":
+        clamped = np.clip(positions, 0, length - 1)
+        if taps.clamped_weights:
+            positions = clamped
+        indices = clamped.astype(np.intp)
+    elif border == "reflect":
+        indices = _reflect(positions.astype(np.intp), length)
+    else:
+        indices = np.clip(positions, 0, length - 1).astype(np.intp)
+    weights = taps.kernel(coords - positions)
+    norm = weights.sum(axis=0)
+    weights = np.divide(weights, norm, out=np.zeros_like(weights), where=norm != 0)
+    return indices, weights, valid
+
+
+def _reflect(indices: np.ndarray, length: int) -> np.ndarray:
+    """Mirrors indices about the edge pixels, without repeating them."""
+    if length == 1:
+        return np.zeros_like(indices)
+    period = 2 * (length - 1)
+    indices = np.abs(indices) % period
+    return np.where(indices < length, indices, period - indices)
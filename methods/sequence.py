@@ -0,0 +1,273 @@
+"""Resizing of frame sequences.
+
+All frames of a sequence share one geometry, so the resampling plan is built
+once, and scratch buffers are reused from frame to frame. Streamed frames are
+resized in batches that are resampled in one call, as extra channels.
+:func:`run_sequence` also overlaps decoding, resizing and encoding on separate
+threads.
+"""
+
+import math
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TypeVar
+
+import numpy as np
+import numpy.typing as npt
+
+from methods._separable import output_dtype, resample
+from methods.registry import get_planner
+from methods.workspace import Workspace
+
+T = TypeVar("T")
+
+
+@dataclass
+class SequenceStats:
+    """Summary of a sequence run.
+
+    Attributes:
+        frames (int): Number of frames resized and written.
+        seconds (float): Wall time of the run.
+    """
+
+    frames: int = 0
+    seconds: float = 0.0
+
+    @property
+    def frames_per_second(self) -> float:
+        """float: Sustained throughput over the whole run."""
+        return self.frames / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        """Returns a one-line human-readable summary of the run."""
+        return f"Resized {self.frames} frames in {self.seconds:.2f} s: {self.frames_per_second:.2f} frames/s"
+
+
+def resize_frames(  # noqa: PLR0913
+    frames: np.ndarray,
+    new_height: int,
+    new_width: int,
+    method: str = "bilinear",
+    *,
+    out: np.ndarray | None = None,
+    workers: int = 1,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    workspace: Workspace | None = None,
+    **params: object,
+) -> np.ndarray:
+    """Resizes every frame of a (T, H, W) or (T, H, W, C) array.
+
+    Args:
+        frames (np.ndarray): Frame stack; memory maps are read frame by frame.
+        new_height (int): Target frame height.
+        new_width (int): Target frame width.
+        method (str, optional): One of :data:`methods.registry.registry`.
+            Defaults to "bilinear".
+        out (np.ndarray | None, optional): Array of shape (T, new_height,
+            new_width[, C]) to write into. Defaults to a new array.
+        workers (int, optional): Frames resized concurrently. Defaults to 1.
+        dtype (npt.DTypeLike, optional): Floating-point accumulator type.
+            Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float frames in their own
+            dtype. Defaults to False.
+        workspace (Workspace | None, optional): Scratch buffers reused by all
+            frames. Defaults to a new workspace.
+        **params: Method parameters, e.g. ``a`` or ``antialias``.
+
+    Returns:
+        np.ndarray: The resized frames; each equals the method's result for
+        that frame alone.
+
+    Raises:
+        ValueError: If the stack has unsupported dimensions, ``workers`` is
+            not positive, or the method or its parameters are invalid.
+    """
+    frames = np.asarray(frames)
+    if frames.ndim not in (3, 4):
+        msg = "Unsupported frame stack dimensions"
+        raise ValueError(msg)
+    if workers < 1:
+        msg = "workers must be positive"
+        raise ValueError(msg)
+    plan = get_planner(method)(frames.shape[1:], new_height, new_width, **params)
+
+    shape = (len(frames), new_height, new_width, *frames.shape[3:])
+    if out is None:
+        out = np.empty(shape, dtype=output_dtype(frames.dtype, preserve_dtype=preserve_dtype))
+    workspace = workspace if workspace is not None else Workspace()
+
+    def resize(index: int) -> None:
+        resample(frames[index], plan, out[index], dtype=dtype, workspace=workspace)
+
+    if workers == 1 or len(frames) <= 1:
+        for index in range(len(frames)):
+            resize(index)
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            for future in [pool.submit(resize, index) for index in range(len(frames))]:
+                future.result()
+    return out
+
+
+def iter_resize_frames(  # noqa: PLR0913
+    frames: Iterable[np.ndarray],
+    new_height: int,
+    new_width: int,
+    method: str = "bilinear",
+    *,
+    batch_size: int = 8,
+    workers: int = 1,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    **params: object,
+) -> Iterator[np.ndarray]:
+    """Resizes a stream of same-size frames, yielding them in order.
+
+    Frames are copied as they arrive into a batch buffer of shape (H, W,
+    ``batch_size``[, C]) whose frames act as extra channels, so a whole batch
+    is resampled in one call; the plan is built once and reused.
+
+    Args:
+        frames (Iterable[np.ndarray]): Frames of shape (H, W) or (H, W, C).
+        new_height (int): Target frame height.
+        new_width (int): Target frame width.
+        method (str, optional): One of :data:`methods.registry.registry`.
+            Defaults to "bilinear".
+        batch_size (int, optional): Frames collected per batch. Defaults to 8.
+        workers (int, optional): Threads resampling each batch. Defaults to 1.
+        dtype (npt.DTypeLike, optional): Floating-point accumulator type.
+            Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float frames in their own
+            dtype. Defaults to False.
+        **params: Method parameters, e.g. ``a`` or ``antialias``.
+
+    Yields:
+        np.ndarray: Resized frames, as views into their batch's output; each
+        equals the method's result for that frame alone.
+
+    Raises:
+        ValueError: If ``batch_size`` is not positive or a frame differs in
+            shape or dtype from the first one.
+    """
+    if batch_size <= 0:
+        msg = "batch_size must be positive"
+        raise ValueError(msg)
+    workspace = Workspace()
+    batch: np.ndarray | None = None
+    count = 0
+
+    def resize(stack: np.ndarray) -> Iterator[np.ndarray]:
+        height, width, size, *channels = stack.shape
+        plan = get_planner(method)((height, width), new_height, new_width, **params)
+        out = np.empty(
+            (new_height, new_width, size * math.prod(channels)),
+            dtype=output_dtype(stack.dtype, preserve_dtype=preserve_dtype),
+        )
+        resample(stack.reshape(height, width, -1), plan, out, workers=workers, dtype=dtype, workspace=workspace)
+        yield from np.moveaxis(out.reshape(new_height, new_width, size, *channels), 2, 0)
+
+    for frame in frames:
+        frame = np.asarray(frame)  # noqa: PLW2901
+        if batch is None:
+            if frame.ndim not in (2, 3):
+                msg = "Unsupported frame dimensions"
+                raise ValueError(msg)
+            batch = np.empty((*frame.shape[:2], batch_size, *frame.shape[2:]), dtype=frame.dtype)
+        elif frame.shape != batch[:, :, 0].shape or frame.dtype != batch.dtype:
+            first = batch[:, :, 0]
+            msg = f"Frame of {frame.shape} {frame.dtype} differs from the first frame, {first.shape} {first.dtype}"
+            raise ValueError(msg)
+        batch[:, :, count] = frame
+        count += 1
+        if count == batch_size:
+            yield from resize(batch)
+            count = 0
+    if batch is not None and count:
+        yield from resize(np.ascontiguousarray(batch[:, :, :count]))
+
+
+def run_sequence(  # noqa: PLR0913
+    sources: Iterable[T],
+    read: Callable[[T], np.ndarray],
+    write: Callable[[int, np.ndarray], object],
+    new_height: int,
+    new_width: int,
+    *,
+    method: str = "bilinear",
+    batch_size: int = 8,
+    workers: int = 1,
+    io_workers: int = 2,
+    queue_size: int = 8,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    **params: object,
+) -> SequenceStats:
+    """Decodes, resizes and encodes a frame sequence with overlapped stages.
+
+    Up to ``queue_size`` frames are decoded ahead of the resizer and up to
+    ``queue_size`` resized frames wait to be encoded, so memory stays bounded
+    while the three stages run concurrently.
+
+    Args:
+        sources (Iterable[T]): Frame sources in order, e.g. file paths.
+        read (Callable[[T], np.ndarray]): Decodes one source.
+        write (Callable[[int, np.ndarray], object]): Encodes a resized frame
+            given its position in the sequence.
+        new_height (int): Target frame height.
+        new_width (int): Target frame width.
+        method (str, optional): One of :data:`methods.registry.registry`.
+            Defaults to "bilinear".
+        batch_size (int, optional): Frames collected per batch. Defaults to 8.
+        workers (int, optional): Threads resampling each batch. Defaults to 1.
+        io_workers (int, optional): Decode and encode threads each. Defaults to 2.
+        queue_size (int, optional): Frames in flight per I/O stage. Defaults to 8.
+        dtype (npt.DTypeLike, optional): Floating-point accumulator type.
+            Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float frames in their own
+            dtype. Defaults to False.
+        **params: Method parameters, e.g. ``a`` or ``antialias``.
+
+    Returns:
+        SequenceStats: Frame count and wall time of the run.
+    """
+    stats = SequenceStats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max(io_workers, 1)) as readers, ThreadPoolExecutor(max(io_workers, 1)) as writers:
+        frames = _prefetch(readers, read, sources, queue_size)
+        pending: deque[Future] = deque()
+        resized = iter_resize_frames(
+            frames,
+            new_height,
+            new_width,
+            method,
+            batch_size=batch_size,
+            workers=workers,
+            dtype=dtype,
+            preserve_dtype=preserve_dtype,
+            **params,
+        )
+        for index, frame in enumerate(resized):
+            pending.append(writers.submit(write, index, frame))
+            while len(pending) > queue_size:
+                pending.popleft().result()
+            stats.frames += 1
+        for future in pending:
+            future.result()
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def _prefetch(pool: ThreadPoolExecutor, func: Callable[[T], np.ndarray], items: Iterable[T], depth: int) -> Iterator:
+    """Yields ``func(item)`` in order, keeping up to ``depth`` calls running ahead."""
+    pending: deque[Future] = deque()
+    for item in items:
+        pending.append(pool.submit(func, item))
+        if len(pending) > depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
@@ -0,0 +1,446 @@
+"""Long-running resize server.
+
+A single process keeps NumPy imported and the plan cache warm, and serves
+resize jobs over a minimal HTTP/1.1 interface:
+
+- ``POST /resize?height=H&width=W&method=M`` with the encoded image as the
+  body, or with ``path=`` naming a file under the server's ``root`` directory;
+  without a root, and outside it, ``path=`` is refused with 403. The response
+  is the resized image, as .npy for .npy inputs and PNG otherwise, unless
+  ``format=npy|png`` is given. ``a`` and ``antialias`` are passed to the method.
+- ``GET /metrics`` returns counters, the queue depth and a latency histogram
+  as JSON.
+- ``GET /health`` returns ``ok``.
+
+Jobs that share a geometry (input shape and dtype, target size, method and
+parameters) and arrive within ``batch_window`` seconds of each other are
+resized together in one :func:`methods.sequence.resize_frames` call on a
+bounded thread pool. Once ``max_queue`` requests are being read, waiting or
+running, new ones are refused with 503 before their body is read, until the
+queue drains.
+"""
+
+import asyncio
+import bisect
+import contextlib
+import io
+import json
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+from PIL import Image
+
+from methods.registry import get_planner
+from methods.sequence import resize_frames
+
+# Upper bounds in seconds of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Largest accepted request body
+MAX_BODY = 512 * 2**20
+
+# Largest accepted output, in pixels; 8192 x 8192 by default
+MAX_OUTPUT_PIXELS = 2**26
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    403: "Forbidden",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class OverloadedError(Exception):
+    """Raised when a job is submitted while the queue is full."""
+
+
+class _HTTPError(Exception):
+    """Ends a request with an error status and a plain-text message."""
+
+    def __init__(self, status: int, message: str, headers: dict[str, str] | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class LatencyHistogram:
+    """Cumulative histogram of request latencies.
+
+    Attributes:
+        buckets (tuple[float, ...]): Upper bounds of the buckets in seconds.
+        counts (list[int]): Observations per bucket, plus one for larger values.
+        count (int): Number of observations.
+        total (float): Sum of the observations in seconds.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        """Creates an empty histogram with the given bucket bounds."""
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Records one latency."""
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Returns the upper bound of the bucket holding the ``q`` quantile.
+
+        Returns infinity if it falls in the unbounded bucket and 0 if the
+        histogram is empty.
+        """
+        if not self.count:
+            return 0.0
+        seen = 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts, strict=True):
+            seen += count
+            if seen >= q * self.count:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        """Returns the histogram as a JSON-serializable dict."""
+        return {
+            "buckets": list(self.buckets),
+            "counts": list(self.counts),
+            "count": self.count,
+            "sum": self.total,
+        }
+
+
+class ResizeServer:
+    """Coalesces resize jobs by geometry and runs them on a bounded pool.
+
+    Example:
+        >>> server = ResizeServer(workers=4)
+        >>> asyncio.run(server.serve("127.0.0.1", 8000))  # doctest: +SKIP
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        workers: int = 1,
+        max_queue: int = 64,
+        max_batch: int = 16,
+        batch_window: float = 0.005,
+        root: str | Path | None = None,
+        max_output_pixels: int = MAX_OUTPUT_PIXELS,
+    ) -> None:
+        """Creates a server; no socket is opened until :meth:`start`.
+
+        Args:
+            workers (int, optional): Threads resizing batches. Defaults to 1.
+            max_queue (int, optional): Jobs waiting or running before new ones
+                are refused. Defaults to 64.
+            max_batch (int, optional): Jobs resized in one batch at most. Defaults to 16.
+            batch_window (float, optional): Seconds a new geometry waits for
+                more jobs before its batch runs. Defaults to 0.005.
+            root (str | Path | None, optional): Directory whose files
+                requests may name with ``path=``. Defaults to None, which
+                refuses ``path=``.
+            max_output_pixels (int, optional): Largest output, in pixels, a
+                request may ask for; larger ones get 413. Defaults to
+                ``MAX_OUTPUT_PIXELS``.
+
+        Raises:
+            ValueError: If a size or count is not positive or the window is negative.
+        """
+        if workers < 1 or max_queue < 1 or max_batch < 1 or max_output_pixels < 1:
+            msg = "workers, max_queue, max_batch and max_output_pixels must be positive"
+            raise ValueError(msg)
+        if batch_window < 0:
+            msg = "batch_window must not be negative"
+            raise ValueError(msg)
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.rejected = 0
+        self.failed = 0
+        self.batches = 0
+        self.queue_depth = 0
+        self.root = Path(root).resolve() if root is not None else None
+        self.max_output_pixels = max_output_pixels
+        self._admitted = 0
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="resize")
+        self._groups: dict[tuple, list[tuple[np.ndarray, asyncio.Future]]] = {}
+
+    async def submit(
+        self,
+        image: np.ndarray,
+        new_height: int,
+        new_width: int,
+        method: str = "bilinear",
+        **params: object,
+    ) -> np.ndarray:
+        """Resizes an image together with other pending jobs of the same geometry.
+
+        Args:
+            image (np.ndarray): Input image of shape (H, W) or (H, W, C).
+            new_height (int): Target height.
+            new_width (int): Target width.
+            method (str, optional): One of :data:`methods.registry.registry`.
+                Defaults to "bilinear".
+            **params: Method parameters, e.g. ``a`` or ``antialias``.
+
+        Returns:
+            np.ndarray: The resized image.
+
+        Raises:
+            OverloadedError: If ``max_queue`` jobs are already waiting or running.
+            ValueError: If the method or its parameters are invalid.
+        """
+        get_planner(method)
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            msg = f"{self.queue_depth} jobs are queued"
+            raise OverloadedError(msg)
+
+        loop = asyncio.get_running_loop()
+        key = (image.shape, image.dtype.str, new_height, new_width, method, tuple(sorted(params.items())))
+        future = loop.create_future()
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = []
+            loop.call_later(self.batch_window, self._flush, key, group)
+        group.append((image, future))
+        if len(group) >= self.max_batch:
+            self._flush(key, group)
+
+        self.queue_depth += 1
+        try:
+            return await future
+        finally:
+            self.queue_depth -= 1
+
+    def _flush(self, key: tuple, group: list[tuple[np.ndarray, asyncio.Future]]) -> None:
+        """Starts the batch of ``group`` unless it has already been started."""
+        if self._groups.get(key) is not group:
+            return
+        del self._groups[key]
+        self.batches += 1
+        _, _, new_height, new_width, method, params = key
+        frames = [image for image, _ in group]
+
+        def run() -> np.ndarray:
+            return resize_frames(np.stack(frames), new_height, new_width, method, **dict(params))
+
+        task = asyncio.get_running_loop().run_in_executor(self._executor, run)
+        task.add_done_callback(lambda done: _resolve(done, [future for _, future in group]))
+
+    def metrics(self) -> dict:
+        """Returns the counters, queue depth and latency histogram."""
+        return {
+            "requests": self.requests,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "batches": self.batches,
+            "queue_depth": self.queue_depth,
+            "latency": self.latency.snapshot(),
+        }
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        """Starts listening; port 0 picks a free port.
+
+        Returns:
+            asyncio.Server: The listening server; its port is in
+            ``server.sockets[0].getsockname()[1]``.
+        """
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """Serves requests until cancelled."""
+        server = await self.start(host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Shuts the resize threads down once the running batches finish."""
+        self._executor.shutdown(wait=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one request on a connection and closes it."""
+        try:
+            status, headers, body = await self._respond(reader)
+        except _HTTPError as error:
+            status, headers, body = _text(error.status, str(error), error.headers)
+        except Exception as error:  # noqa: BLE001
+            self.failed += 1
+            status, headers, body = _text(500, str(error))
+        reason = _REASONS.get(status, "")
+        head = [f"HTTP/1.1 {status} {reason}", f"Content-Length: {len(body)}", "Connection: close"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + body)
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+    async def _respond(self, reader: asyncio.StreamReader) -> tuple[int, dict[str, str], bytes]:
+        """Parses a request and returns the status, headers and body of the response."""
+        request_line = (await reader.readline()).decode("latin-1").split()
+        start = time.perf_counter()
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if len(request_line) < 2:
+            raise _HTTPError(400, "Malformed request line")
+        verb, target = request_line[0], urlsplit(request_line[1])
+
+        if target.path == "/health":
+            _expect(verb, "GET")
+            return _text(200, "ok")
+        if target.path == "/metrics":
+            _expect(verb, "GET")
+            return 200, {"Content-Type": "application/json"}, json.dumps(self.metrics()).encode()
+        if target.path != "/resize":
+            raise _HTTPError(404, f"No such endpoint {target.path}")
+        _expect(verb, "POST")
+
+        length = _content_length(headers)
+        query = {name: values[-1] for name, values in parse_qs(target.query).items()}
+        size = self._output_size(query)
+        # Refuse before reading the body, so that uploads cannot pile up in memory
+        if self._admitted >= self.max_queue:
+            self.rejected += 1
+            raise _HTTPError(503, f"{self._admitted} requests are in progress", {"Retry-After": "1"})
+        self._admitted += 1
+        try:
+            body = await reader.readexactly(length) if length else b""
+            self.requests += 1
+            try:
+                response = await self._resize(body, query, size)
+            except OverloadedError as error:
+                raise _HTTPError(503, str(error), {"Retry-After": "1"}) from None
+            except (ValueError, OSError) as error:
+                raise _HTTPError(400, str(error)) from None
+        finally:
+            self._admitted -= 1
+        self.latency.observe(time.perf_counter() - start)
+        return response
+
+    def _output_size(self, query: dict[str, str]) -> tuple[int, int]:
+        """Returns the requested output size, refusing invalid or oversized ones."""
+        try:
+            new_height, new_width = int(query["height"]), int(query["width"])
+        except (KeyError, ValueError):
+            raise _HTTPError(400, "height and width must be given as integers") from None
+        if new_height <= 0 or new_width <= 0:
+            raise _HTTPError(400, "height and width must be positive")
+        if new_height * new_width > self.max_output_pixels:
+            raise _HTTPError(413, f"Outputs are limited to {self.max_output_pixels} pixels")
+        return new_height, new_width
+
+    async def _resize(
+        self,
+        body: bytes,
+        query: dict[str, str],
+        size: tuple[int, int],
+    ) -> tuple[int, dict[str, str], bytes]:
+        """Decodes, resizes to ``size`` and encodes the image of a /resize request."""
+        new_height, new_width = size
+        method = query.get("method", "bilinear")
+        params: dict[str, object] = {}
+        if "a" in query:
+            params["a"] = int(query["a"])
+        if "antialias" in query:
+            params["antialias"] = query["antialias"].lower() in ("1", "true", "yes")
+
+        if "path" in query:
+            path = self._local_path(query["path"])
+            body = await asyncio.to_thread(path.read_bytes)
+        image, is_npy = await asyncio.to_thread(_decode, body)
+        output_format = query.get("format", "npy" if is_npy else "png")
+        if output_format not in ("npy", "png"):
+            msg = f"Unknown format {output_format!r}, expected 'npy' or 'png'"
+            raise ValueError(msg)
+
+        resized = await self.submit(image, new_height, new_width, method, **params)
+        data = await asyncio.to_thread(_encode, resized, output_format)
+        content_type = "application/x-npy" if output_format == "npy" else "image/png"
+        return 200, {"Content-Type": content_type}, data
+
+    def _local_path(self, name: str) -> Path:
+        """Resolves a ``path=`` argument, refusing anything outside ``root``."""
+        if self.root is None:
+            raise _HTTPError(403, "Reading server files is disabled; start the server with a root directory")
+        path = (self.root / name).resolve()
+        if not path.is_relative_to(self.root):
+            raise _HTTPError(403, f"{name} is outside the server root")
+        return path
+
+
+def _resolve(done: asyncio.Future, futures: list[asyncio.Future]) -> None:
+    """Hands the frames of a finished batch, or its error, to the waiting jobs."""
+    error = done.exception()
+    for index, future in enumerate(futures):
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(done.result()[index])
+
+
+def _expect(verb: str, allowed: str) -> None:
+    """Rejects requests whose HTTP method is not ``allowed``."""
+    if verb != allowed:
+        raise _HTTPError(405, f"Use {allowed}")
+
+
+def _content_length(headers: dict[str, str]) -> int:
+    """Returns the body length of a request, rejecting invalid or oversized ones."""
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise _HTTPError(400, "Invalid Content-Length") from None
+    if length < 0:
+        raise _HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY:
+        raise _HTTPError(413, f"Bodies are limited to {MAX_BODY} bytes")
+    return length
+
+
+def _decode(data: bytes) -> tuple[np.ndarray, bool]:
+    """Decodes .npy or image bytes; also returns whether they were .npy."""
+    if data.startswith(b"\x93NUMPY"):
+        return np.load(io.BytesIO(data), allow_pickle=False), True
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            return np.asarray(image), False
+    except Image.UnidentifiedImageError:
+        msg = "The body is neither a .npy file nor a supported image"
+        raise ValueError(msg) from None
+
+
+def _encode(image: np.ndarray, output_format: str) -> bytes:
+    """Encodes an image as .npy or PNG bytes."""
+    buffer = io.BytesIO()
+    if output_format == "npy":
+        np.save(buffer, image)
+    else:
+        Image.fromarray(image).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _text(status: int, text: str, headers: dict[str, str] | None = None) -> tuple[int, dict[str, str], bytes]:
+    """Returns a plain-text response."""
+    return status, {"Content-Type": "text/plain", **(headers or {})}, text.encode()
@@ -1,7 +1,14 @@
 """Spline interpolation method."""
 
+import math
+
 import numpy as np
-from tqdm import tqdm
+import numpy.typing as npt
+
+from methods._separable import antialias_taps, is_downscale, resample
+from methods.hooks import ResizeHooks, timed
+from methods.plan import ResamplingPlan, get_plan
+from methods.workspace import Workspace
 
 
 def cubic_kernel(x: float) -> float:
@@ -23,6 +30,29 @@ def cubic_kernel(x: float) -> float:
     return 0.0
 
 
+def catmull_rom_kernel(x: np.ndarray) -> np.ndarray:
+    """Evaluates the Catmull-Rom kernel of :func:`cubic_kernel` on an array."""
+    x = np.abs(x)
+    near = (1.5 * x - 2.5) * x * x + 1
+    far = ((-0.5 * x + 2.5) * x - 4) * x + 2
+    return np.where(x <= 1, near, np.where(x < 2, far, 0.0))
+
+
+def _cubic_interp(p: np.ndarray, x: float | np.ndarray) -> float | np.ndarray:
+    """Evaluates the Catmull-Rom polynomial through four samples.
+
+    Args:
+        p (np.ndarray): Four consecutive samples ``p[0]..p[3]``.
+        x (float | np.ndarray): Offset(s) from ``p[1]`` in [0, 1).
+
+    Returns:
+        float | np.ndarray: Interpolated value(s) between ``p[1]`` and ``p[2]``.
+    """
+    return p[1] + 0.5 * x * (
+        p[2] - p[0] + x * (2 * p[0] - 5 * p[1] + 4 * p[2] - p[3] + x * (3 * (p[1] - p[2]) + p[3] - p[0]))
+    )
+
+
 def _fast_bicubic_patch(patch: np.ndarray, dx: float, dy: float) -> float:
     """Performs fast 2D bicubic interpolation on a 4x4 patch.
 
@@ -34,23 +64,59 @@ def _fast_bicubic_patch(patch: np.ndarray, dx: float, dy: float) -> float:
     Returns:
         float: Interpolated pixel value, clipped to [0, 255].
     """
-
-    def cubic_interp(p: np.ndarray, x: float) -> float:
-        return p[1] + 0.5 * x * (
-            p[2] - p[0] + x * (2 * p[0] - 5 * p[1] + 4 * p[2] - p[3] + x * (3 * (p[1] - p[2]) + p[3] - p[0]))
-        )
-
-    row_interp = np.array([cubic_interp(patch[i, :], dy) for i in range(4)])
-    return float(np.clip(cubic_interp(row_interp, dx), 0, 255))
+    row_interp = np.array([_cubic_interp(patch[i, :], dy) for i in range(4)])
+    return float(np.clip(_cubic_interp(row_interp, dx), 0, 255))
 
 
-def spline_interpolation(image: np.ndarray, new_height: int, new_width: int) -> np.ndarray:
+def spline_interpolation(  # noqa: PLR0913
+    image: np.ndarray,
+    new_height: int,
+    new_width: int,
+    *,
+    antialias: bool = False,
+    tile_shape: tuple[int, int] | None = None,
+    max_memory: int | None = None,
+    workers: int = 1,
+    hooks: ResizeHooks | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    out: np.ndarray | None = None,
+    workspace: Workspace | None = None,
+    roi: tuple[int, int, int, int] | None = None,
+) -> np.ndarray:
     """Interpolates an image using bicubic spline interpolation.
 
     Args:
-        image (np.ndarray): Input 2D (grayscale) or 3D (RGB) image.
+        image (np.ndarray): Input 2D (grayscale) or 3D (RGB) image. Memory
+            maps and other buffer-protocol objects are read without being
+            loaded, one tile's source window at a time.
         new_height (int): Desired height of the output image.
         new_width (int): Desired width of the output image.
+        antialias (bool, optional): When shrinking, widen the kernel by the
+            scale factor so that every source pixel is averaged in instead of
+            aliasing. Has no effect on enlarged axes. Defaults to False.
+        tile_shape (tuple[int, int] | None, optional): Compute the output in
+            tiles of (rows, columns). Defaults to the whole output at once.
+        max_memory (int | None, optional): Cap in bytes on temporary buffers;
+            the tile shape is reduced until the tiles in flight fit. Defaults to None.
+        workers (int, optional): Number of threads computing output tiles in
+            parallel. Results do not depend on it. Defaults to 1.
+        hooks (ResizeHooks | None, optional): Callbacks receiving stage
+            timings, finished rows and processed bytes. Defaults to None.
+        dtype (npt.DTypeLike, optional): Floating-point accumulator type.
+            float32 halves the temporary memory. Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float images in their own
+            dtype, without clipping, instead of uint8. uint8 and 16-bit
+            integer images always keep their dtype. Defaults to False.
+        out (np.ndarray | None, optional): Array to write the result into,
+            of the output shape. Defaults to a new array.
+        workspace (Workspace | None, optional): Scratch buffers reused
+            between calls; with ``out`` repeated same-size resizes allocate
+            no large arrays. Defaults to None.
+        roi (tuple[int, int, int, int] | None, optional): Compute only the
+            output window (top, left, height, width), reading only the source
+            pixels in its support. The result equals the same crop of the full
+            output bit for bit. Defaults to None (the whole output).
 
     Returns:
         np.ndarray: Interpolated image with shape (new_height, new_width) or
@@ -59,61 +125,79 @@ def spline_interpolation(image: np.ndarray, new_height: int, new_width: int) ->
     Raises:
         ValueError: If the input is empty or has unsupported dimensions.
     """
-    if image.size == 0 or new_height <= 0 or new_width <= 0:
-        msg = "Invalid image or output dimensions"
-        raise ValueError(msg)
-
-    if image.ndim == 2:
-        return _spline_gray(image, new_height, new_width)
-    if image.ndim == 3:
-        return np.stack(
-            [_spline_gray(image[..., c], new_height, new_width, channel=c) for c in range(image.shape[2])],
-            axis=-1,
-        )
-    msg = "Unsupported image dimensions"
-    raise ValueError(msg)
-
-
-def _spline_gray(
-    image: np.ndarray,
-    new_h: int,
-    new_w: int,
-    channel: int | None = None,
-) -> np.ndarray:
-    """Interpolates a single grayscale channel using bicubic spline.
+    image = np.asarray(image)
+    with timed(hooks, "plan"):
+        plan = spline_plan(image.shape, new_height, new_width, antialias=antialias)
+    return resample(
+        image,
+        plan,
+        out,
+        tile_shape=tile_shape,
+        max_memory=max_memory,
+        workers=workers,
+        hooks=hooks,
+        dtype=dtype,
+        preserve_dtype=preserve_dtype,
+        workspace=workspace,
+        roi=roi,
+    )
+
+
+def spline_plan(
+    shape: tuple[int, ...],
+    new_height: int,
+    new_width: int,
+    *,
+    antialias: bool = False,
+) -> ResamplingPlan:
+    """Returns the cached spline resampling plan for an image shape.
 
     Args:
-        image (np.ndarray): 2D grayscale image channel.
-        new_h (int): Target height of the output image.
-        new_w (int): Target width of the output image.
-        channel (int | None): Channel index for logging, if RGB.
+        shape (tuple[int, ...]): Shape of the input image, (H, W) or (H, W, C).
+        new_height (int): Desired height of the output image.
+        new_width (int): Desired width of the output image.
+        antialias (bool, optional): Widen the kernel when shrinking. Defaults to False.
 
     Returns:
-        np.ndarray: Interpolated 2D image of shape (new_h, new_w).
+        ResamplingPlan: Tap tables for both axes.
+
+    Raises:
+        ValueError: If the shape is empty or has unsupported dimensions.
     """
-    h, w = image.shape
-    _ = h / new_h
-    _ = w / new_w
+    if math.prod(shape) == 0 or new_height <= 0 or new_width <= 0:
+        msg = "Invalid image or output dimensions"
+        raise ValueError(msg)
+
+    if len(shape) not in (2, 3):
+        msg = "Unsupported image dimensions"
+        raise ValueError(msg)
 
-    output = np.zeros((new_h, new_w), dtype=np.uint8)
+    return get_plan("spline", (shape[0], shape[1]), (new_height, new_width), _spline_taps, antialias=antialias)
 
-    bar_desc = f"Spline Interpolation{' (channel ' + str(channel) + ')' if channel is not None else ''}"
-    x_coords = np.linspace(0, h - 1, new_h)
-    y_coords = np.linspace(0, w - 1, new_w)
 
-    for i, x in enumerate(tqdm(x_coords, desc=bar_desc, unit="line")):
-        x_int = int(np.floor(x))
-        dx = x - x_int
+def _spline_taps(src_len: int, dst_len: int, *, antialias: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    """Builds the 4-tap Catmull-Rom table for one image axis.
 
-        x_idx = np.clip(np.arange(x_int - 1, x_int + 3), 0, h - 1)
+    The weights are obtained by feeding the unit basis vectors through
+    :func:`_cubic_interp`, so they reproduce its polynomial exactly.
 
-        for j, y in enumerate(y_coords):
-            y_int = int(np.floor(y))
-            dy = y - y_int
+    Args:
+        src_len (int): Length of the source axis.
+        dst_len (int): Length of the output axis.
+        antialias (bool, optional): Widen the kernel when shrinking.
+            Defaults to False.
 
-            y_idx = np.clip(np.arange(y_int - 1, y_int + 3), 0, w - 1)
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Source indices and weights, both of
+        shape (dst_len, 4), or wider for an antialiased downscale.
+    """
+    if antialias and is_downscale(src_len, dst_len):
+        return antialias_taps(src_len, dst_len, catmull_rom_kernel, 2)
 
-            patch = image[np.ix_(x_idx, y_idx)].astype(np.float32)
-            output[i, j] = int(_fast_bicubic_patch(patch, dx, dy))
+    coords = np.linspace(0, src_len - 1, dst_len)
+    base = np.floor(coords)
+    frac = coords - base
 
-    return output
+    indices = np.clip(base.astype(np.intp)[:, None] + np.arange(-1, 3), 0, src_len - 1)
+    weights = np.asarray(_cubic_interp(np.eye(4)[:, :, None], frac[None, :])).T
+    return indices, weights
@@ -0,0 +1,154 @@
+"""Incremental resizing in output row bands.
+
+:func:`iter_interpolate` yields the output a band of rows at a time, as soon as
+the source rows in the band's support are available. The source can be an
+array (including a memory map) or an iterator of row chunks, e.g. from a
+progressive decoder. Then only the rows still needed by the next band are kept,
+so decode, resize and encode can be chained in constant memory.
+"""
+
+from collections.abc import Callable, Iterable, Iterator
+
+import numpy as np
+import numpy.typing as npt
+
+from methods._separable import resample, slice_taps
+from methods.hooks import ResizeHooks, timed
+from methods.plan import ResamplingPlan
+from methods.registry import get_planner
+from methods.workspace import Workspace
+
+
+def iter_interpolate(  # noqa: PLR0913
+    source: np.ndarray | Iterator[np.ndarray],
+    new_height: int,
+    new_width: int,
+    method: str = "bilinear",
+    *,
+    src_shape: tuple[int, ...] | None = None,
+    band_rows: int = 64,
+    workers: int = 1,
+    hooks: ResizeHooks | None = None,
+    dtype: npt.DTypeLike = np.float64,
+    preserve_dtype: bool = False,
+    workspace: Workspace | None = None,
+    **params: object,
+) -> Iterator[np.ndarray]:
+    """Resizes an image and yields the output in bands of rows.
+
+    Concatenating the bands gives exactly the result of the method's
+    ``*_interpolation`` function.
+
+    Args:
+        source (np.ndarray | Iterator[np.ndarray]): The image, or an iterator
+            of consecutive row chunks of shape (rows, W) or (rows, W, C).
+        new_height (int): Target height of the output image.
+        new_width (int): Target width of the output image.
+        method (str, optional): A separable method of :data:`methods.registry.registry`. Defaults to "bilinear".
+        src_shape (tuple[int, ...] | None, optional): Full shape of the image;
+            required when ``source`` is an iterator. Defaults to None.
+        band_rows (int, optional): Output rows per yielded band. Defaults to 64.
+        workers (int, optional): Threads computing each band. Defaults to 1.
+        hooks (ResizeHooks | None, optional): Callbacks; rows are reported
+            against the whole output. Defaults to None.
+        dtype (npt.DTypeLike, optional): Floating-point accumulator type.
+            Defaults to np.float64.
+        preserve_dtype (bool, optional): Return float images in their own
+            dtype. Defaults to False.
+        workspace (Workspace | None, optional): Scratch buffers reused by
+            all bands. Defaults to None.
+        **params: Method parameters, e.g. ``a`` or ``antialias``.
+
+    Returns:
+        Iterator[np.ndarray]: Output bands of up to ``band_rows`` rows.
+
+    Raises:
+        ValueError: If the method is unknown, ``band_rows`` is not positive,
+            or ``src_shape`` is missing for an iterator source. Iterating
+            raises it if the row chunks do not match ``src_shape``.
+    """
+    planner = get_planner(method)
+    if band_rows <= 0:
+        msg = "band_rows must be positive"
+        raise ValueError(msg)
+
+    if isinstance(source, Iterator):
+        if src_shape is None:
+            msg = "src_shape is required when the source is an iterator of row chunks"
+            raise ValueError(msg)
+        read_rows = _RowBuffer(source, tuple(src_shape)).read
+    else:
+        image = np.asarray(source)
+        src_shape = image.shape
+
+        def read_rows(lo: int, hi: int) -> np.ndarray:
+            return image[lo:hi]
+
+    with timed(hooks, "plan"):
+        plan = planner(tuple(src_shape), new_height, new_width, **params)
+    options = {
+        "workers": workers,
+        "hooks": _BandHooks(hooks, new_height) if hooks is not None else None,
+        "dtype": dtype,
+        "preserve_dtype": preserve_dtype,
+        "workspace": workspace,
+    }
+    return _iter_bands(plan, band_rows, read_rows, options)
+
+
+def _iter_bands(
+    plan: ResamplingPlan,
+    band_rows: int,
+    read_rows: Callable[[int, int], np.ndarray],
+    options: dict,
+) -> Iterator[np.ndarray]:
+    for r0 in range(0, len(plan.rows.indices), band_rows):
+        rows, lo, hi = slice_taps(plan.rows, r0, r0 + band_rows)
+        yield resample(read_rows(lo, hi), ResamplingPlan(rows, plan.cols), **options)
+
+
+class _RowBuffer:
+    """Source rows pulled from an iterator of chunks, dropped once no band needs them."""
+
+    def __init__(self, chunks: Iterable[np.ndarray], shape: tuple[int, ...]) -> None:
+        self._chunks = iter(chunks)
+        self._shape = shape
+        self._parts: list[np.ndarray] = []
+        self._start = 0
+        self._end = 0
+
+    def read(self, lo: int, hi: int) -> np.ndarray:
+        """Returns source rows [lo, hi); rows before ``lo`` are released."""
+        while self._end < hi:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                msg = f"Row source ended after {self._end} of {self._shape[0]} rows"
+                raise ValueError(msg)
+            chunk = np.asarray(chunk)
+            if chunk.shape[1:] != self._shape[1:]:
+                msg = f"Row chunk of shape {chunk.shape} does not match the image shape {self._shape}"
+                raise ValueError(msg)
+            self._parts.append(chunk)
+            self._end += len(chunk)
+
+        rows = self._parts[0] if len(self._parts) == 1 else np.concatenate(self._parts)
+        rows = rows[lo - self._start :]
+        self._parts, self._start = [rows], lo
+        return rows[: hi - lo]
+
+
+class _BandHooks(ResizeHooks):
+    """Forwards callbacks of one band, reporting rows against the whole output."""
+
+    def __init__(self, hooks: ResizeHooks, total: int) -> None:
+        self.hooks = hooks
+        self.total = total
+
+    def on_stage(self, stage: str, seconds: float) -> None:
+        self.hooks.on_stage(stage, seconds)
+
+    def on_rows(self, completed: int, total: int) -> None:  # noqa: ARG002
+        self.hooks.on_rows(completed, self.total)
+
+    def on_bytes(self, read: int, written: int) -> None:
+        self.hooks.on_bytes(read, written)
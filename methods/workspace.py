@@ -0,0 +1,91 @@
+"""Reusable scratch memory for the interpolation methods.
+
+Every resize needs temporary arrays for the gathered taps and the partial sums
+of both passes. Passing the same :class:`Workspace` to repeated calls keeps
+those buffers alive between them, so resizing a stream of same-size frames
+into a preallocated ``out=`` array does no large allocations after the first
+frame.
+"""
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import numpy as np
+import numpy.typing as npt
+
+
+class ScratchBuffers:
+    """Named scratch arrays used by one tile computation at a time.
+
+    Each name is backed by a byte buffer that only grows, so smaller requests
+    (e.g. the last, partial tile) reuse the memory of larger ones.
+    """
+
+    def __init__(self) -> None:
+        """Creates an empty set of buffers."""
+        self._buffers: dict[str, np.ndarray] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """int: Memory held by all buffers."""
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def get(self, name: str, shape: tuple[int, ...], dtype: npt.DTypeLike) -> np.ndarray:
+        """Returns an uninitialized C-contiguous array backed by buffer ``name``.
+
+        Args:
+            name (str): Name of the buffer.
+            shape (tuple[int, ...]): Shape of the array.
+            dtype (npt.DTypeLike): Type of the array.
+
+        Returns:
+            np.ndarray: View into the buffer, valid until the same name is requested again.
+        """
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape, dtype=np.intp)) * dtype.itemsize
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.nbytes < size:
+            buffer = self._buffers[name] = np.empty(size, dtype=np.uint8)
+        return buffer[:size].view(dtype).reshape(shape)
+
+
+class Workspace:
+    """Scratch memory shared by repeated resize calls.
+
+    Tiles computed concurrently each take their own :class:`ScratchBuffers`,
+    so one workspace can serve ``workers > 1`` and several threads at once.
+
+    Example:
+        >>> workspace = Workspace()
+        >>> out = np.empty((1080, 1920, 3), dtype=np.uint8)
+        >>> for frame in frames:  # doctest: +SKIP
+        ...     lanczos_interpolation(frame, 1080, 1920, out=out, workspace=workspace)
+    """
+
+    def __init__(self) -> None:
+        """Creates an empty workspace; buffers are allocated on first use."""
+        self._free: list[ScratchBuffers] = []
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """int: Memory held by all idle scratch buffers."""
+        with self._lock:
+            return sum(scratch.nbytes for scratch in self._free)
+
+    @contextmanager
+    def scratch(self) -> Iterator[ScratchBuffers]:
+        """Lends a set of scratch buffers for the duration of the ``with`` block."""
+        with self._lock:
+            scratch = self._free.pop() if self._free else ScratchBuffers()
+        try:
+            yield scratch
+        finally:
+            with self._lock:
+                self._free.append(scratch)
+
+    def clear(self) -> None:
+        """Releases all buffers that are not in use."""
+        with self._lock:
+            self._free.clear()
@@ -10,6 +10,14 @@ def tests(session):
     session.run("poetry", "run", "pytest", external=True)
 
 
+@nox.session(python=PYTHON_VERSION)
+def benchmarks(session):
+    """Run the benchmarks and compare them with the stored baselines."""
+    session.run("poetry", "install", external=True)
+    session.run("poetry", "run", "python", "benchmarks/bench_startup.py", external=True)
+    session.run("poetry", "run", "python", "benchmarks/bench_methods.py", *session.posargs, external=True)
+
+
 @nox.session(python=PYTHON_VERSION)
 def linting(session):
     """Run ruff for code style."""
@@ -0,0 +1,18 @@
+from pathlib import Path
+
+import pytest
+
+from methods import registry as registry_module
+
+
+@pytest.fixture(scope="session")
+def _cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    return tmp_path_factory.mktemp("cache")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_calibration(_cache_dir: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keeps backend calibrations, also those of CLI subprocesses, out of the user's cache."""
+    monkeypatch.setenv("IITP_INTERPOLATIONS_CACHE", str(_cache_dir))
+    monkeypatch.setattr(registry_module, "CACHE_DIR", _cache_dir)
+    monkeypatch.setattr(registry_module.registry, "calibration_path", _cache_dir / "calibration.json")
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from methods.bilinear import bilinear_interpolation
+from methods.bilinear import FRAC_BITS, bilinear_interpolation
 
 
 def test_bilinear_grayscale_upscale() -> None:
@@ -59,3 +59,62 @@ def test_bilinear_empty_image_shape_raises(empty_shape: tuple[int, int]) -> None
     image = np.zeros(empty_shape, dtype=np.uint8)
     with pytest.raises(ValueError, match="Empty image."):
         bilinear_interpolation(image, 4, 4)
+
+
+@pytest.mark.parametrize("new_shape", [(0, 4), (4, 0), (-1, 4)])
+def test_bilinear_invalid_output_shape_raises(new_shape: tuple[int, int]) -> None:
+    image = np.zeros((5, 5), dtype=np.uint8)
+    with pytest.raises(ValueError, match="Invalid image or output dimensions"):
+        bilinear_interpolation(image, *new_shape)
+
+
+def test_bilinear_rgba_matches_per_channel() -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(9, 11, 4)).astype(np.uint8)
+
+    result = bilinear_interpolation(image, 20, 7)
+
+    assert result.shape == (20, 7, 4)
+    for c in range(4):
+        assert np.array_equal(result[..., c], bilinear_interpolation(np.ascontiguousarray(image[..., c]), 20, 7))
+
+
+@pytest.mark.parametrize("frac_bits", FRAC_BITS)
+def test_bilinear_fixed_point_matches_float(frac_bits: int) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(31, 27, 3)).astype(np.uint8)
+
+    expected = bilinear_interpolation(image, 50, 13)
+    result = bilinear_interpolation(image, 50, 13, frac_bits=frac_bits)
+
+    assert result.dtype == np.uint8
+    assert np.abs(result.astype(int) - expected).max() <= 1
+
+
+@pytest.mark.parametrize("frac_bits", [None, *FRAC_BITS])
+def test_bilinear_keeps_16_bit_range(frac_bits: int | None) -> None:
+    image = np.array([[0, 65535], [65535, 0]], dtype=np.uint16)
+
+    result = bilinear_interpolation(image, 3, 3, frac_bits=frac_bits)
+
+    assert result.dtype == np.uint16
+    assert result[0, 2] == 65535
+    assert abs(int(result[1, 1]) - 32767) <= 1
+
+
+@pytest.mark.parametrize("frac_bits", FRAC_BITS)
+def test_bilinear_fixed_point_truncates_negative_values_like_float(frac_bits: int) -> None:
+    # Weights of 0.5 are exact in fixed point, so both paths compute -1.5 and 1.5
+    image = np.array([[-3, 0, 3]], dtype=np.int16)
+
+    result = bilinear_interpolation(image, 1, 5, frac_bits=frac_bits)
+
+    assert result.dtype == np.int16
+    assert result.tolist() == bilinear_interpolation(image, 1, 5).tolist() == [[-3, -1, 0, 1, 3]]
+
+
+def test_bilinear_invalid_frac_bits_raise() -> None:
+    image = np.zeros((4, 4), dtype=np.uint8)
+
+    with pytest.raises(ValueError, match="frac_bits"):
+        bilinear_interpolation(image, 2, 2, frac_bits=4)
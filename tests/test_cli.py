@@ -0,0 +1,231 @@
+import io
+import json
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+CLI = Path(__file__).resolve().parent.parent / "iitp-interpolations.py"
+
+
+def test_cli_does_not_import_heavy_modules_at_startup() -> None:
+    code = (
+        "import importlib.util, sys\n"
+        f"spec = importlib.util.spec_from_file_location('cli', {str(CLI)!r})\n"
+        "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+        "heavy = ('matplotlib', 'sklearn', 'tqdm', 'asyncio', 'methods.server', 'methods.pipeline', 'methods.registry')\n"
+        "print(' '.join(m for m in heavy if m in sys.modules))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True)
+
+    assert result.stdout.strip() == ""
+
+
+def test_cli_resize_headless(tmp_path: Path) -> None:
+    image = CLI.parent / "examples" / "noise.jpg"
+    out = tmp_path / "out.png"
+
+    subprocess.run(
+        [sys.executable, str(CLI), str(image), "0.5", "0.5", "--no-show", "--save", str(out)],
+        check=True,
+        capture_output=True,
+    )
+
+    assert out.exists()
+
+
+def test_cli_rejects_unknown_method() -> None:
+    image = CLI.parent / "examples" / "noise.jpg"
+
+    result = subprocess.run(
+        [sys.executable, str(CLI), str(image), "0.5", "0.5", "--no-show", "-m", "Cubic"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 2
+    assert "Unknown method 'cubic'" in result.stderr
+
+
+def test_cli_resize_1_bit_image(tmp_path: Path) -> None:
+    Image.fromarray(np.eye(8, dtype=bool)).convert("1").save(tmp_path / "in.png")
+    out = tmp_path / "out.npy"
+
+    subprocess.run(
+        [sys.executable, str(CLI), str(tmp_path / "in.png"), "2", "2", "--no-show", "--save", str(out)],
+        check=True,
+        capture_output=True,
+    )
+
+    result = np.load(out)
+    assert result.shape == (16, 16)
+    assert result.max() == 1
+
+
+def test_cli_reports_unsupported_images_without_a_traceback(tmp_path: Path) -> None:
+    np.save(tmp_path / "in.npy", np.zeros((4, 4), dtype=np.complex64))
+
+    result = subprocess.run(
+        [sys.executable, str(CLI), str(tmp_path / "in.npy"), "2", "2", "--no-show", "--save", str(tmp_path / "out.npy")],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 1
+    assert "Error: Method 'bilinear' does not support complex64 images" in result.stderr
+    assert "Traceback" not in result.stderr
+
+
+def test_cli_resize_npy_to_npy(tmp_path: Path) -> None:
+    image = np.linspace(0, 1, 40 * 30, dtype=np.float32).reshape(40, 30)
+    np.save(tmp_path / "in.npy", image)
+    out = tmp_path / "out.npy"
+
+    subprocess.run(
+        [sys.executable, str(CLI), str(tmp_path / "in.npy"), "0.5", "2", "--no-show", "--save", str(out)],
+        check=True,
+        capture_output=True,
+    )
+
+    result = np.load(out)
+    assert result.shape == (20, 60)
+    assert result.dtype == np.float32
+    assert np.isclose(result[-1, -1], 1)
+
+
+def test_cli_resize_raw_input(tmp_path: Path) -> None:
+    np.full((10, 8, 3), 7, dtype=np.uint16).tofile(tmp_path / "in.bin")
+    out = tmp_path / "out.npy"
+
+    subprocess.run(
+        [
+            sys.executable,
+            str(CLI),
+            str(tmp_path / "in.bin"),
+            "2",
+            "2",
+            "--raw-shape",
+            "10,8,3",
+            "--raw-dtype",
+            "uint16",
+            "--max-memory",
+            "1",
+            "--no-show",
+            "--save",
+            str(out),
+        ],
+        check=True,
+        capture_output=True,
+    )
+
+    result = np.load(out)
+    assert result.shape == (20, 16, 3)
+    assert np.all(result == 7)
+
+
+def test_cli_sequence_npy_stack(tmp_path: Path) -> None:
+    frames = np.arange(4 * 6 * 5, dtype=np.uint8).reshape(4, 6, 5)
+    np.save(tmp_path / "in.npy", frames)
+    out = tmp_path / "out.npy"
+
+    result = subprocess.run(
+        [sys.executable, str(CLI), "sequence", str(tmp_path / "in.npy"), "2", "2", "-o", str(out)],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+    assert "frames/s" in result.stdout
+    assert np.load(out).shape == (4, 12, 10)
+
+
+def test_cli_sequence_frame_directory(tmp_path: Path) -> None:
+    (tmp_path / "in").mkdir()
+    for index in range(3):
+        Image.fromarray(np.full((8, 8, 3), index * 50, dtype=np.uint8)).save(tmp_path / "in" / f"f{index}.png")
+
+    subprocess.run(
+        [sys.executable, str(CLI), "sequence", str(tmp_path / "in"), "0.5", "0.5", "-o", str(tmp_path / "out")],
+        check=True,
+        capture_output=True,
+    )
+
+    assert sorted(path.name for path in (tmp_path / "out").iterdir()) == ["f0.png", "f1.png", "f2.png"]
+    assert np.asarray(Image.open(tmp_path / "out" / "f2.png")).max() == 100
+
+
+def test_cli_report(tmp_path: Path) -> None:
+    image = CLI.parent / "examples" / "noise.jpg"
+    report = tmp_path / "report.json"
+
+    subprocess.run(
+        [sys.executable, str(CLI), str(image), "0.25", "0.25", "--no-show", "--report", str(report)],
+        check=True,
+        capture_output=True,
+    )
+
+    assert {row["method"] for row in json.loads(report.read_text())} == {"bilinear", "lanczos", "spline"}
+
+
+def test_cli_pyramid(tmp_path: Path) -> None:
+    Image.fromarray(np.full((40, 60, 3), 80, dtype=np.uint8)).save(tmp_path / "in.png")
+
+    subprocess.run(
+        [sys.executable, str(CLI), "pyramid", str(tmp_path / "in.png"), "-s", "0.5", "-s", "0.25", "-w", "12", "-o", str(tmp_path / "out")],
+        check=True,
+        capture_output=True,
+    )
+
+    names = sorted(path.name for path in (tmp_path / "out").iterdir())
+    assert names == ["in_12x8.png", "in_15x10.png", "in_30x20.png"]
+    assert np.abs(np.asarray(Image.open(tmp_path / "out" / "in_12x8.png")).astype(int) - 80).max() <= 1
+
+
+def test_cli_serve(tmp_path: Path) -> None:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    np.save(tmp_path / "in.npy", np.zeros((8, 8), dtype=np.uint8))
+    process = subprocess.Popen([sys.executable, str(CLI), "serve", "--port", str(port), "--root", str(tmp_path)], stdout=subprocess.PIPE)
+    try:
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{port}/resize?height=4&width=6&path=in.npy",
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=10) as response:
+            body = response.read()
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+    assert np.load(io.BytesIO(body)).shape == (4, 6)
+
+
+def test_cli_cache_dir(tmp_path: Path) -> None:
+    image = CLI.parent / "examples" / "noise.jpg"
+    cache = tmp_path / "cache"
+    outputs = [tmp_path / "first.png", tmp_path / "second.png"]
+
+    for out in outputs:
+        subprocess.run(
+            [sys.executable, str(CLI), str(image), "0.5", "0.5", "--no-show", "--save", str(out), "--cache-dir", str(cache)],
+            check=True,
+            capture_output=True,
+        )
+
+    assert len(list((cache / "outputs").rglob("*.npy"))) == 1
+    assert len(list((cache / "plans").rglob("*.npz"))) == 1
+    assert np.array_equal(np.asarray(Image.open(outputs[0])), np.asarray(Image.open(outputs[1])))
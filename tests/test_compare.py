@@ -0,0 +1,85 @@
+import csv
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from methods.bilinear import bilinear_interpolation
+from methods.compare import MethodReport, compare, compare_all, quality_report, write_report
+from methods.spline import spline_interpolation
+
+
+def _reference(a: np.ndarray, b: np.ndarray, peak: float) -> tuple[float, float, float, float]:
+    diff = a.astype(np.float64) - b
+    mse = np.mean(diff**2)
+    return np.mean(np.abs(diff)), np.sqrt(mse), 10 * np.log10(peak**2 / mse), np.abs(diff).max()
+
+
+@pytest.mark.parametrize("block_rows", [1, 7, 256])
+def test_compare_all_matches_reference(block_rows: int) -> None:
+    rng = np.random.default_rng(0)
+    images = {name: rng.integers(0, 256, size=(33, 20, 3)).astype(np.uint8) for name in "abc"}
+
+    metrics = compare_all(images, block_rows=block_rows)
+
+    assert list(metrics) == [("a", "b"), ("a", "c"), ("b", "c")]
+    for (first, second), result in metrics.items():
+        assert np.allclose(result, _reference(images[first], images[second], 255))
+
+
+def test_compare_identical_images() -> None:
+    image = np.ones((4, 4), dtype=np.float32)
+
+    result = compare(image, image)
+
+    assert result.mae == 0
+    assert math.isinf(result.psnr)
+
+
+@pytest.mark.parametrize(("scale", "peak"), [(1, 1.0), (255, 255.0), (65535, 65535.0), (1e6, 1e6)])
+def test_compare_float_peak_follows_the_data_range(scale: float, peak: float) -> None:
+    rng = np.random.default_rng(0)
+    a = rng.uniform(0, scale, size=(10, 12))
+    b = rng.uniform(0, scale, size=(10, 12))
+    a[0, 0] = scale
+
+    assert np.isclose(compare(a, b).psnr, _reference(a, b, peak)[2])
+    assert np.isclose(compare(a, b, peak=2.0).psnr, _reference(a, b, 2.0)[2])
+
+
+def test_compare_shape_mismatch_raises() -> None:
+    with pytest.raises(ValueError, match="same shape"):
+        compare(np.zeros((2, 2)), np.zeros((2, 3)))
+
+
+def test_quality_report_round_trips_each_method() -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(20, 24, 3)).astype(np.uint8)
+
+    reports = quality_report(
+        image,
+        40,
+        48,
+        {"bilinear": bilinear_interpolation, "spline": spline_interpolation},
+        repeat=1,
+    )
+
+    assert [report.method for report in reports] == ["bilinear", "spline"]
+    assert all(report.seconds > 0 for report in reports)
+    expected = compare(image, bilinear_interpolation(bilinear_interpolation(image, 40, 48), 20, 24))
+    assert reports[0].psnr == expected.psnr
+
+
+def test_write_report_json_and_csv(tmp_path: Path) -> None:
+    reports = [MethodReport("bilinear", 0.5, 1.0, 2.0, 30.0, 4.0), MethodReport("spline", 0.7, 0, 0, math.inf, 0)]
+
+    write_report(reports, tmp_path / "report.json")
+    write_report(reports, tmp_path / "report.csv")
+
+    rows = json.loads((tmp_path / "report.json").read_text())
+    assert rows[0] == {"method": "bilinear", "seconds": 0.5, "mae": 1.0, "rmse": 2.0, "psnr": 30.0, "max_abs": 4.0}
+    assert rows[1]["psnr"] is None
+    with (tmp_path / "report.csv").open() as file:
+        assert [row["method"] for row in csv.DictReader(file)] == ["bilinear", "spline"]
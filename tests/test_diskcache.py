@@ -0,0 +1,157 @@
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from methods.bilinear import bilinear_interpolation
+from methods.diskcache import STALE_SECONDS, DiskCache
+from methods.lanczos import lanczos_interpolation
+from methods.plan import PlanCache
+from methods.spline import _spline_taps
+
+
+def _image(seed: int = 0, shape: tuple[int, ...] = (20, 30, 3)) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, size=shape).astype(np.uint8)
+
+
+def test_key_depends_on_content_and_params(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    image = _image()
+
+    key = cache.key(image, method="bilinear", height=10, width=10)
+
+    assert cache.key(image.copy(), method="bilinear", height=10, width=10) == key
+    assert cache.key(np.asfortranarray(image), method="bilinear", height=10, width=10) == key
+    assert cache.key(_image(1), method="bilinear", height=10, width=10) != key
+    assert cache.key(image, method="spline", height=10, width=10) != key
+    assert cache.key(image, method="bilinear", height=10, width=11) != key
+    assert cache.key(image.view(np.int8), method="bilinear", height=10, width=10) != key
+    assert cache.key(image.reshape(30, 20, 3), method="bilinear", height=10, width=10) != key
+
+
+def test_store_and_load(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    array = _image()
+
+    assert cache.load("0" * 64) is None
+    cache.store("ab" * 32, array)
+
+    assert np.array_equal(cache.load("ab" * 32), array)
+    assert not list(tmp_path.rglob(".tmp-*"))
+
+
+def test_wrap_returns_cached_result(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    image = _image()
+    calls = []
+
+    def resize(image: np.ndarray, new_height: int, new_width: int, **options: object) -> np.ndarray:
+        calls.append(options)
+        return lanczos_interpolation(image, new_height, new_width, **options)
+
+    cached = cache.wrap("lanczos", resize)
+    first = cached(image, 40, 50, a=2)
+    second = cached(image, 40, 50, a=2, workers=2, tile_shape=(8, 8))
+    out = np.empty_like(first)
+    third = cached(image, 40, 50, a=2, out=out)
+    cached(image, 40, 50, a=3)
+
+    assert len(calls) == 2
+    assert np.array_equal(first, lanczos_interpolation(image, 40, 50, a=2))
+    assert np.array_equal(second, first)
+    assert third is out
+    assert np.array_equal(out, first)
+
+
+def test_lru_eviction_keeps_recently_used_entries(tmp_path: Path) -> None:
+    array = np.zeros(1000, dtype=np.uint8)
+    cache = DiskCache(tmp_path, max_bytes=3500)
+    keys = [f"{index:064x}" for index in range(3)]
+    for age, key in enumerate(keys):
+        cache.store(key, array)
+        path = next(tmp_path.rglob(f"{key}.npy"))
+        os.utime(path, (time.time() - 100 + age, time.time() - 100 + age))
+
+    # Reading the oldest entry makes it the most recently used one
+    assert cache.load(keys[0]) is not None
+    cache.store(f"{3:064x}", array)
+
+    assert cache.load(keys[0]) is not None
+    assert cache.load(keys[1]) is None
+    assert cache.load(keys[2]) is not None
+    assert cache.nbytes <= 3500
+
+
+def test_oversized_arrays_are_not_stored(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path, max_bytes=100)
+
+    cache.store("cd" * 32, np.zeros(1000, dtype=np.uint8))
+
+    assert cache.load("cd" * 32) is None
+
+
+def test_stale_temporary_files_are_removed(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    cache.store("ef" * 32, np.zeros(10))
+    stale = tmp_path / "outputs" / "ef" / ".tmp-crashed.npy"
+    fresh = tmp_path / "outputs" / "ef" / ".tmp-writing.npy"
+    stale.write_bytes(b"partial")
+    fresh.write_bytes(b"partial")
+    os.utime(stale, (time.time() - 2 * STALE_SECONDS,) * 2)
+
+    cache.evict()
+
+    assert not stale.exists()
+    assert fresh.exists()
+
+
+def test_corrupt_entry_is_a_miss(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    cache.store("12" * 32, np.zeros(10))
+    next(tmp_path.rglob("*.npy")).write_bytes(b"garbage")
+
+    assert cache.load("12" * 32) is None
+
+
+def test_clear(tmp_path: Path) -> None:
+    cache = DiskCache(tmp_path)
+    cache.store("34" * 32, np.zeros(10))
+
+    cache.clear()
+
+    assert cache.nbytes == 0
+
+
+@pytest.mark.parametrize("params", [{"antialias": False}, {"antialias": True}])
+def test_plans_round_trip_through_the_store(tmp_path: Path, params: dict) -> None:
+    first = PlanCache(store=DiskCache(tmp_path))
+    plan = first.get("spline", (20, 30), (7, 45), _spline_taps, **params)
+
+    # A new process starts with an empty in-memory cache
+    second = PlanCache(store=DiskCache(tmp_path))
+    calls = []
+
+    def build(*args: object, **kwargs: object) -> tuple:
+        calls.append(args)
+        return _spline_taps(*args, **kwargs)
+
+    loaded = second.get("spline", (20, 30), (7, 45), build, **params)
+
+    assert calls == []
+    for expected, taps in zip(plan, loaded, strict=True):
+        assert np.array_equal(taps.indices, expected.indices)
+        assert np.array_equal(taps.weights, expected.weights)
+        assert taps.frac_bits == expected.frac_bits
+        assert not taps.weights.flags.writeable
+
+
+def test_results_match_uncached_resize(tmp_path: Path) -> None:
+    image = _image(shape=(30, 40))
+    cached = DiskCache(tmp_path).wrap("bilinear", bilinear_interpolation)
+
+    expected = bilinear_interpolation(image, 13, 17, frac_bits=8)
+
+    assert np.array_equal(cached(image, 13, 17, frac_bits=8), expected)
+    assert np.array_equal(DiskCache(tmp_path).wrap("bilinear", bilinear_interpolation)(image, 13, 17, frac_bits=8), expected)
@@ -0,0 +1,73 @@
+import logging
+from collections.abc import Callable
+
+import numpy as np
+import pytest
+
+from methods.bilinear import bilinear_interpolation
+from methods.hooks import STAGES, LoggingHooks, MetricsRecorder, TqdmProgress
+from methods.lanczos import lanczos_interpolation
+from methods.spline import spline_interpolation
+
+METHODS = [bilinear_interpolation, lanczos_interpolation, spline_interpolation]
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize(("tile_shape", "workers"), [(None, 1), ((4, 5), 1), (None, 3), ((3, 7), 2)])
+def test_metrics_recorder_sees_every_stage_row_and_byte(
+    method: Callable[..., np.ndarray],
+    tile_shape: tuple[int, int] | None,
+    workers: int,
+) -> None:
+    image = np.zeros((10, 12, 3), dtype=np.uint8)
+    recorder = MetricsRecorder()
+
+    result = method(image, 21, 17, tile_shape=tile_shape, workers=workers, hooks=recorder)
+
+    assert set(recorder.seconds) == set(STAGES)
+    assert all(seconds >= 0 for seconds in recorder.seconds.values())
+    assert recorder.rows == 21
+    assert recorder.bytes_written == result.nbytes
+    assert recorder.bytes_read >= image.nbytes
+
+
+def test_methods_are_silent_by_default(capsys: pytest.CaptureFixture[str]) -> None:
+    image = np.zeros((4, 4), dtype=np.uint8)
+
+    for method in METHODS:
+        method(image, 8, 8)
+
+    assert capsys.readouterr() == ("", "")
+
+
+def test_logging_hooks_log_once_per_resize(caplog: pytest.LogCaptureFixture) -> None:
+    image = np.zeros((6, 6), dtype=np.uint8)
+
+    with caplog.at_level(logging.DEBUG, logger="methods"):
+        spline_interpolation(image, 12, 12, tile_shape=(5, 5), hooks=LoggingHooks())
+
+    assert len(caplog.records) == 1
+    assert "Resized 12 rows" in caplog.text
+
+
+def test_logging_hooks_log_once_per_resize_when_reused(caplog: pytest.LogCaptureFixture) -> None:
+    image = np.zeros((6, 6), dtype=np.uint8)
+    hooks = LoggingHooks()
+
+    with caplog.at_level(logging.DEBUG, logger="methods"):
+        for new_size in (12, 9, 12):
+            spline_interpolation(image, new_size, new_size, tile_shape=(5, 5), hooks=hooks)
+
+    assert [record.args[0] for record in caplog.records] == [12, 9, 12]
+    assert sum(record.args[2] for record in caplog.records) == hooks.bytes_read
+    assert hooks.rows == 33
+
+
+def test_tqdm_progress_counts_rows(capsys: pytest.CaptureFixture[str]) -> None:
+    image = np.zeros((6, 6), dtype=np.uint8)
+
+    lanczos_interpolation(image, 12, 12, tile_shape=(5, 12), hooks=TqdmProgress("Lanczos"))
+
+    err = capsys.readouterr().err
+    assert "Lanczos" in err
+    assert "12/12" in err
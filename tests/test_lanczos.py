@@ -1,7 +1,13 @@
 import numpy as np
 import pytest
 
-from methods.lanczos import lanczos_interpolation
+from methods.lanczos import (
+    LUT_FRAC_BITS,
+    _lanczos_taps,
+    lanczos_interpolation,
+    lanczos_kernel,
+    lanczos_lut_max_error,
+)
 
 
 def test_lanczos_grayscale_shape_and_values() -> None:
@@ -57,3 +63,95 @@ def test_lanczos_same_size_returns_similar_image() -> None:
     result = lanczos_interpolation(image, 2, 2, a=3)
     assert result.shape == (2, 2)
     assert np.allclose(result, image, atol=5)
+
+
+def _reference_lanczos(image: np.ndarray, new_h: int, new_w: int, a: int) -> np.ndarray:
+    # Попиксельная реализация, с которой сверяется векторизованная версия
+    h, w = image.shape
+    out = np.zeros((new_h, new_w), dtype=np.float32)
+    for i, x in enumerate(np.linspace(0, h - 1, new_h)):
+        x_range = np.clip(np.arange(int(np.floor(x)) - a + 1, int(np.floor(x)) + a), 0, h - 1)
+        wx = lanczos_kernel(x - x_range[:, None], a)
+        for j, y in enumerate(np.linspace(0, w - 1, new_w)):
+            y_range = np.clip(np.arange(int(np.floor(y)) - a + 1, int(np.floor(y)) + a), 0, w - 1)
+            weights = wx * lanczos_kernel(y - y_range, a)[None, :]
+            norm = np.sum(weights)
+            out[i, j] = np.sum(image[np.ix_(x_range, y_range)] * weights) / norm if norm != 0 else 0.0
+    return np.clip(out, 0, 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("a", [2, 3])
+@pytest.mark.parametrize(("new_h", "new_w"), [(23, 31), (7, 5), (12, 40)])
+def test_lanczos_matches_reference(a: int, new_h: int, new_w: int) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(13, 17)).astype(np.uint8)
+
+    result = lanczos_interpolation(image, new_h, new_w, a=a)
+    expected = _reference_lanczos(image, new_h, new_w, a)
+
+    assert result.shape == expected.shape
+    assert np.abs(result.astype(int) - expected.astype(int)).max() <= 1
+
+
+def test_lanczos_rgba_matches_per_channel() -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(9, 11, 4)).astype(np.uint8)
+
+    result = lanczos_interpolation(image, 20, 7)
+
+    assert result.shape == (20, 7, 4)
+    for c in range(4):
+        assert np.array_equal(result[..., c], lanczos_interpolation(np.ascontiguousarray(image[..., c]), 20, 7))
+
+
+@pytest.mark.parametrize("a", [2, 3])
+@pytest.mark.parametrize("dtype", [np.uint8, np.float32])
+def test_lanczos_lut_kernel_within_one_of_exact(a: int, dtype: type) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(40, 50, 3)).astype(dtype)
+
+    exact = lanczos_interpolation(image, 97, 23, a=a)
+    lut = lanczos_interpolation(image, 97, 23, a=a, kernel="lut")
+
+    assert lut.dtype == np.uint8
+    assert np.abs(lut.astype(int) - exact.astype(int)).max() <= 1
+
+
+@pytest.mark.parametrize("antialias", [False, True])
+@pytest.mark.parametrize("dtype", [np.uint16, np.int16])
+def test_lanczos_lut_error_on_16_bit_images(antialias: bool, dtype: type) -> None:
+    info = np.iinfo(dtype)
+    image = np.random.default_rng(0).integers(info.min, info.max, size=(60, 70, 3), endpoint=True).astype(dtype)
+
+    for shape in [(131, 97), (23, 41)]:
+        exact = lanczos_interpolation(image, *shape, antialias=antialias)
+        lut = lanczos_interpolation(image, *shape, kernel="lut", antialias=antialias)
+
+        assert lut.dtype == dtype
+        assert np.abs(lut.astype(int) - exact.astype(int)).max() <= 2**-9 * (int(info.max) - int(info.min))
+
+
+def test_lanczos_lut_weights_are_normalized_fixed_point() -> None:
+    indices, weights, frac_bits = _lanczos_taps(37, 101, 3, lut_resolution=1024)
+
+    assert frac_bits == LUT_FRAC_BITS
+    assert weights.dtype == np.int16
+    assert indices.shape == weights.shape
+    assert np.all(weights.sum(axis=1, dtype=np.int64) == 1 << LUT_FRAC_BITS)
+
+
+def test_lanczos_lut_keeps_flat_images_flat() -> None:
+    image = np.full((15, 15), 200, dtype=np.uint8)
+
+    assert np.all(lanczos_interpolation(image, 41, 7, kernel="lut") == 200)
+
+
+@pytest.mark.parametrize("a", [2, 3, 4])
+def test_lanczos_lut_max_error_is_small(a: int) -> None:
+    assert lanczos_lut_max_error(a) < 1e-3
+    assert lanczos_lut_max_error(a, resolution=256) > lanczos_lut_max_error(a)
+
+
+def test_lanczos_unknown_kernel_raises() -> None:
+    with pytest.raises(ValueError, match="Unknown Lanczos kernel"):
+        lanczos_interpolation(np.zeros((4, 4), dtype=np.uint8), 8, 8, kernel="fast")
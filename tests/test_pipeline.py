@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from methods.lanczos import lanczos_interpolation
+from methods.pipeline import BatchStats, collect_inputs, run_batch
+
+
+def _write_images(directory: Path, count: int) -> list[Path]:
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        path = directory / f"image_{i}.png"
+        Image.fromarray(rng.integers(0, 256, size=(12, 10, 3)).astype(np.uint8)).save(path)
+        paths.append(path)
+    return paths
+
+
+def _halve(image: np.ndarray) -> np.ndarray:
+    return lanczos_interpolation(image, image.shape[0] // 2, image.shape[1] // 2)
+
+
+def test_run_batch_resizes_all_images(tmp_path: Path) -> None:
+    paths = _write_images(tmp_path, 5)
+    out_dir = tmp_path / "out"
+
+    stats = run_batch(paths, out_dir, _halve, workers=2, queue_size=1)
+
+    assert stats.processed == 5
+    assert stats.skipped == 0
+    assert stats.failed == []
+    assert stats.bytes_in == sum(p.stat().st_size for p in paths)
+    for path in paths:
+        result = np.asarray(Image.open(out_dir / path.name))
+        assert np.array_equal(result, _halve(np.asarray(Image.open(path))))
+    assert "5 images" in stats.summary()
+
+
+def test_run_batch_skips_existing_outputs(tmp_path: Path) -> None:
+    paths = _write_images(tmp_path, 3)
+    out_dir = tmp_path / "out"
+    run_batch(paths[:1], out_dir, _halve)
+
+    stats = run_batch(paths, out_dir, _halve, suffix=".bmp")
+    assert stats.processed == 3
+
+    stats = run_batch(paths, out_dir, _halve, suffix=".bmp")
+    assert stats.processed == 0
+    assert stats.skipped == 3
+    assert sorted(p.name for p in out_dir.iterdir()) == sorted(
+        [paths[0].name] + [p.stem + ".bmp" for p in paths],
+    )
+
+
+def test_run_batch_reports_failures_and_continues(tmp_path: Path) -> None:
+    paths = _write_images(tmp_path, 2)
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+
+    stats = run_batch([broken, *paths], tmp_path / "out", _halve)
+
+    assert stats.processed == 2
+    assert [path for path, _ in stats.failed] == [broken]
+    assert not (tmp_path / "out" / "broken.png").exists()
+
+
+def test_collect_inputs_expands_directories_and_globs(tmp_path: Path) -> None:
+    paths = _write_images(tmp_path, 3)
+    (tmp_path / "notes.txt").write_text("skip me")
+
+    assert collect_inputs([str(tmp_path)]) == paths
+    assert collect_inputs([str(tmp_path / "image_[01].png")]) == paths[:2]
+    assert collect_inputs([str(paths[2]), str(tmp_path)]) == [paths[2], paths[0], paths[1]]
+
+
+def test_run_batch_refuses_colliding_output_names(tmp_path: Path) -> None:
+    first = _write_images(tmp_path, 1)[0]
+    (tmp_path / "other").mkdir()
+    second = _write_images(tmp_path / "other", 1)[0]
+
+    stats = run_batch([first, second], tmp_path / "out", _halve)
+
+    assert stats.processed == 1
+    assert [path for path, _ in stats.failed] == [second]
+    assert "already written" in stats.failed[0][1]
+    result = np.asarray(Image.open(tmp_path / "out" / first.name))
+    assert np.array_equal(result, _halve(np.asarray(Image.open(first))))
+
+
+def test_run_batch_removes_partial_output_of_failed_encode(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    paths = _write_images(tmp_path, 1)
+
+    def replace(self: Path, target: Path) -> None:
+        msg = "disk full"
+        raise OSError(msg)
+
+    monkeypatch.setattr(Path, "replace", replace)
+    stats = run_batch(paths, tmp_path / "out", _halve)
+
+    assert [message for _, message in stats.failed] == ["disk full"]
+    assert list((tmp_path / "out").iterdir()) == []
+
+
+def test_batch_stats_summary_reports_read_and_written_throughput() -> None:
+    stats = BatchStats(processed=2, bytes_in=4 * 2**20, bytes_out=2**20, seconds=2.0)
+
+    assert stats.summary().endswith("1.00 images/s, 2.00 MB/s read, 0.50 MB/s written")
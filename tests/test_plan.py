@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from methods.lanczos import _lanczos_taps, lanczos_interpolation
+from methods.plan import PlanCache, plan_cache
+
+
+def _taps(src_len: int, dst_len: int, scale: float = 1.0) -> tuple[np.ndarray, np.ndarray]:
+    return np.zeros((dst_len, 2), dtype=np.intp), np.full((dst_len, 2), scale)
+
+
+def test_plan_cache_counts_hits_and_misses() -> None:
+    cache = PlanCache()
+
+    first = cache.get("test", (4, 4), (8, 8), _taps)
+    second = cache.get("test", (4, 4), (8, 8), _taps)
+    cache.get("test", (4, 4), (8, 8), _taps, scale=2.0)
+
+    assert first is second
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (1, 2, 2)
+    assert info.nbytes == 2 * first.nbytes
+
+
+def test_plan_cache_evicts_least_recently_used() -> None:
+    cache = PlanCache(maxsize=2)
+
+    a = cache.get("test", (4, 4), (1, 1), _taps)
+    cache.get("test", (4, 4), (2, 2), _taps)
+    cache.get("test", (4, 4), (1, 1), _taps)
+    cache.get("test", (4, 4), (3, 3), _taps)
+
+    assert cache.get("test", (4, 4), (1, 1), _taps) is a
+    assert cache.info().currsize == 2
+    assert cache.info().misses == 3
+
+
+def test_plan_cache_respects_byte_budget() -> None:
+    plan_bytes = PlanCache().get("test", (4, 4), (10, 10), _taps).nbytes
+    cache = PlanCache(max_bytes=plan_bytes)
+
+    cache.get("test", (4, 4), (10, 10), _taps)
+    assert cache.info().nbytes == plan_bytes
+
+    cache.get("test", (4, 4), (10, 10), _taps, scale=2.0)
+    assert cache.info().currsize == 1
+
+    cache.get("test", (4, 4), (100, 100), _taps)
+    assert cache.info().currsize == 1
+
+    cache.configure(max_bytes=0)
+    assert cache.info().currsize == 0
+
+
+def test_plan_tables_are_read_only() -> None:
+    plan = PlanCache().get("lanczos", (5, 5), (9, 9), _lanczos_taps, a=2)
+
+    with pytest.raises(ValueError, match="read-only"):
+        plan.rows.weights[0, 0] = 1.0
+
+
+def test_interpolation_reuses_cached_plan() -> None:
+    plan_cache.clear()
+    image = np.arange(30, dtype=np.uint8).reshape(5, 6)
+
+    first = lanczos_interpolation(image, 11, 13, a=2)
+    second = lanczos_interpolation(image, 11, 13, a=2)
+
+    assert np.array_equal(first, second)
+    assert plan_cache.info().hits == 1
+    assert plan_cache.info().misses == 1
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from methods.bilinear import bilinear_interpolation
+from methods.lanczos import lanczos_interpolation
+from methods.pyramid import SOURCE, build_pyramid, plan_pyramid, pyramid_sizes
+
+
+def _image(shape: tuple[int, ...] = (64, 96, 3)) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    ramp = np.linspace(0, 200, shape[1])[None, :, None]
+    return (rng.random(shape) * 40 + ramp.reshape(1, -1, *[1] * (len(shape) - 2))).astype(np.uint8)
+
+
+def test_pyramid_sizes() -> None:
+    sizes = pyramid_sizes((100, 200, 3), scales=[0.5, 0.25], widths=[50, 1])
+
+    assert sizes == [(50, 100), (25, 50), (25, 50), (1, 1)]
+
+
+def test_plan_uses_smallest_large_enough_level() -> None:
+    sizes = [(25, 50), (100, 200), (50, 100), (40, 90), (12, 25)]
+
+    parents = plan_pyramid((200, 400), sizes)
+
+    assert parents == [2, SOURCE, 1, 1, 0]
+
+
+def test_plan_resizes_upscales_from_source() -> None:
+    assert plan_pyramid((10, 10), [(20, 20), (8, 8)]) == [SOURCE, SOURCE]
+
+
+def test_plan_validates() -> None:
+    with pytest.raises(ValueError, match="min_ratio"):
+        plan_pyramid((10, 10), [(5, 5)], min_ratio=0.5)
+    with pytest.raises(ValueError, match="positive"):
+        plan_pyramid((10, 10), [(0, 5)])
+
+
+@pytest.mark.parametrize(("method", "func"), [("bilinear", bilinear_interpolation), ("lanczos", lanczos_interpolation)])
+def test_levels_from_source_match_direct_resize(method: str, func: object) -> None:
+    image = _image()
+
+    levels = build_pyramid(image, [(32, 48), (40, 70)], method)
+
+    assert np.array_equal(levels[0], func(image, 32, 48, antialias=True))
+    assert np.array_equal(levels[1], func(image, 40, 70, antialias=True))
+
+
+@pytest.mark.parametrize("method", ["bilinear", "spline", "lanczos"])
+def test_chained_levels_are_close_to_direct_resize(method: str) -> None:
+    image = _image()
+    sizes = pyramid_sizes(image.shape, scales=[0.5, 0.25, 0.125], widths=[20])
+
+    levels = build_pyramid(image, sizes, method, workers=3)
+    single = build_pyramid(image, sizes, method, min_ratio=1e9)
+
+    for level, direct, size in zip(levels, single, sizes, strict=True):
+        assert level.shape == (*size, 3)
+        assert level.dtype == np.uint8
+        assert np.abs(level.astype(int) - direct).mean() < 1
+
+
+def test_workers_do_not_change_result() -> None:
+    image = _image((50, 40))
+    sizes = [(25, 20), (12, 10), (20, 16), (6, 5)]
+
+    expected = build_pyramid(image, sizes, "spline")
+
+    for level, threaded in zip(expected, build_pyramid(image, sizes, "spline", workers=4), strict=True):
+        assert np.array_equal(level, threaded)
+
+
+def test_float_images() -> None:
+    image = _image((40, 40)).astype(np.float32) / 255
+
+    kept = build_pyramid(image, [(20, 20), (10, 10)], preserve_dtype=True, dtype=np.float32)
+
+    assert [level.dtype for level in kept] == [np.float32, np.float32]
+    assert build_pyramid(image, [(20, 20)])[0].dtype == np.uint8
+
+
+def test_invalid_method() -> None:
+    with pytest.raises(ValueError, match="Unknown method"):
+        build_pyramid(_image(), [(10, 10)], "nearest")
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from methods.lanczos import lanczos_interpolation
+from methods.raster import create_raster, is_mapped, open_raster
+
+
+def test_open_raster_maps_npy(tmp_path: Path) -> None:
+    image = np.arange(60, dtype=np.uint16).reshape(5, 4, 3)
+    np.save(tmp_path / "image.npy", image)
+
+    result = open_raster(tmp_path / "image.npy")
+
+    assert isinstance(result, np.memmap)
+    assert np.array_equal(result, image)
+
+
+def test_open_raster_maps_raw(tmp_path: Path) -> None:
+    image = np.arange(20, dtype=np.float32).reshape(4, 5)
+    image.tofile(tmp_path / "image.raw")
+
+    result = open_raster(tmp_path / "image.raw", raw_shape=(4, 5), raw_dtype="float32")
+
+    assert isinstance(result, np.memmap)
+    assert np.array_equal(result, image)
+
+
+def test_open_raster_raw_without_shape_raises(tmp_path: Path) -> None:
+    (tmp_path / "image.raw").write_bytes(bytes(16))
+
+    with pytest.raises(ValueError, match="shape"):
+        open_raster(tmp_path / "image.raw")
+
+
+def test_open_raster_decodes_other_formats(tmp_path: Path) -> None:
+    image = np.zeros((3, 4, 3), dtype=np.uint8)
+    Image.fromarray(image).save(tmp_path / "image.png")
+
+    result = open_raster(tmp_path / "image.png")
+
+    assert not isinstance(result, np.memmap)
+    assert np.array_equal(result, image)
+
+
+@pytest.mark.parametrize("name", ["out.npy", "out.raw"])
+def test_resize_between_memory_maps(tmp_path: Path, name: str) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(300, 200, 3)).astype(np.uint8)
+    np.save(tmp_path / "image.npy", image)
+    source = open_raster(tmp_path / "image.npy")
+    out = create_raster(tmp_path / name, (150, 400, 3), np.uint8)
+
+    lanczos_interpolation(source, 150, 400, out=out, max_memory=512 * 1024)
+    out.flush()
+
+    assert is_mapped(tmp_path / name)
+    written = np.load(tmp_path / name) if name.endswith(".npy") else np.fromfile(tmp_path / name, np.uint8)
+    assert np.array_equal(written.reshape(150, 400, 3), lanczos_interpolation(image, 150, 400))
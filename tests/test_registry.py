@@ -0,0 +1,208 @@
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from methods import registry as registry_module
+from methods.bilinear import bilinear_interpolation, bilinear_plan
+from methods.lanczos import lanczos_interpolation
+from methods.registry import BACKENDS, MethodRegistry, MethodSpec, get_planner, registry, resize
+from methods.spline import spline_interpolation
+
+
+def _image(shape: tuple[int, ...] = (20, 30, 3), dtype: type = np.uint8) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, size=shape).astype(dtype)
+
+
+def _nearest(image: np.ndarray, new_height: int, new_width: int, **_: object) -> np.ndarray:
+    rows = np.arange(new_height) * image.shape[0] // new_height
+    cols = np.arange(new_width) * image.shape[1] // new_width
+    return image[rows][:, cols]
+
+
+class _EntryPoint:
+    def __init__(self, name: str, value: object) -> None:
+        self.name = name
+        self.value = value
+
+    def load(self) -> object:
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self.value
+
+
+def test_builtin_methods() -> None:
+    assert {"bilinear", "lanczos", "spline"} <= set(registry.names())
+    assert registry.get("lanczos").support == 3.0
+    assert registry.get("spline").separable
+    assert registry.get("bilinear").backends == BACKENDS
+    assert get_planner("bilinear") is bilinear_plan
+    assert registry.get("bilinear").kernel(np.array([0.0, 0.5, 1.0])).tolist() == [1.0, 0.5, 0.0]
+
+
+@pytest.mark.parametrize(
+    ("method", "func"),
+    [("bilinear", bilinear_interpolation), ("lanczos", lanczos_interpolation), ("spline", spline_interpolation)],
+)
+@pytest.mark.parametrize("backend", ["auto", *BACKENDS])
+def test_backends_match_the_method(method: str, func: object, backend: str) -> None:
+    image = _image()
+
+    assert np.array_equal(resize(image, 37, 23, method, backend=backend), func(image, 37, 23))
+
+
+@pytest.mark.parametrize("method", ["bilinear", "lanczos", "spline"])
+def test_bool_images_are_accepted(method: str) -> None:
+    image = np.eye(6, dtype=bool)
+
+    assert np.array_equal(resize(image, 12, 12, method), registry.get(method).func(image, 12, 12))
+
+
+def test_dispatcher_passes_parameters() -> None:
+    image = _image()
+
+    assert np.array_equal(registry.dispatcher("lanczos")(image, 9, 11, a=2), lanczos_interpolation(image, 9, 11, a=2))
+
+
+def test_explicit_options_win_over_the_backend() -> None:
+    calls = []
+    local = MethodRegistry(plugins=False)
+    local.register(MethodSpec("nearest", lambda *args, **options: calls.append(options), backends=("tiled",)))
+
+    local.resize(_image(), 10, 12, "nearest", tile_shape=(3, 4))
+    local.resize(_image(), 10, 12, "nearest")
+
+    assert calls == [{"tile_shape": (3, 4)}, {"tile_shape": (registry_module.TILE_ROWS, 12)}]
+
+
+def test_max_workers_caps_the_parallel_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+    local = MethodRegistry(plugins=False)
+    local.register(MethodSpec("nearest", lambda *args, **options: calls.append(options), backends=BACKENDS))
+    monkeypatch.setattr(registry_module.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(registry_module, "SMALL_OUTPUT", 0)
+    monkeypatch.setattr(local, "calibration", lambda name: {"vectorized": (0, 2.0), "parallel": (0, 1.0)})
+
+    local.resize(_image(), 10, 12, "nearest", backend="parallel")
+    local.resize(_image(), 10, 12, "nearest", backend="parallel", max_workers=3)
+    local.resize(_image(), 10, 12, "nearest", max_workers=2)
+    local.resize(_image(), 10, 12, "nearest", max_workers=1)
+
+    assert calls == [{"workers": 8}, {"workers": 3}, {"workers": 2}, {}]
+    with pytest.raises(ValueError, match="max_workers"):
+        local.resize(_image(), 10, 12, "nearest", max_workers=0)
+
+
+def test_invalid_requests() -> None:
+    local = MethodRegistry(plugins=False)
+    local.register(MethodSpec("nearest", _nearest, dtypes="u", channels=(1, 3)))
+
+    with pytest.raises(ValueError, match="Unknown method 'cubic'"):
+        local.get("cubic")
+    with pytest.raises(ValueError, match="already registered"):
+        local.register(MethodSpec("nearest", _nearest))
+    with pytest.raises(ValueError, match="invalid backends"):
+        local.register(MethodSpec("gpu", _nearest, backends=("cuda",)))
+    with pytest.raises(ValueError, match="not separable"):
+        local.planner("nearest")
+    with pytest.raises(ValueError, match="float32"):
+        local.resize(_image(dtype=np.float32), 5, 5, "nearest")
+    with pytest.raises(ValueError, match="4 channels"):
+        local.resize(_image((8, 8, 4)), 5, 5, "nearest")
+    with pytest.raises(ValueError, match="no backend 'parallel'"):
+        local.resize(_image(), 5, 5, "nearest", backend="parallel")
+
+    local.register(MethodSpec("nearest", _nearest, dtypes="uf"), replace=True)
+    assert local.resize(_image(dtype=np.float32), 5, 5, "nearest").shape == (5, 5, 3)
+
+
+def test_small_outputs_are_not_calibrated(tmp_path: Path) -> None:
+    local = MethodRegistry(tmp_path / "calibration.json", plugins=False)
+    local.register(registry.get("bilinear"))
+
+    assert local.choose_backend("bilinear", 100, 100) == "vectorized"
+    assert not (tmp_path / "calibration.json").exists()
+
+
+def test_calibration_is_measured_once_per_machine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path = tmp_path / "calibration.json"
+    models = {"vectorized": (0.0, 2e-8), "tiled": (1e-3, 1e-8)}
+    calls = []
+
+    def calibrate(spec: MethodSpec) -> dict:
+        calls.append(spec.name)
+        return models
+
+    monkeypatch.setattr(registry_module, "_calibrate", calibrate)
+    monkeypatch.setattr(registry_module, "SMALL_OUTPUT", 0)
+    monkeypatch.setattr(registry_module, "_candidates", lambda spec: ["vectorized", "tiled"])
+    first = MethodRegistry(path, plugins=False)
+    first.register(registry.get("bilinear"))
+
+    # 1e-3 + 1e-8 * N < 2e-8 * N once N > 1e5
+    assert first.choose_backend("bilinear", 100, 100) == "vectorized"
+    assert first.choose_backend("bilinear", 1000, 1000) == "tiled"
+
+    second = MethodRegistry(path, plugins=False)
+    second.register(registry.get("bilinear"))
+
+    assert second.choose_backend("bilinear", 1000, 1000) == "tiled"
+    assert calls == ["bilinear"]
+    stored = json.loads(path.read_text())
+    assert list(stored.values()) == [{"bilinear": {"vectorized": [0.0, 2e-8], "tiled": [1e-3, 1e-8]}}]
+    assert not list(tmp_path.glob(".tmp-*"))
+
+
+def test_calibration_runs_without_holding_the_lock(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    local = MethodRegistry(tmp_path / "calibration.json", plugins=False)
+    local.register(registry.get("bilinear"))
+    lookups = []
+
+    def calibrate(spec: MethodSpec) -> dict:
+        # Another thread can use the registry while a method is being measured
+        thread = threading.Thread(target=lambda: lookups.append(local.names()))
+        thread.start()
+        thread.join(timeout=5)
+        return {"vectorized": (0.0, 1e-8)}
+
+    monkeypatch.setattr(registry_module, "_calibrate", calibrate)
+
+    assert local.calibration("bilinear") == {"vectorized": (0.0, 1e-8)}
+    assert lookups == [["bilinear"]]
+
+
+def test_default_calibration_is_isolated_in_tests() -> None:
+    assert registry.calibration_path == registry_module.CACHE_DIR / "calibration.json"
+    assert Path.home() / ".cache" not in registry.calibration_path.parents
+
+
+def test_calibration_fits_every_candidate() -> None:
+    models = registry_module._calibrate(MethodSpec("nearest", _nearest, backends=("vectorized", "tiled")))
+
+    assert set(models) == {"vectorized", "tiled"}
+    assert all(offset >= 0 and slope >= 0 for offset, slope in models.values())
+
+
+def test_plugins_are_loaded_from_entry_points(monkeypatch: pytest.MonkeyPatch) -> None:
+    plugins = [
+        _EntryPoint("nearest", MethodSpec("nearest", _nearest)),
+        _EntryPoint("box", lambda: MethodSpec("box", _nearest)),
+        _EntryPoint("broken", ImportError("no module named 'missing'")),
+        _EntryPoint("bilinear", MethodSpec("bilinear", _nearest)),
+    ]
+    monkeypatch.setattr(registry_module, "entry_points", lambda group: plugins)
+    local = MethodRegistry()
+    local.register(registry.get("bilinear"))
+
+    with pytest.warns(RuntimeWarning) as warnings:
+        names = local.names()
+
+    assert names == ["bilinear", "nearest", "box"]
+    assert local.get("bilinear") is registry.get("bilinear")
+    assert [str(warning.message).split(":")[0] for warning in warnings] == [
+        "Could not load interpolation method 'broken'",
+        "Could not load interpolation method 'bilinear'",
+    ]
+    assert local.resize(_image(), 4, 6, "nearest").shape == (4, 6, 3)
@@ -0,0 +1,193 @@
+import numpy as np
+import pytest
+
+from methods.bilinear import bilinear_interpolation
+from methods.lanczos import lanczos_interpolation
+from methods.registry import resize
+from methods.remap import BORDERS, remap, warp_affine, warp_perspective
+from methods.spline import spline_interpolation
+
+METHODS = ["bilinear", "spline", "lanczos"]
+
+
+def _image(shape: tuple[int, ...] = (21, 17, 3)) -> np.ndarray:
+    return np.random.default_rng(0).integers(0, 256, size=shape).astype(np.uint8)
+
+
+def _grid(height: int, width: int) -> tuple[np.ndarray, np.ndarray]:
+    y, x = np.mgrid[0:height, 0:width].astype(np.float64)
+    return x, y
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("border", BORDERS)
+def test_identity_map(method: str, border: str) -> None:
+    image = _image()
+    x, y = _grid(*image.shape[:2])
+
+    result = remap(image, x, y, method, border=border, preserve_dtype=True)
+
+    # Lanczos weights are renormalized, which can truncate a value by one
+    assert np.abs(result.astype(int) - image).max() <= (1 if method == "lanczos" else 0)
+
+
+@pytest.mark.parametrize(
+    ("method", "func"),
+    [("bilinear", bilinear_interpolation), ("spline", spline_interpolation), ("lanczos", lanczos_interpolation)],
+)
+def test_linspace_grid_matches_resize(method: str, func: object) -> None:
+    image = _image()
+    x, y = np.meshgrid(np.linspace(0, 16, 30), np.linspace(0, 20, 35))
+
+    result = remap(image, x, y, method)
+
+    # The 2D sum rounds differently from the separable passes
+    assert np.abs(result.astype(int) - func(image, 35, 30).astype(int)).max() <= 1
+
+
+def test_borders() -> None:
+    image = np.arange(5, dtype=np.float64).reshape(1, 5)
+    x = np.array([[-2.0, -1.0, 5.0, 6.0, 1.5]])
+    y = np.zeros_like(x)
+
+    clamp = remap(image, x, y, border="clamp", preserve_dtype=True)
+    reflect = remap(image, x, y, border="reflect", preserve_dtype=True)
+    constant = remap(image, x, y, border="constant", cval=9, preserve_dtype=True)
+
+    assert clamp.tolist() == [[0, 0, 4, 4, 1.5]]
+    assert reflect.tolist() == [[2, 1, 3, 2, 1.5]]
+    assert constant.tolist() == [[9, 9, 9, 9, 1.5]]
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_far_and_non_finite_coordinates(method: str) -> None:
+    image = np.arange(5, dtype=np.float64).reshape(1, 5)
+    x = np.array([[-1e20, 1e20, np.nan, np.inf, -np.inf, 2.0]])
+    y = np.zeros_like(x)
+
+    clamp = remap(image, x, y, method, cval=7, preserve_dtype=True)
+    constant = remap(image, x, y, method, border="constant", cval=9, preserve_dtype=True)
+    reflect = remap(image, x, y, method, border="reflect", cval=7, preserve_dtype=True)
+
+    assert np.allclose(clamp, [[0, 4, 7, 7, 7, 2]])
+    assert np.allclose(constant, [[9, 9, 9, 9, 9, 2]])
+    assert np.all(np.isfinite(reflect))
+    assert np.allclose(reflect[0, 2:], [7, 7, 7, 2])
+
+
+@pytest.mark.parametrize(
+    ("method", "options"),
+    [("bilinear", {}), ("spline", {}), ("lanczos", {}), ("lanczos", {"a": 2})],
+)
+@pytest.mark.parametrize(("new_h", "new_w"), [(35, 30), (9, 7)])
+def test_resize_grid_matches_resize(method: str, options: dict, new_h: int, new_w: int) -> None:
+    image = np.random.default_rng(0).uniform(0, 255, size=(21, 17, 3))
+    x, y = np.meshgrid(np.linspace(0, 16, new_w), np.linspace(0, 20, new_h))
+
+    result = remap(image, x, y, method, preserve_dtype=True, **options)
+    expected = resize(image, new_h, new_w, method, preserve_dtype=True, **options)
+
+    assert np.allclose(result, expected, rtol=0, atol=1e-9)
+
+
+def test_constant_border_blends_cval_at_edge() -> None:
+    image = np.full((4, 4), 100, dtype=np.uint8)
+    x, y = _grid(4, 4)
+
+    result = remap(image, x - 0.5, y, border="constant", cval=0)
+
+    assert result[:, 0].tolist() == [50] * 4
+    assert (result[:, 1:] == 100).all()
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_tiles_and_workers_match_whole_output(method: str) -> None:
+    image = _image((30, 40, 3))
+    rng = np.random.default_rng(1)
+    x = rng.uniform(-3, 43, size=(25, 33))
+    y = rng.uniform(-3, 33, size=(25, 33))
+
+    expected = remap(image, x, y, method, border="reflect")
+
+    assert np.array_equal(remap(image, x, y, method, border="reflect", tile_shape=(7, 10)), expected)
+    assert np.array_equal(remap(image, x, y, method, border="reflect", tile_shape=(4, 33), workers=3), expected)
+
+
+def test_out_and_dtype() -> None:
+    image = _image((10, 12)).astype(np.float32)
+    x, y = _grid(6, 8)
+    out = np.empty((6, 8), dtype=np.float32)
+
+    result = remap(image, x + 0.25, y, out=out, dtype=np.float32)
+
+    assert result is out
+    assert np.allclose(out, 0.75 * image[:6, :8] + 0.25 * image[:6, 1:9], atol=1e-3)
+    assert remap(image, x, y).dtype == np.uint8
+
+
+def test_warp_affine_translation() -> None:
+    image = _image()
+    matrix = [[1, 0, -3], [0, 1, -2]]
+
+    result = warp_affine(image, matrix, (10, 12), "spline")
+
+    assert np.array_equal(result, image[2:12, 3:15])
+
+
+def test_warp_affine_rotation_matches_rot90() -> None:
+    image = _image((9, 9))
+    # Rotation by 90 degrees about the center, as np.rot90 does
+    matrix = [[0, 1, 0], [-1, 0, 8]]
+
+    result = warp_affine(image, matrix, (9, 9))
+
+    assert np.abs(result.astype(int) - np.rot90(image)).max() <= 1
+
+
+def test_warp_perspective_scaling_and_tiles() -> None:
+    image = _image()
+    homography = np.array([[2.0, 0, 0], [0, 2.0, 0], [0, 0, 1]]) * 3
+
+    whole = warp_perspective(image, homography, (41, 33))
+    tiled = warp_perspective(image, homography, (41, 33), tile_shape=(8, 8))
+
+    x, y = _grid(41, 33)
+    assert np.array_equal(whole, tiled)
+    assert np.abs(whole.astype(int) - remap(image, x / 2, y / 2)).max() <= 1
+
+
+def test_warp_perspective_points_behind_the_camera_read_cval() -> None:
+    image = np.full((8, 8), 50, dtype=np.uint8)
+    # The homogeneous coordinate of the source is 1 - x / 4, so columns 4 and up have none
+    homography = np.linalg.inv([[1.0, 0, 0], [0, 1, 0], [-0.25, 0, 1]])
+
+    result = warp_perspective(image, homography, (8, 8), border="constant", cval=200)
+
+    assert (result[:, 4:] == 200).all()
+    assert (result[:, 0] == 50).all()
+
+
+def test_lanczos_accepts_numpy_integers() -> None:
+    image = _image()
+    x, y = _grid(5, 5)
+
+    assert np.array_equal(remap(image, x + 0.3, y, "lanczos", a=np.int64(2)), remap(image, x + 0.3, y, "lanczos", a=2))
+
+
+def test_invalid_arguments() -> None:
+    image = _image()
+    x, y = _grid(3, 3)
+    with pytest.raises(ValueError, match="same shape"):
+        remap(image, x, y[:2])
+    with pytest.raises(ValueError, match="Unknown method"):
+        remap(image, x, y, "nearest")
+    with pytest.raises(ValueError, match="Unknown border"):
+        remap(image, x, y, border="wrap")
+    with pytest.raises(ValueError, match="a' parameter"):
+        remap(image, x, y, "lanczos", a=0)
+    with pytest.raises(ValueError, match="out has shape"):
+        remap(image, x, y, out=np.empty((2, 2, 3), dtype=np.uint8))
+    with pytest.raises(ValueError, match="2x3"):
+        warp_affine(image, np.eye(3), (3, 3))
+    with pytest.raises(ValueError, match="singular"):
+        warp_perspective(image, np.zeros((3, 3)), (3, 3))
@@ -0,0 +1,232 @@
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+
+import numpy as np
+import pytest
+
+from methods._separable import output_dtype, store, tile_memory
+from methods.bilinear import _bilinear_taps, bilinear_interpolation
+from methods.hooks import MetricsRecorder
+from methods.lanczos import _lanczos_taps, lanczos_interpolation
+from methods.plan import get_plan
+from methods.spline import _spline_taps, spline_interpolation
+
+METHODS = [
+    bilinear_interpolation,
+    lanczos_interpolation,
+    spline_interpolation,
+    partial(lanczos_interpolation, kernel="lut"),
+    partial(bilinear_interpolation, frac_bits=8),
+]
+
+ANTIALIASED = [partial(method, antialias=True) for method in METHODS]
+
+
+@pytest.mark.parametrize("method", METHODS + ANTIALIASED)
+@pytest.mark.parametrize("tile_shape", [(1, 1), (3, 5), (7, 64), (64, 2)])
+@pytest.mark.parametrize(("new_h", "new_w"), [(45, 38), (6, 9)])
+def test_tiled_matches_untiled(
+    method: Callable[..., np.ndarray],
+    tile_shape: tuple[int, int],
+    new_h: int,
+    new_w: int,
+) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(17, 23, 3)).astype(np.uint8)
+
+    expected = method(image, new_h, new_w)
+    result = method(image, new_h, new_w, tile_shape=tile_shape)
+
+    assert np.array_equal(result, expected)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_max_memory_bounds_peak_allocation(method: Callable[..., np.ndarray]) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(120, 150, 3)).astype(np.uint8)
+    max_memory = 512 * 1024
+    expected = method(image, 300, 310)
+
+    tracemalloc.start()
+    result = method(image, 300, 310, max_memory=max_memory)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert np.array_equal(result, expected)
+    assert peak - result.nbytes <= max_memory
+
+
+def test_tile_memory_grows_with_tile_size() -> None:
+    image = np.zeros((100, 100, 3), dtype=np.uint8)
+    plan = get_plan("spline", (100, 100), (200, 200), _spline_taps)
+
+    assert tile_memory(image, plan, (1, 10)) < tile_memory(image, plan, (1, 100))
+    assert tile_memory(image, plan, (1, 10)) < tile_memory(image, plan, (10, 10))
+    assert tile_memory(image, plan, (200, 200)) > 200 * 200 * 3 * 8
+
+
+def test_invalid_tile_settings_raise() -> None:
+    image = np.zeros((10, 10), dtype=np.uint8)
+
+    with pytest.raises(ValueError, match="Invalid tile shape"):
+        spline_interpolation(image, 20, 20, tile_shape=(0, 4))
+    with pytest.raises(ValueError, match="max_memory"):
+        spline_interpolation(image, 20, 20, max_memory=1)
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("workers", [2, 5])
+def test_workers_match_serial(method: Callable[..., np.ndarray], workers: int) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(31, 29, 4)).astype(np.uint8)
+
+    expected = method(image, 70, 45)
+
+    assert np.array_equal(method(image, 70, 45, workers=workers), expected)
+    assert np.array_equal(method(image, 70, 45, workers=workers, tile_shape=(8, 16)), expected)
+
+
+def test_invalid_workers_raise() -> None:
+    with pytest.raises(ValueError, match="workers"):
+        spline_interpolation(np.zeros((4, 4), dtype=np.uint8), 8, 8, workers=0)
+
+
+@pytest.mark.parametrize("method", ANTIALIASED)
+def test_antialias_removes_aliasing(method: Callable[..., np.ndarray]) -> None:
+    checkerboard = (np.indices((200, 200)).sum(axis=0) % 2 * 255).astype(np.uint8)
+
+    aliased = method.func(checkerboard, 20, 20)
+    result = method(checkerboard, 20, 20)
+
+    assert aliased.std() > 30
+    assert result.std() < 5
+    assert abs(result.mean() - 127.5) < 1
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_antialias_keeps_enlarged_axes(method: Callable[..., np.ndarray]) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(17, 23, 3)).astype(np.uint8)
+
+    assert np.array_equal(method(image, 40, 50, antialias=True), method(image, 40, 50))
+
+
+@pytest.mark.parametrize("builder", [_bilinear_taps, _spline_taps, partial(_lanczos_taps, a=3)])
+def test_antialias_taps_widen_and_normalize(builder: Callable[..., tuple]) -> None:
+    indices, weights = builder(600, 30, antialias=True)
+
+    assert indices.shape[1] > builder(600, 30)[0].shape[1]
+    assert indices.min() >= 0
+    assert indices.max() < 600
+    assert np.allclose(weights.sum(axis=1), 1)
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_float32_accumulation_matches_float64(method: Callable[..., np.ndarray]) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(17, 23, 3)).astype(np.uint8)
+
+    expected = method(image, 31, 12)
+    result = method(image, 31, 12, dtype=np.float32)
+
+    assert result.dtype == np.uint8
+    assert np.abs(result.astype(int) - expected).max() <= 1
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_preserve_dtype_returns_unclipped_floats(method: Callable[..., np.ndarray]) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.normal(0, 1000, size=(17, 23)).astype(np.float32)
+
+    result = method(image, 31, 12, dtype=np.float32, preserve_dtype=True)
+    expected = method(image.astype(np.float64), 31, 12, preserve_dtype=True)
+
+    assert result.dtype == np.float32
+    assert result.min() < 0
+    assert result.max() > 255
+    assert np.allclose(result, expected, rtol=1e-4, atol=1e-2)
+
+
+@pytest.mark.parametrize(
+    ("dtype", "expected"),
+    [
+        (np.uint8, np.uint8),
+        (np.uint16, np.uint16),
+        (np.int16, np.int16),
+        (np.int8, np.uint8),
+        (np.int32, np.uint8),
+        (np.int64, np.uint8),
+        (np.float32, np.uint8),
+    ],
+)
+def test_output_dtype_keeps_only_8_and_16_bit_integers(dtype: type, expected: type) -> None:
+    image = np.arange(20, dtype=dtype).reshape(4, 5)
+
+    assert output_dtype(dtype) == expected
+    assert bilinear_interpolation(image, 3, 3).dtype == expected
+    assert bilinear_interpolation(image, 3, 3, preserve_dtype=True).dtype == dtype
+
+
+@pytest.mark.parametrize("method", METHODS)
+@pytest.mark.parametrize("dtype", [np.int32, np.int64, np.uint64])
+def test_wide_integers_do_not_overflow_at_the_extremes(method: Callable[..., np.ndarray], dtype: type) -> None:
+    info = np.iinfo(dtype)
+    for value in (info.min, info.max):
+        image = np.full((5, 6), value, dtype=dtype)
+
+        result = method(image, 7, 4, preserve_dtype=True)
+
+        assert result.dtype == dtype
+        # Float accumulation rounds the largest 64-bit values down to the nearest float
+        assert np.all(np.abs(result.astype(np.float64) - float(value)) <= 2048)
+
+
+def test_store_clips_below_unrepresentable_bounds() -> None:
+    for dtype, values in [(np.int64, np.float64), (np.uint64, np.float64), (np.int32, np.float32)]:
+        info = np.iinfo(dtype)
+        dst = np.empty(3, dtype=dtype)
+
+        store(dst, np.array([-1e30, 0, 1e30], dtype=values))
+
+        assert dst[0] == info.min
+        assert dst[1] == 0
+        assert 0 <= info.max - int(dst[2]) < 2**-20 * info.max
+
+
+def test_invalid_dtype_raises() -> None:
+    image = np.zeros((4, 4), dtype=np.uint8)
+
+    with pytest.raises(ValueError, match="floating-point"):
+        bilinear_interpolation(image, 2, 2, dtype=np.int32)
+
+
+@pytest.mark.parametrize("method", METHODS + ANTIALIASED)
+@pytest.mark.parametrize("roi", [(0, 0, 45, 38), (10, 7, 1, 1), (20, 3, 25, 30), (44, 0, 1, 38)])
+def test_roi_matches_crop_of_full_result(method: Callable[..., np.ndarray], roi: tuple[int, int, int, int]) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(17, 23, 3)).astype(np.uint8)
+    top, left, height, width = roi
+
+    expected = method(image, 45, 38)[top : top + height, left : left + width]
+
+    assert np.array_equal(method(image, 45, 38, roi=roi), expected)
+    assert np.array_equal(method(image, 45, 38, roi=roi, tile_shape=(4, 4), workers=2), expected)
+
+
+def test_roi_reads_only_its_support() -> None:
+    image = np.zeros((1000, 1000), dtype=np.uint8)
+    image[:100, :100] = 1
+
+    hooks = MetricsRecorder()
+    result = spline_interpolation(image, 4000, 4000, roi=(0, 0, 256, 256), hooks=hooks)
+
+    assert result.shape == (256, 256)
+    assert hooks.bytes_read <= 70 * 70
+
+
+def test_invalid_roi_raises() -> None:
+    image = np.zeros((10, 10), dtype=np.uint8)
+    for roi in [(0, 0, 0, 5), (-1, 0, 5, 5), (0, 16, 5, 5), (16, 0, 5, 5)]:
+        with pytest.raises(ValueError, match="roi"):
+            bilinear_interpolation(image, 20, 20, roi=roi)
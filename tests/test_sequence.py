@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from methods.bilinear import bilinear_interpolation
+from methods.lanczos import lanczos_interpolation
+from methods.registry import resize
+from methods.sequence import SequenceStats, iter_resize_frames, resize_frames, run_sequence
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_resize_frames_matches_per_frame_results(workers: int) -> None:
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 256, size=(5, 17, 23, 3)).astype(np.uint8)
+
+    result = resize_frames(frames, 30, 12, "lanczos", workers=workers, a=2)
+
+    assert result.shape == (5, 30, 12, 3)
+    for frame, resized in zip(frames, result, strict=True):
+        assert np.array_equal(resized, lanczos_interpolation(frame, 30, 12, a=2))
+
+
+def test_resize_frames_writes_into_out() -> None:
+    frames = np.zeros((3, 8, 8), dtype=np.float32)
+    out = np.empty((3, 4, 4), dtype=np.float32)
+
+    result = resize_frames(frames, 4, 4, out=out)
+
+    assert result is out
+    assert np.all(out == 0)
+
+
+def test_iter_resize_frames_batches_in_order() -> None:
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, size=(9, 7)).astype(np.uint8) for _ in range(7)]
+
+    result = list(iter_resize_frames(iter(frames), 18, 14, batch_size=3))
+
+    assert len(result) == len(frames)
+    for frame, resized in zip(frames, result, strict=True):
+        assert np.array_equal(resized, bilinear_interpolation(frame, 18, 14))
+
+
+@pytest.mark.parametrize("method", ["bilinear", "lanczos", "spline"])
+def test_iter_resize_frames_batches_colour_frames(method: str) -> None:
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, size=(9, 7, 3)).astype(np.uint16) for _ in range(5)]
+
+    result = list(iter_resize_frames(frames, 5, 12, method, batch_size=2, workers=2, antialias=True))
+
+    for frame, resized in zip(frames, result, strict=True):
+        assert resized.dtype == np.uint16
+        assert np.array_equal(resized, resize(frame, 5, 12, method, antialias=True))
+
+
+def test_iter_resize_frames_rejects_mismatched_frames() -> None:
+    frames = [np.zeros((4, 4), dtype=np.uint8), np.zeros((5, 4), dtype=np.uint8)]
+
+    with pytest.raises(ValueError, match="differs from the first frame"):
+        list(iter_resize_frames(frames, 8, 8))
+
+
+def test_run_sequence_overlaps_stages_and_counts_frames() -> None:
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 256, size=(10, 6, 5, 3)).astype(np.uint8)
+    written: dict[int, np.ndarray] = {}
+
+    stats = run_sequence(
+        range(len(frames)),
+        frames.__getitem__,
+        written.__setitem__,
+        12,
+        10,
+        batch_size=4,
+        io_workers=3,
+        queue_size=2,
+    )
+
+    assert stats.frames == len(frames)
+    assert stats.frames_per_second > 0
+    assert sorted(written) == list(range(len(frames)))
+    assert np.array_equal(written[7], bilinear_interpolation(frames[7], 12, 10))
+
+
+def test_sequence_stats_summary() -> None:
+    assert SequenceStats(frames=50, seconds=2.0).summary() == "Resized 50 frames in 2.00 s: 25.00 frames/s"
+
+
+def test_invalid_arguments_raise() -> None:
+    with pytest.raises(ValueError, match="frame stack"):
+        resize_frames(np.zeros((4, 4), dtype=np.uint8), 2, 2)
+    with pytest.raises(ValueError, match="Unknown method"):
+        resize_frames(np.zeros((1, 4, 4), dtype=np.uint8), 2, 2, "nearest")
+    with pytest.raises(ValueError, match="batch_size"):
+        list(iter_resize_frames([], 2, 2, batch_size=0))
@@ -0,0 +1,272 @@
+import asyncio
+import io
+import json
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from methods.bilinear import bilinear_interpolation
+from methods.lanczos import lanczos_interpolation
+from methods.server import LatencyHistogram, OverloadedError, ResizeServer
+
+
+async def _request(port: int, verb: str, target: str, body: bytes = b"") -> tuple[int, dict[str, str], bytes]:
+    """Stand-in HTTP client: sends one request and reads the whole response."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{verb} {target} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode().split("\r\n")
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in header_lines)}
+    return int(status_line.split()[1]), headers, payload
+
+
+def _run(server: ResizeServer, client: Callable[[int], Awaitable[object]]) -> object:
+    async def main() -> object:
+        listener = await server.start()
+        try:
+            return await client(listener.sockets[0].getsockname()[1])
+        finally:
+            listener.close()
+            await listener.wait_closed()
+
+    try:
+        return asyncio.run(main())
+    finally:
+        server.close()
+
+
+def _npy(image: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, image)
+    return buffer.getvalue()
+
+
+def _image(seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(0, 256, size=(20, 30, 3)).astype(np.uint8)
+
+
+def test_resize_npy_and_png() -> None:
+    image = _image()
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, format="PNG")
+
+    async def client(port: int) -> tuple:
+        npy = await _request(port, "POST", "/resize?height=40&width=25&method=lanczos&a=2", _npy(image))
+        png = await _request(port, "POST", "/resize?height=10&width=15", buffer.getvalue())
+        return npy, png
+
+    (status, headers, body), (png_status, png_headers, png_body) = _run(ResizeServer(), client)
+
+    assert status == 200
+    assert headers["content-type"] == "application/x-npy"
+    assert np.array_equal(np.load(io.BytesIO(body)), lanczos_interpolation(image, 40, 25, a=2))
+    assert png_status == 200
+    assert png_headers["content-type"] == "image/png"
+    assert np.array_equal(np.asarray(Image.open(io.BytesIO(png_body))), bilinear_interpolation(image, 10, 15))
+
+
+def test_resize_path(tmp_path: Path) -> None:
+    image = _image()
+    (tmp_path / "root").mkdir()
+    np.save(tmp_path / "root" / "in.npy", image)
+    np.save(tmp_path / "secret.npy", image)
+
+    async def client(port: int) -> list:
+        targets = [
+            "in.npy",
+            tmp_path / "root" / "in.npy",
+            "missing.npy",
+            "../secret.npy",
+            tmp_path / "secret.npy",
+        ]
+        return [await _request(port, "POST", f"/resize?height=7&width=9&path={target}") for target in targets]
+
+    responses = _run(ResizeServer(root=tmp_path / "root"), client)
+
+    assert [status for status, _, _ in responses] == [200, 200, 400, 403, 403]
+    for _, _, body in responses[:2]:
+        assert np.array_equal(np.load(io.BytesIO(body)), bilinear_interpolation(image, 7, 9))
+
+
+def test_path_is_refused_without_a_root(tmp_path: Path) -> None:
+    np.save(tmp_path / "in.npy", _image())
+
+    async def client(port: int) -> tuple:
+        return await _request(port, "POST", f"/resize?height=7&width=9&path={tmp_path / 'in.npy'}")
+
+    status, _, body = _run(ResizeServer(), client)
+
+    assert status == 403
+    assert b"disabled" in body
+
+
+@pytest.mark.parametrize("length", ["abc", "-5"])
+def test_invalid_content_length(length: str) -> None:
+    async def client(port: int) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"POST /resize?height=5&width=5 HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        return response
+
+    response = _run(ResizeServer(), client)
+
+    assert response.startswith(b"HTTP/1.1 400 ")
+    assert b"Invalid Content-Length" in response
+
+
+def test_full_queue_is_refused_before_the_body_is_read() -> None:
+    server = ResizeServer(max_queue=1)
+
+    async def client(port: int) -> tuple:
+        # The first request announces a body it never sends, so it stays admitted
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"POST /resize?height=5&width=5 HTTP/1.1\r\nContent-Length: 1000\r\n\r\n")
+        await writer.drain()
+        await asyncio.sleep(0.05)
+        refused = await _request(port, "POST", "/resize?height=5&width=5", _npy(_image()))
+        writer.close()
+        await reader.read()
+        return refused
+
+    status, headers, _ = _run(server, client)
+
+    assert status == 503
+    assert headers["retry-after"] == "1"
+    assert server.rejected == 1
+
+
+def test_concurrent_jobs_with_one_geometry_are_batched() -> None:
+    images = [_image(seed) for seed in range(6)]
+    server = ResizeServer(batch_window=0.05)
+
+    async def client(port: int) -> list:
+        jobs = [_request(port, "POST", "/resize?height=11&width=13", _npy(image)) for image in images]
+        jobs.append(_request(port, "POST", "/resize?height=12&width=13", _npy(images[0])))
+        return await asyncio.gather(*jobs)
+
+    responses = _run(server, client)
+
+    assert [status for status, _, _ in responses] == [200] * 7
+    for image, (_, _, body) in zip(images, responses, strict=False):
+        assert np.array_equal(np.load(io.BytesIO(body)), bilinear_interpolation(image, 11, 13))
+    assert server.batches == 2
+    assert server.requests == 7
+
+
+def test_max_batch_starts_batch_early() -> None:
+    server = ResizeServer(batch_window=60, max_batch=2)
+
+    async def client(port: int) -> list:
+        jobs = [_request(port, "POST", "/resize?height=5&width=5", _npy(_image(seed))) for seed in range(2)]
+        return await asyncio.wait_for(asyncio.gather(*jobs), timeout=10)
+
+    assert [status for status, _, _ in _run(server, client)] == [200, 200]
+
+
+def test_full_queue_is_refused() -> None:
+    server = ResizeServer(max_queue=2, batch_window=0.2)
+
+    async def client(port: int) -> list:
+        jobs = [_request(port, "POST", "/resize?height=5&width=5", _npy(_image())) for _ in range(4)]
+        return await asyncio.gather(*jobs)
+
+    responses = _run(server, client)
+
+    statuses = sorted(status for status, _, _ in responses)
+    assert statuses == [200, 200, 503, 503]
+    assert all(headers["retry-after"] == "1" for status, headers, _ in responses if status == 503)
+    assert server.rejected == 2
+
+
+def test_submit_raises_overloaded_directly() -> None:
+    async def main() -> None:
+        server = ResizeServer(max_queue=1, batch_window=0.05)
+        first = asyncio.create_task(server.submit(_image(), 5, 5))
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError):
+            await server.submit(_image(), 5, 5)
+        assert (await first).shape == (5, 5, 3)
+        server.close()
+
+    asyncio.run(main())
+
+
+def test_metrics_and_health() -> None:
+    async def client(port: int) -> tuple:
+        await _request(port, "POST", "/resize?height=5&width=5", _npy(_image()))
+        health = await _request(port, "GET", "/health")
+        metrics = await _request(port, "GET", "/metrics")
+        return health, metrics
+
+    (health_status, _, health), (status, headers, body) = _run(ResizeServer(), client)
+    metrics = json.loads(body)
+
+    assert (health_status, health) == (200, b"ok")
+    assert headers["content-type"] == "application/json"
+    assert metrics["requests"] == 1
+    assert metrics["queue_depth"] == 0
+    assert metrics["latency"]["count"] == 1
+    assert sum(metrics["latency"]["counts"]) == 1
+
+
+@pytest.mark.parametrize(
+    ("verb", "target", "body", "status"),
+    [
+        ("POST", "/resize?height=5", b"", 400),
+        ("POST", "/resize?height=0&width=5", b"", 400),
+        ("POST", "/resize?height=5&width=5&method=nearest", _npy(np.zeros((4, 4), np.uint8)), 400),
+        ("POST", "/resize?height=5&width=5", b"not an image", 400),
+        ("POST", "/resize?height=5&width=5&path=/does/not/exist.npy", b"", 403),
+        ("POST", "/resize?height=5&width=5&a=0&method=lanczos", _npy(np.zeros((4, 4), np.uint8)), 400),
+        ("GET", "/resize?height=5&width=5", b"", 405),
+        ("POST", "/metrics", b"", 405),
+        ("GET", "/nothing", b"", 404),
+    ],
+)
+def test_errors(verb: str, target: str, body: bytes, status: int) -> None:
+    async def client(port: int) -> tuple:
+        return await _request(port, verb, target, body)
+
+    assert _run(ResizeServer(), client)[0] == status
+
+
+def test_oversized_outputs_are_refused() -> None:
+    server = ResizeServer(max_output_pixels=100)
+
+    async def client(port: int) -> list:
+        targets = ["/resize?height=10&width=10", "/resize?height=10&width=11", "/resize?height=100000&width=100000"]
+        return [await _request(port, "POST", target, _npy(_image())) for target in targets]
+
+    responses = _run(server, client)
+
+    assert [status for status, _, _ in responses] == [200, 413, 413]
+    assert b"limited to 100 pixels" in responses[1][2]
+    assert server.requests == 1
+
+
+def test_latency_histogram() -> None:
+    histogram = LatencyHistogram([0.1, 1.0])
+    for seconds in (0.05, 0.5, 0.7, 5.0):
+        histogram.observe(seconds)
+
+    assert histogram.counts == [1, 2, 1]
+    assert histogram.quantile(0.5) == 1.0
+    assert histogram.quantile(1.0) == float("inf")
+    assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+def test_invalid_settings() -> None:
+    with pytest.raises(ValueError, match="positive"):
+        ResizeServer(max_queue=0)
+    with pytest.raises(ValueError, match="positive"):
+        ResizeServer(max_output_pixels=0)
+    with pytest.raises(ValueError, match="negative"):
+        ResizeServer(batch_window=-1)
@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 
-from methods.spline import cubic_kernel, spline_interpolation
+from methods.spline import _fast_bicubic_patch, cubic_kernel, spline_interpolation
 
 
 def test_cubic_kernel_at_zero() -> None:
@@ -90,3 +90,33 @@ def test_spline_invalid_shape_raises(invalid_shape: tuple[int, ...]) -> None:
     image = np.zeros(invalid_shape, dtype=np.float32)
     with pytest.raises(ValueError):
         spline_interpolation(image, 4, 4)
+
+
+@pytest.mark.parametrize(("new_h", "new_w"), [(29, 40), (7, 9), (13, 17)])
+def test_spline_matches_per_pixel_patches(new_h: int, new_w: int) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(13, 17)).astype(np.uint8)
+    h, w = image.shape
+
+    expected = np.zeros((new_h, new_w), dtype=np.uint8)
+    for i, x in enumerate(np.linspace(0, h - 1, new_h)):
+        x_idx = np.clip(np.arange(int(x) - 1, int(x) + 3), 0, h - 1)
+        for j, y in enumerate(np.linspace(0, w - 1, new_w)):
+            y_idx = np.clip(np.arange(int(y) - 1, int(y) + 3), 0, w - 1)
+            patch = image[np.ix_(x_idx, y_idx)].astype(np.float32)
+            expected[i, j] = int(_fast_bicubic_patch(patch, x - int(x), y - int(y)))
+
+    result = spline_interpolation(image, new_h, new_w)
+
+    assert np.abs(result.astype(int) - expected.astype(int)).max() <= 1
+
+
+def test_spline_rgba_matches_per_channel() -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(9, 11, 4)).astype(np.uint8)
+
+    result = spline_interpolation(image, 20, 7)
+
+    assert result.shape == (20, 7, 4)
+    for c in range(4):
+        assert np.array_equal(result[..., c], spline_interpolation(np.ascontiguousarray(image[..., c]), 20, 7))
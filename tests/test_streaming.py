@@ -0,0 +1,83 @@
+from collections.abc import Callable, Iterator
+
+import numpy as np
+import pytest
+
+from methods.bilinear import bilinear_interpolation
+from methods.hooks import MetricsRecorder
+from methods.lanczos import lanczos_interpolation
+from methods.spline import spline_interpolation
+from methods.streaming import iter_interpolate
+
+CASES = [
+    ("bilinear", bilinear_interpolation, {}),
+    ("spline", spline_interpolation, {}),
+    ("lanczos", lanczos_interpolation, {"a": 2}),
+    ("lanczos", lanczos_interpolation, {"kernel": "lut", "antialias": True}),
+]
+
+
+def _chunks(image: np.ndarray, size: int) -> Iterator[np.ndarray]:
+    for start in range(0, len(image), size):
+        yield image[start : start + size]
+
+
+@pytest.mark.parametrize(("method", "func", "params"), CASES)
+@pytest.mark.parametrize(("new_h", "new_w"), [(50, 30), (9, 11)])
+def test_bands_concatenate_to_full_result(method: str, func: Callable[..., np.ndarray], params: dict, new_h: int, new_w: int) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(23, 17, 3)).astype(np.uint8)
+    expected = func(image, new_h, new_w, **params)
+
+    bands = list(iter_interpolate(image, new_h, new_w, method, band_rows=4, **params))
+    streamed = list(
+        iter_interpolate(_chunks(image, 5), new_h, new_w, method, src_shape=image.shape, band_rows=3, **params),
+    )
+
+    assert all(len(band) <= 4 for band in bands)
+    assert np.array_equal(np.concatenate(bands), expected)
+    assert np.array_equal(np.concatenate(streamed), expected)
+
+
+def test_first_band_needs_only_its_support_rows() -> None:
+    image = np.zeros((1000, 8), dtype=np.uint8)
+    consumed = []
+
+    def chunks() -> Iterator[np.ndarray]:
+        for start in range(0, 1000, 10):
+            consumed.append(start)
+            yield image[start : start + 10]
+
+    bands = iter_interpolate(chunks(), 2000, 8, "lanczos", src_shape=image.shape, band_rows=16)
+    next(bands)
+
+    assert len(consumed) == 1
+
+
+def test_hooks_report_rows_of_the_whole_output() -> None:
+    image = np.zeros((20, 20), dtype=np.uint8)
+    hooks = MetricsRecorder()
+
+    list(iter_interpolate(image, 40, 40, hooks=hooks, band_rows=7))
+
+    assert hooks.rows == 40
+
+
+def test_short_row_source_raises() -> None:
+    chunks = iter([np.zeros((5, 8), dtype=np.uint8)])
+
+    with pytest.raises(ValueError, match="ended after 5 of 10 rows"):
+        list(iter_interpolate(chunks, 20, 8, src_shape=(10, 8)))
+
+
+def test_invalid_arguments_raise() -> None:
+    image = np.zeros((4, 4), dtype=np.uint8)
+
+    with pytest.raises(ValueError, match="Unknown method"):
+        iter_interpolate(image, 8, 8, "nearest")
+    with pytest.raises(ValueError, match="band_rows"):
+        iter_interpolate(image, 8, 8, band_rows=0)
+    with pytest.raises(ValueError, match="src_shape"):
+        iter_interpolate(iter([image]), 8, 8)
+    with pytest.raises(ValueError, match="does not match"):
+        list(iter_interpolate(iter([image]), 8, 8, src_shape=(4, 5)))
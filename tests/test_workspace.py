@@ -0,0 +1,81 @@
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+
+import numpy as np
+import pytest
+
+from methods.bilinear import bilinear_interpolation
+from methods.lanczos import lanczos_interpolation
+from methods.spline import spline_interpolation
+from methods.workspace import ScratchBuffers, Workspace
+
+METHODS = [
+    bilinear_interpolation,
+    lanczos_interpolation,
+    spline_interpolation,
+    partial(lanczos_interpolation, kernel="lut"),
+    partial(lanczos_interpolation, tile_shape=(7, 11)),
+    partial(spline_interpolation, workers=3),
+]
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_out_and_workspace_match_fresh_result(method: Callable[..., np.ndarray]) -> None:
+    rng = np.random.default_rng(0)
+    workspace = Workspace()
+    out = np.empty((40, 50, 3), dtype=np.uint8)
+
+    for _ in range(2):
+        image = rng.integers(0, 256, size=(17, 23, 3)).astype(np.uint8)
+        result = method(image, 40, 50, out=out, workspace=workspace)
+
+        assert result is out
+        assert np.array_equal(out, method(image, 40, 50))
+
+
+@pytest.mark.parametrize("method", METHODS)
+def test_steady_state_allocates_no_large_arrays(method: Callable[..., np.ndarray]) -> None:
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(300, 400, 3)).astype(np.uint8)
+    workspace = Workspace()
+    out = np.empty((600, 800, 3), dtype=np.uint8)
+    method(image, 600, 800, out=out, workspace=workspace)
+
+    tracemalloc.start()
+    method(image, 600, 800, out=out, workspace=workspace)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Only the tap tables of each tile and NumPy's iteration buffers remain
+    assert workspace.nbytes > 0
+    assert peak < 2**19
+
+
+def test_out_with_wrong_shape_raises() -> None:
+    image = np.zeros((4, 4, 3), dtype=np.uint8)
+
+    with pytest.raises(ValueError, match="out has shape"):
+        bilinear_interpolation(image, 8, 8, out=np.empty((8, 8), dtype=np.uint8))
+
+
+def test_scratch_buffers_grow_and_are_reused() -> None:
+    scratch = ScratchBuffers()
+
+    large = scratch.get("a", (10, 10), np.float64)
+    small = scratch.get("a", (3, 4), np.float32)
+
+    assert small.shape == (3, 4)
+    assert small.dtype == np.float32
+    assert np.shares_memory(large, small)
+    assert scratch.nbytes == large.nbytes
+
+
+def test_workspace_clear_releases_buffers() -> None:
+    workspace = Workspace()
+    with workspace.scratch() as scratch:
+        scratch.get("a", (100,), np.float64)
+
+    assert workspace.nbytes == 100 * 8
+    workspace.clear()
+    assert workspace.nbytes == 0